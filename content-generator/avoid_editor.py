@@ -1,37 +1,177 @@
 #!/usr/bin/env python3
-"""Local browser editor for avoid-item placement."""
+"""Local browser editor for avoid-item placement.
+
+The server keeps a LevelIndex: the avoid levels' metadata, built once at
+startup and re-checked by a polling thread that re-parses only files whose
+mtime or size changed, plus an LRU of parsed labyrinths. /api/levels is
+answered from a pre-serialized body, and /api/level and /api/save parse a
+file only when it changed on disk since it was last read.
+
+GET responses (the page, the level list, each level) are CachedResponses:
+serialized once, with a strong ETag from the SHA-256 of the body and gzip /
+deflate encodings compressed on first request. A matching If-None-Match
+gets 304 Not Modified, and connections are kept alive (HTTP/1.1), so
+flipping between levels re-sends nothing that did not change.
+
+POST /api/check answers "is this avoid placement playable?" while the user
+is still moving items. Each cached level also keeps a path_graph.PathGraph
+(snapped corridor graph plus segment bucket index), so a check is a few
+indexed nearest-segment lookups and one breadth-first search per item.
+"""
 
 from __future__ import annotations
 
 import argparse
+import gzip
+import hashlib
 import json
+import math
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Optional
 from urllib.parse import parse_qs, urlparse
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from manifest_store import write_if_changed
+from path_graph import PathGraph
+from validate_labyrinths import MIN_AVOID_START_DIST
+
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 LAB_DIR = ROOT_DIR / "LowDopamineLabyrinth" / "LowDopamineLabyrinth" / "Resources" / "Labyrinths"
 HTML_PATH = Path(__file__).resolve().with_name("avoid_editor.html")
 AVOID_TARGETS = {"easy": 1, "medium": 3, "hard": 4}
+POLL_SECONDS = 1.0
+LRU_SIZE = 32
+# Smaller bodies are sent uncompressed; gzip would barely shrink them.
+MIN_COMPRESS_BYTES = 512
+ENCODERS = {
+    "gzip": lambda body: gzip.compress(body, mtime=0),
+    "deflate": zlib.compress,
+}
+JSON_TYPE = "application/json; charset=utf-8"
 
 
 def load_labyrinth(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def avoid_paths() -> list[Path]:
-    paths = []
-    for path in sorted(LAB_DIR.glob("denny_*.json")):
-        data = load_labyrinth(path)
-        if data.get("item_rule") == "avoid":
-            paths.append(path)
-    return paths
+def file_stamp(path: Path) -> Optional[tuple]:
+    """(mtime_ns, size) of *path*, or None if it is gone."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CachedResponse:
+    """A serialized GET body with its ETag and lazily compressed encodings."""
+
+    __slots__ = ("body", "content_type", "etag", "_encoded")
+
+    def __init__(self, body: bytes, content_type: str = JSON_TYPE):
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self._encoded: dict[str, bytes] = {}
+
+    def encoded(self, coding: Optional[str]) -> bytes:
+        if coding is None:
+            return self.body
+        if coding not in self._encoded:
+            self._encoded[coding] = ENCODERS[coding](self.body)
+        return self._encoded[coding]
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        """Strong ETag of one encoding (each encoding is a different representation)."""
+        return self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True if an If-None-Match header names any encoding of this body."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags:
+            return True
+        return any(self.etag_for(coding) in tags for coding in (None, *ENCODERS))
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """The ENCODERS coding to use for an Accept-Encoding header (gzip first), or None."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ENCODERS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
 
+def item_point(item: dict) -> tuple[float, float]:
+    """(x, y) of a posted avoid item; ValueError unless both are finite numbers."""
+    x, y = float(item["x"]), float(item["y"])
+    if not (math.isfinite(x) and math.isfinite(y)):
+        raise ValueError("non-finite coordinate")
+    return x, y
 
-def level_metadata(path: Path) -> dict:
-    lab = load_labyrinth(path)
+
+def check_placement(graph: PathGraph, path_data: dict, points: list[tuple[float, float]]) -> dict:
+    """/api/check report for avoid items at *points* on one level's corridor graph."""
+    start_point, end_point = path_data["start_point"], path_data["end_point"]
+    start = graph.attach_point(start_point)
+    end = graph.attach_point(end_point)
+    all_vertices, all_segments = set(), set()
+    items = []
+    for index, (x, y) in enumerate(points):
+        _, distance = graph.nearest(x, y)
+        start_distance = math.hypot(x - start_point["x"], y - start_point["y"])
+        vertices, segments = graph.blocks(x, y)
+        all_vertices |= vertices
+        all_segments |= segments
+        on_path = distance <= graph.tolerance
+        detour = (start is not None and end is not None
+                  and graph.shortest_hops(start, end, vertices, segments) is not None)
+        items.append({
+            "index": index,
+            "x": x,
+            "y": y,
+            "segment_distance": round(distance, 1),
+            "on_path": on_path,
+            "start_distance": round(start_distance, 1),
+            "far_from_start": start_distance >= MIN_AVOID_START_DIST,
+            "detour": detour,
+            "ok": on_path and detour and start_distance >= MIN_AVOID_START_DIST,
+        })
+    route = (start is not None and end is not None
+             and graph.shortest_hops(start, end, all_vertices, all_segments) is not None)
+    return {
+        "ok": route and all(item["ok"] for item in items),
+        "route": route,
+        "items": items,
+        "tolerance": graph.tolerance,
+        "min_start_distance": MIN_AVOID_START_DIST,
+    }
+
+
+def level_metadata(path: Path, lab: dict) -> dict:
     story_number = int(lab["id"].split("_")[1])
     return {
         "id": lab["id"],
@@ -44,62 +184,248 @@ def level_metadata(path: Path) -> dict:
     }
 
 
+class LevelIndex:
+    """Avoid levels in LAB_DIR, kept in memory and refreshed by file stamp."""
+
+    def __init__(self, lab_dir: Path = LAB_DIR, lru_size: int = LRU_SIZE):
+        self.lab_dir = lab_dir
+        self.lru_size = lru_size
+        self._lock = threading.Lock()
+        self._stamps: dict[str, tuple] = {}       # file name -> (mtime_ns, size)
+        self._metadata: dict[str, dict] = {}      # level id -> level_metadata (avoid levels only)
+        # level id -> [stamp, labyrinth, CachedResponse of /api/level, PathGraph] (last two built lazily)
+        self._parsed: OrderedDict[str, list] = OrderedDict()
+        self._levels_response = CachedResponse(b"")
+        self._html: Optional[tuple] = None  # (stamp, CachedResponse)
+        self._stop = threading.Event()
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Re-stat LAB_DIR and re-read the files that changed; True if the level list changed."""
+        stamps = {}
+        with os.scandir(self.lab_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("denny_") and entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamps == self._stamps:
+                return False
+            metadata = {meta["id"]: meta for meta in self._metadata.values()
+                        if self._stamps.get(f"{meta['id']}.json") == stamps.get(f"{meta['id']}.json")}
+            for name, stamp in stamps.items():
+                level_id = name[:-len(".json")]
+                if self._stamps.get(name) == stamp:
+                    continue
+                path = self.lab_dir / name
+                lab = self._read(level_id, path, stamp)
+                if lab is not None and lab.get("item_rule") == "avoid":
+                    metadata[level_id] = level_metadata(path, lab)
+            self._stamps = stamps
+            self._metadata = dict(sorted(metadata.items()))
+            self._levels_response = CachedResponse(json.dumps(
+                {"levels": list(self._metadata.values())}, ensure_ascii=False).encode("utf-8"))
+            return True
+
+    def _read(self, level_id: str, path: Path, stamp: tuple) -> Optional[dict]:
+        """Parse *path* into the LRU (lock held); None if it is not valid JSON."""
+        try:
+            lab = load_labyrinth(path)
+        except (OSError, json.JSONDecodeError):
+            return None
+        self._remember(level_id, stamp, lab)
+        return lab
+
+    def _remember(self, level_id: str, stamp: tuple, lab: dict) -> None:
+        self._parsed[level_id] = [stamp, lab, None, None]
+        self._parsed.move_to_end(level_id)
+        while len(self._parsed) > self.lru_size:
+            self._parsed.popitem(last=False)
+
+    def levels_response(self) -> CachedResponse:
+        """The /api/levels response."""
+        return self._levels_response
+
+    def html_response(self) -> CachedResponse:
+        """avoid_editor.html, re-read only when the file changes."""
+        stamp = file_stamp(HTML_PATH)
+        cached = self._html
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, CachedResponse(HTML_PATH.read_bytes(), "text/html; charset=utf-8"))
+            self._html = cached
+        return cached[1]
+
+    def path(self, level_id: str) -> Optional[Path]:
+        """The file of avoid level *level_id*, or None if there is no such level."""
+        if level_id not in self._metadata:
+            return None
+        return self.lab_dir / f"{level_id}.json"
+
+    def get(self, level_id: str) -> Optional[dict]:
+        """Parsed labyrinth (shared, do not mutate), re-read only if its file changed."""
+        path = self.path(level_id)
+        if path is None:
+            return None
+        stamp = file_stamp(path)
+        with self._lock:
+            cached = self._parsed.get(level_id)
+            if cached is not None and cached[0] == stamp:
+                self._parsed.move_to_end(level_id)
+                return cached[1]
+            if stamp is None:
+                return None
+            return self._read(level_id, path, stamp)
+
+    def level_response(self, level_id: str) -> Optional[CachedResponse]:
+        """The /api/level response: the labyrinth plus the editor's _editor block.
+
+        Building it also builds the level's PathGraph, so the first
+        /api/check after opening a level does not pay for it.
+        """
+        lab = self.get(level_id)
+        if lab is None:
+            return None
+        with self._lock:
+            cached = self._parsed.get(level_id)
+            if cached is not None and cached[1] is lab and cached[2] is not None:
+                return cached[2]
+        self.graph(level_id)
+        response = CachedResponse(json.dumps({
+            **lab,
+            "_editor": {
+                "required_count": AVOID_TARGETS.get(lab["difficulty"], len(lab["path_data"].get("avoid_items", []))),
+                "file": str(self.path(level_id).relative_to(ROOT_DIR)),
+            },
+        }, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            cached = self._parsed.get(level_id)
+            if cached is not None and cached[1] is lab:
+                cached[2] = response
+        return response
+
+    def graph(self, level_id: str) -> Optional[tuple[dict, PathGraph]]:
+        """(labyrinth, its corridor PathGraph), the graph built once per cached copy."""
+        lab = self.get(level_id)
+        if lab is None:
+            return None
+        with self._lock:
+            cached = self._parsed.get(level_id)
+            if cached is not None and cached[1] is lab and cached[3] is not None:
+                return lab, cached[3]
+        graph = PathGraph(lab["path_data"])
+        with self._lock:
+            cached = self._parsed.get(level_id)
+            if cached is not None and cached[1] is lab:
+                cached[3] = graph
+        return lab, graph
+
+    def save(self, level_id: str, lab: dict) -> Path:
+        """Write *lab* to its level file and keep it as the cached copy."""
+        path = self.lab_dir / f"{level_id}.json"
+        with self._lock:
+            write_if_changed(path, json.dumps(lab, ensure_ascii=False, indent=2) + "\n")
+            stamp = file_stamp(path)
+            self._remember(level_id, stamp, lab)
+            self._stamps[path.name] = stamp
+        return path
+
+    def start_polling(self, interval: float = POLL_SECONDS) -> threading.Thread:
+        def poll():
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        thread = threading.Thread(target=poll, name="level-index-poll", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
 class AvoidEditorHandler(BaseHTTPRequestHandler):
     server_version = "AvoidEditor/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive; every response sets Content-Length
+    timeout = 60  # close idle keep-alive connections
+    # Headers and body go out in separate writes; with Nagle on, a kept-alive
+    # connection stalls each response on the client's delayed ACK (~40 ms).
+    disable_nagle_algorithm = True
+    index: LevelIndex
 
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
         if parsed.path == "/":
-            self._send_html()
+            self._send_cached(self.index.html_response())
             return
         if parsed.path == "/api/levels":
-            levels = [level_metadata(path) for path in avoid_paths()]
-            self._send_json({"levels": levels})
+            self._send_cached(self.index.levels_response())
             return
         if parsed.path == "/api/level":
             level_id = parse_qs(parsed.query).get("id", [None])[0]
             if not level_id:
                 self._send_error_json(HTTPStatus.BAD_REQUEST, "Missing level id")
                 return
-            path = LAB_DIR / f"{level_id}.json"
-            if not path.exists():
+            response = self.index.level_response(level_id)
+            if response is None:
                 self._send_error_json(HTTPStatus.NOT_FOUND, f"Unknown level: {level_id}")
                 return
-            lab = load_labyrinth(path)
-            lab["_editor"] = {
-                "required_count": AVOID_TARGETS.get(lab["difficulty"], len(lab["path_data"].get("avoid_items", []))),
-                "file": str(path.relative_to(ROOT_DIR)),
-            }
-            self._send_json(lab)
+            self._send_cached(response)
             return
 
         self._send_error_json(HTTPStatus.NOT_FOUND, "Not found")
 
     def do_POST(self) -> None:
-        if self.path != "/api/save":
-            self._send_error_json(HTTPStatus.NOT_FOUND, "Not found")
-            return
-
         content_length = int(self.headers.get("Content-Length", "0"))
         payload = self.rfile.read(content_length)
+        if self.path not in ("/api/save", "/api/check"):
+            self._send_error_json(HTTPStatus.NOT_FOUND, "Not found")
+            return
         try:
             data = json.loads(payload.decode("utf-8"))
-        except json.JSONDecodeError:
+        except (UnicodeDecodeError, json.JSONDecodeError):
             self._send_error_json(HTTPStatus.BAD_REQUEST, "Invalid JSON")
             return
+        if not isinstance(data, dict):
+            self._send_error_json(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+            return
+        if self.path == "/api/check":
+            self._check(data)
+        else:
+            self._save(data)
 
+    def _check(self, data: dict) -> None:
+        started = time.perf_counter()
         level_id = data.get("id")
         avoid_items = data.get("avoid_items")
         if not level_id or not isinstance(avoid_items, list):
             self._send_error_json(HTTPStatus.BAD_REQUEST, "Expected id and avoid_items")
             return
+        found = self.index.graph(level_id)
+        if found is None:
+            self._send_error_json(HTTPStatus.NOT_FOUND, f"Unknown level: {level_id}")
+            return
+        lab, graph = found
+        try:
+            points = [item_point(item) for item in avoid_items]
+        except (KeyError, TypeError, ValueError):
+            self._send_error_json(HTTPStatus.BAD_REQUEST, "Every item needs finite numeric x and y")
+            return
+        report = check_placement(graph, lab["path_data"], points)
+        report["id"] = level_id
+        report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        self._send_json(report)
 
-        path = LAB_DIR / f"{level_id}.json"
-        if not path.exists():
+    def _save(self, data: dict) -> None:
+        level_id = data.get("id")
+        avoid_items = data.get("avoid_items")
+        if not level_id or not isinstance(avoid_items, list):
+            self._send_error_json(HTTPStatus.BAD_REQUEST, "Expected id and avoid_items")
+            return
+
+        lab = self.index.get(level_id)
+        if lab is None:
             self._send_error_json(HTTPStatus.NOT_FOUND, f"Unknown level: {level_id}")
             return
 
-        lab = load_labyrinth(path)
         expected = AVOID_TARGETS.get(lab["difficulty"], len(avoid_items))
         if len(avoid_items) != expected:
             self._send_error_json(
@@ -112,10 +438,9 @@ class AvoidEditorHandler(BaseHTTPRequestHandler):
         normalized = []
         for item in avoid_items:
             try:
-                x = round(float(item["x"]), 1)
-                y = round(float(item["y"]), 1)
+                x, y = (round(value, 1) for value in item_point(item))
             except (KeyError, TypeError, ValueError):
-                self._send_error_json(HTTPStatus.BAD_REQUEST, "Every item needs numeric x and y")
+                self._send_error_json(HTTPStatus.BAD_REQUEST, "Every item needs finite numeric x and y")
                 return
             normalized.append({
                 "x": x,
@@ -124,25 +449,43 @@ class AvoidEditorHandler(BaseHTTPRequestHandler):
                 "on_solution": False,
             })
 
-        lab["path_data"]["avoid_items"] = normalized
-        path.write_text(json.dumps(lab, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        lab = {**lab, "path_data": {**lab["path_data"], "avoid_items": normalized}}
+        path = self.index.save(level_id, lab)
         self._send_json({"ok": True, "saved": level_id, "path": str(path.relative_to(ROOT_DIR))})
 
     def log_message(self, fmt: str, *args) -> None:  # noqa: A003
         return
 
-    def _send_html(self) -> None:
-        html = HTML_PATH.read_text(encoding="utf-8")
-        self.send_response(HTTPStatus.OK)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
-        self.send_header("Content-Length", str(len(html.encode("utf-8"))))
-        self.end_headers()
-        self.wfile.write(html.encode("utf-8"))
+    def _send_cached(self, response: CachedResponse) -> None:
+        """Send *response*, or 304 if the client's If-None-Match already has it."""
+        coding = None
+        if len(response.body) >= MIN_COMPRESS_BYTES:
+            coding = negotiate_encoding(self.headers.get("Accept-Encoding"))
+        headers = {
+            "ETag": response.etag_for(coding),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if response.matches(self.headers.get("If-None-Match")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        if coding:
+            headers["Content-Encoding"] = coding
+        self._send_body(response.encoded(coding), response.content_type, headers=headers)
 
     def _send_json(self, payload: dict, status: HTTPStatus = HTTPStatus.OK) -> None:
         body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send_body(body, JSON_TYPE, status)
+
+    def _send_body(self, body: bytes, content_type: str, status: HTTPStatus = HTTPStatus.OK,
+                   headers: Optional[dict] = None) -> None:
         self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
@@ -157,6 +500,8 @@ def main() -> None:
     parser.add_argument("--port", type=int, default=8123)
     args = parser.parse_args()
 
+    AvoidEditorHandler.index = LevelIndex()
+    AvoidEditorHandler.index.start_polling()
     server = ThreadingHTTPServer((args.host, args.port), AvoidEditorHandler)
     print(f"Avoid editor running at http://{args.host}:{args.port}")
     print("Open that URL in your browser. Changes save directly into the app JSON files.")
@@ -165,6 +510,7 @@ def main() -> None:
     except KeyboardInterrupt:
         pass
     finally:
+        AvoidEditorHandler.index.stop()
         server.server_close()
 
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Parallel, deterministic build runner for the labyrinth packs.
+
+Every pack is a list of independent story × difficulty variant jobs. A job
+names its builder function and carries its own seed, and the builder draws
+all randomness from a private random.Random(seed). A variant therefore comes
+out the same whichever worker builds it and in whatever order, so a
+--workers 8 run writes exactly the bytes a --workers 1 run does.
+
+pack_builder.py turns the pack specs in packs/*.yaml into jobs and runs them
+through run_variants(). Running this module rebuilds several packs in one
+process pool and merges manifest.json once at the end.
+
+Usage:
+    python build_runner.py                              # every pack, all cores
+    python build_runner.py --packs space forest --workers 4
+    python build_runner.py --dry-run                    # levels an edit made stale
+"""
+
+import argparse
+import importlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+DIFFICULTY_NAMES = ["easy", "medium", "hard"]
+
+
+def variant_seed(pack: str, story: str, difficulty: str) -> str:
+    """Seed for one variant, e.g. "forest-041-easy" (the forest pack's original scheme)."""
+    return f"{pack}-{story}-{difficulty}"
+
+
+def build_job(job: dict) -> Optional[dict]:
+    """Run the "module.function" builder a job names (top-level, so it pickles)."""
+    module_name, function_name = job["builder"].rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), function_name)(job)
+
+
+def run_variants(jobs: List[dict], workers: Optional[int] = None,
+                 candidates: int = 1) -> List[Optional[dict]]:
+    """Build every job, over a process pool unless workers == 1.
+
+    candidates > 1 has each builder keep the best of that many seeded mazes
+    (candidate_search.search_maze) instead of the first one.
+
+    Returns each builder's result in job order (pack_builder.build_variant
+    gives the level, or None where it failed, with its build time), so the
+    caller sees the same list however the work was scheduled.
+    """
+    if candidates > 1:
+        jobs = [dict(job, candidates=candidates) for job in jobs]
+    if workers == 1 or len(jobs) < 2:
+        return [build_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(build_job, jobs))
+
+
+def main():
+    # Imported here: pack_builder itself imports this module.
+    from pack_builder import build_packs, pack_names
+
+    parser = argparse.ArgumentParser(description="Rebuild labyrinth packs in parallel")
+    parser.add_argument("--packs", nargs="+", choices=pack_names(), default=pack_names(),
+                        help="Packs to rebuild (default: all, see packs/)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (1 builds serially; output is identical either way)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Output directory (default: output/labyrinths/)")
+    parser.add_argument("--source-dir", type=str, default=None,
+                        help="Base story JSONs for the difficulty pack (default: output dir)")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="Mazes to try per variant, keeping the best-scoring one (default: 1)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List the levels whose inputs changed since the last build, build nothing")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every level, not only those whose inputs changed")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output) if args.output else Path(__file__).parent / "output" / "labyrinths"
+    source_dir = Path(args.source_dir) if args.source_dir else output_dir
+    build_packs(args.packs, output_dir, source_dir, args.workers, args.candidates,
+                dry_run=args.dry_run, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
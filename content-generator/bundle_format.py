@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Compact binary encoding of labyrinth JSONs for the app bundle.
+
+The bundled JSONs spend most of their bytes on path_data: hundreds of
+{"start": {"x": .., "y": ..}, "end": {..}} segment objects and long SVG
+path strings, nearly all of them grid-aligned integers. This export stage
+stores those fields as binary sections and everything else as compact JSON;
+the indented JSONs stay as the human-readable debug mirror.
+
+File layout (little-endian):
+
+    b"LDLB" | version u8 | flags u8 | meta_len u32 | meta | sections...
+
+meta is the labyrinth as compact UTF-8 JSON, with every path_data field
+that has a section below set to null (keeping the key order). Each section
+is tag (4 bytes) | flags u8 | length u32 | payload, where flags bit 0 means
+the field's numbers were JSON floats. Coordinates are quantized to 0.1 and
+stored as int16.
+
+    GRID  segments as a wall bitmask: origin x, y and cell size (int16),
+          rows, cols (u16), then 2 bits per cell (open right, open down),
+          four cells per byte. The segments are re-derived in the order
+          generate_maze() emits them.
+    SEGS  segments as a flat int16 array x1, y1, x2, y2, ... (used when
+          they are not a plain grid).
+    SVGP  svg_path and
+    SOLP  solution_path: command count u32, one command byte each, then
+          the int16 arguments.
+    CTRL  control_points: count u32, then int16 x, y pairs, each pair
+          stored as the delta from the previous point.
+    SIDX  segment_index: only its bucket size (JSON number); the decoder
+          rebuilds the index from the segments with segment_index.py.
+
+A field is only encoded if decoding reproduces it exactly; otherwise it
+stays in the meta JSON, so decode(encode(lab)) == lab always holds.
+
+Usage:
+    python bundle_format.py                          # bundle Resources -> output/bundle/
+    python bundle_format.py --input DIR --output DIR
+    python bundle_format.py --verify                 # round-trip check only, no files written
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from segment_index import build_segment_index
+
+MAGIC = b"LDLB"
+VERSION = 1
+FLAG_DEFLATE = 1
+SECTION_FLOAT = 1
+
+QUANT = 10
+INT16_MIN, INT16_MAX = -32768, 32767
+
+# SVG path command -> (code, argument count)
+PATH_COMMANDS = {"M": (0, 2), "L": (1, 2), "Q": (2, 4), "C": (3, 6), "Z": (4, 0)}
+PATH_CODES = {code: (name, argc) for name, (code, argc) in PATH_COMMANDS.items()}
+
+HEADER = struct.Struct("<4sBBI")
+SECTION = struct.Struct("<4sBI")
+GRID_HEADER = struct.Struct("<hhhHH")
+
+DEFAULT_INPUT = (Path(__file__).parent.parent / "LowDopamineLabyrinth" / "LowDopamineLabyrinth"
+                 / "Resources" / "Labyrinths")
+DEFAULT_OUTPUT = Path(__file__).parent / "output" / "bundle"
+
+
+# ---------------------------------------------------------------------------
+# Numbers
+# ---------------------------------------------------------------------------
+
+def _quantize(values: List[float]) -> Optional[Tuple[List[int], bool]]:
+    """Quantize *values* losslessly, or None if any value would change.
+
+    Returns (ints, is_float). All values must share one JSON type so the
+    decoder can restore it.
+    """
+    if not values:
+        return [], False
+    is_float = isinstance(values[0], float)
+    out = []
+    for v in values:
+        if isinstance(v, bool) or not isinstance(v, (int, float)) or isinstance(v, float) != is_float:
+            return None
+        q = round(v * QUANT)
+        if not INT16_MIN <= q <= INT16_MAX or q / QUANT != v:
+            return None
+        out.append(q)
+    return out, is_float
+
+
+def _restore(q: int, is_float: bool):
+    return q / QUANT if is_float else q // QUANT
+
+
+def _i16_bytes(values: List[int]) -> bytes:
+    data = array("h", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _i16_values(payload: bytes) -> List[int]:
+    data = array("h")
+    data.frombytes(payload)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tolist()
+
+
+# ---------------------------------------------------------------------------
+# Segments
+# ---------------------------------------------------------------------------
+
+def _segment_coords(segments: list) -> Optional[list]:
+    coords = []
+    try:
+        for seg in segments:
+            if set(seg) != {"start", "end"}:
+                return None
+            for point in (seg["start"], seg["end"]):
+                if list(point) != ["x", "y"]:
+                    return None
+                coords.extend((point["x"], point["y"]))
+    except (TypeError, AttributeError):
+        return None
+    return coords
+
+
+def _segments_from_coords(coords: list) -> list:
+    return [
+        {"start": {"x": coords[i], "y": coords[i + 1]},
+         "end": {"x": coords[i + 2], "y": coords[i + 3]}}
+        for i in range(0, len(coords), 4)
+    ]
+
+
+def grid_segments(ox, oy, cell, rows: int, cols: int, open_bits: bytes) -> list:
+    """Segments of a grid maze, in generate_maze()'s row-major right/down order."""
+    segments = []
+    for r in range(rows):
+        cy = oy + r * cell
+        for c in range(cols):
+            bits = open_bits[r * cols + c]
+            cx = ox + c * cell
+            if bits & 1:
+                segments.append({"start": {"x": cx, "y": cy}, "end": {"x": cx + cell, "y": cy}})
+            if bits & 2:
+                segments.append({"start": {"x": cx, "y": cy}, "end": {"x": cx, "y": cy + cell}})
+    return segments
+
+
+def _encode_grid(segments: list, q: List[int], is_float: bool) -> Optional[bytes]:
+    """GRID payload if the segments are exactly a cell lattice, else None."""
+    cell = None
+    for i in range(0, len(q), 4):
+        x1, y1, x2, y2 = q[i:i + 4]
+        length = abs(x2 - x1) + abs(y2 - y1)
+        if (x1 != x2 and y1 != y2) or x2 < x1 or y2 < y1 or length == 0:
+            return None
+        if cell is None:
+            cell = length
+        elif length != cell:
+            return None
+    if cell is None:
+        return None
+
+    ox = min(q[0::2])
+    oy = min(q[1::2])
+    if any((x - ox) % cell for x in q[0::2]) or any((y - oy) % cell for y in q[1::2]):
+        return None
+    cols = (max(q[0::2]) - ox) // cell + 1
+    rows = (max(q[1::2]) - oy) // cell + 1
+    if rows > 0xFFFF or cols > 0xFFFF:
+        return None
+
+    open_bits = bytearray(rows * cols)
+    for i in range(0, len(q), 4):
+        x1, y1, x2, _ = q[i:i + 4]
+        index = (y1 - oy) // cell * cols + (x1 - ox) // cell
+        open_bits[index] |= 1 if x2 != x1 else 2
+
+    rebuilt = grid_segments(_restore(ox, is_float), _restore(oy, is_float),
+                            _restore(cell, is_float), rows, cols, open_bits)
+    if rebuilt != segments or json.dumps(rebuilt) != json.dumps(segments):
+        return None
+
+    packed = bytearray((len(open_bits) + 3) // 4)
+    for index, bits in enumerate(open_bits):
+        packed[index >> 2] |= bits << ((index & 3) * 2)
+    return GRID_HEADER.pack(ox, oy, cell, rows, cols) + bytes(packed)
+
+
+def _decode_grid(payload: bytes, is_float: bool) -> list:
+    ox, oy, cell, rows, cols = GRID_HEADER.unpack_from(payload)
+    packed = payload[GRID_HEADER.size:]
+    open_bits = bytes((packed[i >> 2] >> ((i & 3) * 2)) & 3 for i in range(rows * cols))
+    return grid_segments(_restore(ox, is_float), _restore(oy, is_float),
+                         _restore(cell, is_float), rows, cols, open_bits)
+
+
+# ---------------------------------------------------------------------------
+# SVG paths
+# ---------------------------------------------------------------------------
+
+def _format_number(q: int, is_float: bool) -> str:
+    return str(_restore(q, is_float))
+
+
+def _encode_path(path: str) -> Optional[Tuple[bytes, bool]]:
+    """Command bytes + int16 arguments for *path*, if it re-renders identically."""
+    tokens = path.split(" ") if path else []
+    codes = bytearray()
+    numbers = []
+    i = 0
+    while i < len(tokens):
+        command = PATH_COMMANDS.get(tokens[i])
+        if command is None:
+            return None
+        code, argc = command
+        args = tokens[i + 1:i + 1 + argc]
+        if len(args) != argc:
+            return None
+        codes.append(code)
+        for token in args:
+            try:
+                numbers.append(float(token) if "." in token else int(token))
+            except ValueError:
+                return None
+        i += 1 + argc
+
+    quantized = _quantize(numbers)
+    if quantized is None:
+        return None
+    q, is_float = quantized
+    payload = struct.pack("<I", len(codes)) + bytes(codes) + _i16_bytes(q)
+    if _decode_path(payload, is_float) != path:
+        return None
+    return payload, is_float
+
+
+def _decode_path(payload: bytes, is_float: bool) -> str:
+    (count,) = struct.unpack_from("<I", payload)
+    codes = payload[4:4 + count]
+    numbers = _i16_values(payload[4 + count:])
+    tokens = []
+    pos = 0
+    for code in codes:
+        name, argc = PATH_CODES[code]
+        tokens.append(name)
+        tokens.extend(_format_number(q, is_float) for q in numbers[pos:pos + argc])
+        pos += argc
+    return " ".join(tokens)
+
+
+# ---------------------------------------------------------------------------
+# Control points
+# ---------------------------------------------------------------------------
+
+def _encode_control_points(points: list) -> Optional[Tuple[bytes, bool]]:
+    coords = []
+    for point in points:
+        if not isinstance(point, dict) or list(point) != ["x", "y"]:
+            return None
+        coords.extend((point["x"], point["y"]))
+    quantized = _quantize(coords)
+    if quantized is None:
+        return None
+    q, is_float = quantized
+    deltas = q[:2] + [q[i] - q[i - 2] for i in range(2, len(q))]
+    if any(not INT16_MIN <= d <= INT16_MAX for d in deltas):
+        return None
+    return struct.pack("<I", len(points)) + _i16_bytes(deltas), is_float
+
+
+def _decode_control_points(payload: bytes, is_float: bool) -> list:
+    deltas = _i16_values(payload[4:])
+    coords = []
+    for i, d in enumerate(deltas):
+        coords.append(d + coords[i - 2] if i >= 2 else d)
+    return [{"x": _restore(coords[i], is_float), "y": _restore(coords[i + 1], is_float)}
+            for i in range(0, len(coords), 2)]
+
+
+# ---------------------------------------------------------------------------
+# Labyrinth files
+# ---------------------------------------------------------------------------
+
+def _encode_segments(segments: list) -> Optional[Tuple[bytes, bytes, bool]]:
+    coords = _segment_coords(segments)
+    if coords is None:
+        return None
+    quantized = _quantize(coords)
+    if quantized is None:
+        return None
+    q, is_float = quantized
+    grid = _encode_grid(segments, q, is_float)
+    if grid is not None:
+        return b"GRID", grid, is_float
+    return b"SEGS", _i16_bytes(q), is_float
+
+
+def encode_labyrinth(lab: dict, compress: bool = True) -> bytes:
+    """Binary bundle encoding of one labyrinth dict."""
+    path_data = dict(lab.get("path_data") or {})
+    sections = []
+
+    if isinstance(path_data.get("segments"), list):
+        encoded = _encode_segments(path_data["segments"])
+        if encoded:
+            sections.append(encoded)
+            path_data["segments"] = None
+    for key, tag in (("svg_path", b"SVGP"), ("solution_path", b"SOLP")):
+        if isinstance(path_data.get(key), str):
+            encoded = _encode_path(path_data[key])
+            if encoded:
+                sections.append((tag, *encoded))
+                path_data[key] = None
+    if isinstance(path_data.get("control_points"), list):
+        encoded = _encode_control_points(path_data["control_points"])
+        if encoded:
+            sections.append((b"CTRL", *encoded))
+            path_data["control_points"] = None
+    index = path_data.get("segment_index")
+    if isinstance(index, dict) and isinstance(lab["path_data"].get("segments"), list):
+        rebuilt = build_segment_index(lab["path_data"]["segments"], index.get("bucket_size"))
+        if json.dumps(rebuilt) == json.dumps(index):
+            sections.append((b"SIDX", json.dumps(index["bucket_size"]).encode("ascii"), False))
+            path_data["segment_index"] = None
+
+    meta = dict(lab)
+    if "path_data" in lab:
+        meta["path_data"] = path_data
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    body = bytearray(meta_bytes)
+    for tag, payload, is_float in sections:
+        body += SECTION.pack(tag, SECTION_FLOAT if is_float else 0, len(payload))
+        body += payload
+    flags = 0
+    if compress:
+        body = zlib.compress(bytes(body), 9)
+        flags |= FLAG_DEFLATE
+    return HEADER.pack(MAGIC, VERSION, flags, len(meta_bytes)) + bytes(body)
+
+
+def decode_labyrinth(data: bytes) -> dict:
+    """Inverse of encode_labyrinth()."""
+    magic, version, flags, meta_len = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a labyrinth bundle file")
+    if version != VERSION:
+        raise ValueError(f"unsupported bundle version {version}")
+    body = data[HEADER.size:]
+    if flags & FLAG_DEFLATE:
+        body = zlib.decompress(body)
+
+    lab = json.loads(body[:meta_len].decode("utf-8"))
+    path_data = lab.get("path_data")
+    pos = meta_len
+    index_bucket = None
+    while pos < len(body):
+        tag, section_flags, length = SECTION.unpack_from(body, pos)
+        pos += SECTION.size
+        payload = body[pos:pos + length]
+        pos += length
+        is_float = bool(section_flags & SECTION_FLOAT)
+        if tag == b"GRID":
+            path_data["segments"] = _decode_grid(payload, is_float)
+        elif tag == b"SEGS":
+            path_data["segments"] = _segments_from_coords(
+                [_restore(q, is_float) for q in _i16_values(payload)])
+        elif tag == b"SVGP":
+            path_data["svg_path"] = _decode_path(payload, is_float)
+        elif tag == b"SOLP":
+            path_data["solution_path"] = _decode_path(payload, is_float)
+        elif tag == b"CTRL":
+            path_data["control_points"] = _decode_control_points(payload, is_float)
+        elif tag == b"SIDX":
+            index_bucket = json.loads(payload)
+        else:
+            raise ValueError(f"unknown bundle section {tag!r}")
+    if index_bucket is not None:
+        path_data["segment_index"] = build_segment_index(path_data["segments"], index_bucket)
+    return lab
+
+
+def verify_labyrinth(lab: dict, data: Optional[bytes] = None) -> bool:
+    """True if *data* (default: a fresh encoding) decodes back to exactly *lab*."""
+    decoded = decode_labyrinth(data if data is not None else encode_labyrinth(lab))
+    return json.dumps(decoded, ensure_ascii=False) == json.dumps(lab, ensure_ascii=False)
+
+
+def section_summary(data: bytes) -> Dict[str, int]:
+    """Payload bytes per section tag (plus "meta") of an encoded file, before deflate."""
+    _, _, flags, meta_len = HEADER.unpack_from(data)
+    body = data[HEADER.size:]
+    if flags & FLAG_DEFLATE:
+        body = zlib.decompress(body)
+    sizes = {"meta": meta_len}
+    pos = meta_len
+    while pos < len(body):
+        tag, _, length = SECTION.unpack_from(body, pos)
+        sizes[tag.decode("ascii")] = length
+        pos += SECTION.size + length
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export labyrinth JSONs to the compact bundle format")
+    parser.add_argument("--input", type=str, default=None, help="Directory of labyrinth JSONs (default: app Resources)")
+    parser.add_argument("--output", type=str, default=None, help="Directory for .ldlb files (default: output/bundle/)")
+    parser.add_argument("--no-deflate", action="store_true", help="Skip the zlib pass over each file")
+    parser.add_argument("--verify", action="store_true", help="Only check the round trip; write nothing")
+    args = parser.parse_args()
+
+    input_dir = Path(args.input) if args.input else DEFAULT_INPUT
+    output_dir = Path(args.output) if args.output else DEFAULT_OUTPUT
+    if not args.verify:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    json_bytes = bin_bytes = 0
+    json_secs = bin_secs = 0.0
+    modes = {}
+    failures = []
+    paths = sorted(input_dir.glob("*.json"))
+    count = 0
+    for path in paths:
+        raw = path.read_bytes()
+        started = time.perf_counter()
+        lab = json.loads(raw)
+        json_secs += time.perf_counter() - started
+        if "path_data" not in lab:
+            continue
+
+        data = encode_labyrinth(lab, compress=not args.no_deflate)
+        started = time.perf_counter()
+        ok = verify_labyrinth(lab, data)
+        bin_secs += time.perf_counter() - started
+        if not ok:
+            failures.append(path.name)
+            continue
+
+        sizes = section_summary(data)
+        mode = "grid" if "GRID" in sizes else "flat"
+        modes[mode] = modes.get(mode, 0) + 1
+        json_bytes += len(raw)
+        bin_bytes += len(data)
+        count += 1
+        if not args.verify:
+            (output_dir / f"{path.stem}.ldlb").write_bytes(data)
+
+    print(f"{count} labyrinths: {json_bytes / 1024:.0f} KB JSON -> {bin_bytes / 1024:.0f} KB bundle "
+          f"({json_bytes / max(bin_bytes, 1):.1f}x smaller); segments: "
+          + ", ".join(f"{n} {mode}" for mode, n in sorted(modes.items())))
+    print(f"Python load: json {json_secs * 1000:.0f} ms, bundle decode+verify {bin_secs * 1000:.0f} ms")
+    if failures:
+        print(f"Round trip FAILED for {len(failures)} files: {', '.join(failures)}")
+        sys.exit(1)
+    if not args.verify:
+        print(f"Bundle files written to: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
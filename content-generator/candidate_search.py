@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Best-of-N maze search for one level slot (story × difficulty).
+
+Instead of keeping whatever generate_maze returns for a single seed, a slot
+generates candidates 0, 1, 2, ... with seeds "<slot seed>-<i>" (see
+FullMazeGenerator.generate_mazes) and scores each with the checks
+validate_labyrinths.py runs on the finished JSON:
+
+    score = mean of the validator margins (each metric / its minimum, capped
+            at MAX_MARGIN) - ISSUE_PENALTY per validator issue
+            + SOLUTION_WEIGHT × share of cells on the solution
+
+The solution term only breaks ties: a carved maze's segment count is fixed
+by its grid, so candidates often match on every validator metric.
+
+The search stops at the first candidate with no issues. Otherwise it keeps
+the best score over all N, ties going to the lower index. Either way the
+pick depends only on the slot seed, never on how many workers helped. The
+winner carries maze_data["candidate"] = {seed, index, evaluated, score,
+issues}, which the pack builders copy into path_data so a level can be
+rebuilt from its seed alone.
+
+Usage:
+    python candidate_search.py --difficulty hard --shape moon --item-rule avoid -n 200
+    python candidate_search.py --difficulty medium --render-style corridor -n 500 --workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from maze_generator import FullMazeGenerator, MAZE_ALGORITHMS
+from validate_labyrinths import (
+    MIN_AVOID_START_DIST,
+    MIN_SEGMENTS,
+    MIN_START_END_DIST,
+    validate_labyrinth,
+)
+
+ISSUE_PENALTY = 10.0
+MAX_MARGIN = 2.0
+SOLUTION_WEIGHT = 0.1
+# Candidates per worker task in parallel searches; one round is workers × this.
+CHUNK_SIZE = 8
+
+
+def score_maze(maze_data: dict, difficulty: str,
+               item_rule: Optional[str] = None) -> Tuple[float, List[Tuple[str, str]]]:
+    """(score, validator issues) for one generate_maze result."""
+    lab = {"id": "candidate", "difficulty": difficulty, "item_rule": item_rule,
+           "path_data": maze_data}
+    issues = validate_labyrinth(lab)
+
+    start, end = maze_data["start_point"], maze_data["end_point"]
+    margins = [
+        len(maze_data["segments"]) / MIN_SEGMENTS.get(difficulty, 10),
+        math.hypot(start["x"] - end["x"], start["y"] - end["y"]) / MIN_START_END_DIST,
+    ]
+    avoid_items = maze_data.get("avoid_items", [])
+    if item_rule == "avoid" and avoid_items:
+        nearest = min(math.hypot(item["x"] - start["x"], item["y"] - start["y"])
+                      for item in avoid_items)
+        margins.append(nearest / MIN_AVOID_START_DIST)
+    margin = sum(min(m, MAX_MARGIN) for m in margins) / len(margins)
+    generation = maze_data.get("generation", {})
+    cells = maze_data.get("grid_rows", 0) * maze_data.get("grid_cols", 0)
+    if cells:
+        margin += SOLUTION_WEIGHT * generation.get("solution_cells", 0) / cells
+    return margin - ISSUE_PENALTY * len(issues), issues
+
+
+def _score_range(task: tuple) -> List[tuple]:
+    """Worker: (index, score, issue types) for candidates first..first+count-1."""
+    spec, seed, first, count, difficulty, item_rule = task
+    maze_gen = FullMazeGenerator(random.Random())
+    scored = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for offset, maze in enumerate(maze_gen.generate_mazes(spec, count, seed, first)):
+            score, issues = score_maze(maze, difficulty, item_rule)
+            scored.append((first + offset, score, [kind for kind, _ in issues]))
+    return scored
+
+
+def _better(a: tuple, b: Optional[tuple]) -> bool:
+    """Higher score wins; equal scores keep the lower index."""
+    return b is None or a[1] > b[1] or (a[1] == b[1] and a[0] < b[0])
+
+
+def search_maze(maze_gen: FullMazeGenerator, spec: Dict[str, Any], candidates: int = 1,
+                seed: Optional[str] = None, workers: int = 1) -> Dict[str, Any]:
+    """Best of *candidates* generate_maze(**spec) results for one slot.
+
+    candidates <= 1 is a plain generate_maze call (no "candidate" record), so
+    pack output is unchanged unless a search is asked for. workers > 1
+    scores candidates in a process pool; pack builds already run one slot
+    per worker, so they search serially.
+    """
+    if candidates <= 1:
+        return maze_gen.generate_maze(**spec)
+    if seed is None:
+        seed = f"search-{maze_gen.rng.getrandbits(32):08x}"
+    difficulty = spec.get("difficulty", "easy")
+    item_rule = spec.get("item_rule")
+
+    best = None
+    best_maze = None
+    evaluated = 0
+    if workers <= 1:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for index, maze in enumerate(maze_gen.generate_mazes(spec, candidates, seed)):
+                score, issues = score_maze(maze, difficulty, item_rule)
+                evaluated += 1
+                entry = (index, score, [kind for kind, _ in issues])
+                if _better(entry, best):
+                    best, best_maze = entry, maze
+                if not issues:
+                    break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for round_start in range(0, candidates, workers * CHUNK_SIZE):
+                round_end = min(candidates, round_start + workers * CHUNK_SIZE)
+                tasks = [(spec, seed, first, min(CHUNK_SIZE, round_end - first), difficulty, item_rule)
+                         for first in range(round_start, round_end, CHUNK_SIZE)]
+                scored = [entry for chunk in pool.map(_score_range, tasks) for entry in chunk]
+                passing = [entry for entry in scored if not entry[2]]
+                if passing:
+                    # Same pick and count as the serial search, which stops here.
+                    best = min(passing, key=lambda entry: entry[0])
+                    evaluated = best[0] + 1
+                    break
+                evaluated += len(scored)
+                for entry in scored:
+                    if _better(entry, best):
+                        best = entry
+        # Rebuild the winner from its seed rather than shipping mazes between processes.
+        with contextlib.redirect_stdout(io.StringIO()):
+            best_maze = next(maze_gen.generate_mazes(spec, 1, seed, best[0]))
+
+    index, score, issue_types = best
+    best_maze["candidate"] = {
+        "seed": f"{seed}-{index}",
+        "index": index,
+        "evaluated": evaluated,
+        "score": round(score, 3),
+        "issues": issue_types,
+    }
+    return best_maze
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Best-of-N maze search for one level slot")
+    parser.add_argument("--difficulty", choices=list(MIN_SEGMENTS), default="hard")
+    parser.add_argument("--shape", type=str, default="rect", choices=list(FullMazeGenerator.SHAPE_MASKS))
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--cols", type=int, default=None)
+    parser.add_argument("--render-style", choices=["walls", "corridor"], default="walls")
+    parser.add_argument("--item-rule", choices=["collect", "avoid"], default=None)
+    parser.add_argument("--item-count", type=int, default=4)
+    parser.add_argument("--item-emoji", type=str, default="⭐")
+    parser.add_argument("--algorithm", choices=list(MAZE_ALGORITHMS), default="backtracker")
+    parser.add_argument("-n", "--candidates", type=int, default=100, help="Candidates to try at most (2+)")
+    parser.add_argument("--seed", type=str, default="search", help="Slot seed; candidate i uses <seed>-<i>")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (same pick either way)")
+    args = parser.parse_args()
+
+    spec = dict(difficulty=args.difficulty, age=4, shape=args.shape,
+                override_rows=args.rows, override_cols=args.cols,
+                render_style=args.render_style, algorithm=args.algorithm)
+    if args.item_rule:
+        spec.update(item_rule=args.item_rule, item_count=args.item_count, item_emoji=args.item_emoji)
+
+    started = time.perf_counter()
+    maze = search_maze(FullMazeGenerator(random.Random()), spec, max(2, args.candidates), args.seed,
+                       max(1, args.workers or os.cpu_count()))
+    elapsed = time.perf_counter() - started
+    candidate = maze["candidate"]
+    print(f"Picked {candidate['seed']} after {candidate['evaluated']} candidates "
+          f"in {elapsed:.2f}s: score {candidate['score']}, "
+          f"issues {', '.join(candidate['issues']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,9 @@ import random
 from pathlib import Path
 
 import yaml
+from manifest_store import ManifestStore
 from maze_generator import FullMazeGenerator
+from segment_index import add_segment_index
 
 STORIES = {
     # === EASY (ages 3-4): 10 stories ===
@@ -459,12 +461,14 @@ def main():
                     "canvas_width": maze_data.get("canvas_width", 600),
                     "canvas_height": maze_data.get("canvas_height", 500),
                     "control_points": maze_data.get("control_points", []),
+                    "svg_stats": maze_data.get("svg_stats", {}),
                 },
                 "visual_theme": {
                     "background_color": vt["background_color"],
                     "decorative_elements": vt["decorative_elements"],
                 },
             }
+            add_segment_index(labyrinth["path_data"])
             all_labs.append(labyrinth)
 
             # Save JSON
@@ -480,18 +484,12 @@ def main():
 
             print(f"  Generated: {lab_id} ({theme}, {shape})")
 
-    # Save manifest
-    manifest = {
-        "total": len(all_labs),
-        "labyrinths": [
-            {"id": lab["id"], "age_range": lab["age_range"],
-             "difficulty": lab["difficulty"], "theme": lab["theme"],
-             "title": lab["title"]}
-            for lab in all_labs
-        ],
-    }
-    with open(output_dir / "manifest.json", "w") as f:
-        json.dump(manifest, f, indent=2)
+    # Merge into the manifest, keeping other packs' entries
+    with ManifestStore(output_dir / "manifest.json") as store:
+        for lab in all_labs:
+            store.add({"id": lab["id"], "age_range": lab["age_range"],
+                       "difficulty": lab["difficulty"], "theme": lab["theme"],
+                       "title": lab["title"]})
 
     print(f"\nDone! Generated {len(all_labs)} labyrinths.")
     print(f"JSON files: {output_dir}")
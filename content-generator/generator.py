@@ -6,11 +6,14 @@ for the Low Dopamine Labyrinth iOS app.
 """
 
 import argparse
+import asyncio
 import json
 import os
 import random
 import sys
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
 import yaml
 from dotenv import load_dotenv
@@ -21,7 +24,11 @@ except ImportError:
     print("Error: anthropic package not installed. Run: pip install anthropic")
     sys.exit(1)
 
+from manifest_store import ManifestStore
 from maze_generator import FullMazeGenerator
+from pack_builder import build_packs
+from segment_index import add_segment_index
+from story_cache import DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_MB, StoryCache
 
 
 def load_config() -> dict:
@@ -45,18 +52,29 @@ def get_age_group(age: int, config: dict) -> dict:
         return config["age_groups"]["older"]
 
 
-def generate_story(client: anthropic.Anthropic, age: int, difficulty: str, theme: str) -> dict:
-    """Call Claude API to generate a story package."""
-    template = load_prompt_template()
-    prompt = template.format(age=age, difficulty=difficulty, theme=theme)
+STORY_MODEL = "claude-sonnet-4-20250514"
+STORY_MAX_TOKENS = 1024
+
+# Concurrent story requests in flight; --concurrency overrides it.
+DEFAULT_CONCURRENCY = 5
+# Status codes worth retrying: timeouts, conflicts, rate limits, server errors, overload.
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Backoff jitter must not consume the global RNG the mazes are drawn from.
+_retry_rng = random.Random()
+
+
+def story_prompt_parts(age: int, difficulty: str, theme: str) -> tuple:
+    """(template, variables) for story_prompt.txt; the pair is also the cache key."""
+    return load_prompt_template(), {"age": age, "difficulty": difficulty, "theme": theme}
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}],
-    )
 
-    response_text = message.content[0].text.strip()
+def parse_story_response(response_text: str) -> dict:
+    """Parse Claude's story JSON, tolerating markdown code fences."""
+    response_text = response_text.strip()
     # Strip markdown code fences if present
     if response_text.startswith("```"):
         lines = response_text.split("\n")
@@ -66,15 +84,149 @@ def generate_story(client: anthropic.Anthropic, age: int, difficulty: str, theme
     return json.loads(response_text)
 
 
-def generate_labyrinth(
+def request_story(
     client: anthropic.Anthropic,
-    lab_id: str,
-    age: int,
-    difficulty: str,
-    theme: str,
-    config: dict,
+    template: str,
+    variables: dict,
+    cache: Optional[StoryCache] = None,
+    variant: str = "",
 ) -> dict:
-    """Generate a complete labyrinth: story + maze data."""
+    """Format *template* and call Claude, consulting *cache* first."""
+    key = cache.key(STORY_MODEL, template, variables, variant) if cache else None
+    if cache:
+        story = cache.get(key)
+        if story is not None:
+            return story
+    message = client.messages.create(
+        model=STORY_MODEL,
+        max_tokens=STORY_MAX_TOKENS,
+        messages=[{"role": "user", "content": template.format(**variables)}],
+    )
+    story = parse_story_response(message.content[0].text)
+    if cache:
+        cache.put(key, story)
+    return story
+
+
+def generate_story(client: anthropic.Anthropic, age: int, difficulty: str, theme: str,
+                   cache: Optional[StoryCache] = None, variant: str = "") -> dict:
+    """Call Claude API to generate a story package."""
+    template, variables = story_prompt_parts(age, difficulty, theme)
+    return request_story(client, template, variables, cache, variant)
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying *error*, or None if it is not retryable."""
+    if isinstance(error, anthropic.APIStatusError):
+        if error.status_code not in RETRYABLE_STATUS:
+            return None
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+    elif not isinstance(error, anthropic.APIConnectionError):
+        return None
+    delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY)
+    return delay * (0.5 + _retry_rng.random() / 2)
+
+
+async def request_story_async(
+    client: anthropic.AsyncAnthropic,
+    template: str,
+    variables: dict,
+    semaphore: asyncio.Semaphore,
+    label: str = "story",
+    cache: Optional[StoryCache] = None,
+    variant: str = "",
+) -> dict:
+    """Request one story under *semaphore*, retrying 429/5xx with exponential backoff.
+
+    A *cache* hit (keyed by the prompt and *variant*) returns without
+    touching the network. The semaphore is released while backing off so
+    other requests can use the slot.
+    """
+    key = cache.key(STORY_MODEL, template, variables, variant) if cache else None
+    if cache:
+        story = cache.get(key)
+        if story is not None:
+            return story
+    prompt = template.format(**variables)
+    for attempt in range(MAX_RETRIES + 1):
+        async with semaphore:
+            try:
+                message = await client.messages.create(
+                    model=STORY_MODEL,
+                    max_tokens=STORY_MAX_TOKENS,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+                story = parse_story_response(message.content[0].text)
+                if cache:
+                    cache.put(key, story)
+                return story
+            except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+                delay = _retry_delay(e, attempt)
+                if delay is None or attempt == MAX_RETRIES:
+                    raise
+                status = getattr(e, "status_code", "connection error")
+                print(f"  Retrying {label} in {delay:.1f}s ({status})")
+        await asyncio.sleep(delay)
+
+
+def _build_mazes(plans: list) -> list:
+    """Run every plan's maze builder in order (exceptions are returned, not raised)."""
+    mazes = []
+    for plan in plans:
+        try:
+            mazes.append(plan["build_maze"]())
+        except Exception as e:
+            mazes.append(e)
+    return mazes
+
+
+async def run_story_pipeline(
+    client: anthropic.AsyncAnthropic,
+    plans: list,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: Optional[StoryCache] = None,
+) -> list:
+    """Generate labyrinths from *plans* with their story requests in flight together.
+
+    Each plan is a dict with "id", "template" and "variables" (the story
+    prompt), "build_maze" (no-arg callable) and "assemble" (callable taking
+    the maze and the story).  All story
+    requests start at once, bounded by *concurrency*; the mazes are built
+    meanwhile on a worker thread, in plan order so the RNG sequence matches
+    a serial run.  Failed labyrinths are reported and skipped.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    story_tasks = [
+        asyncio.create_task(request_story_async(
+            client, plan["template"], plan["variables"], semaphore, plan["id"], cache, plan["id"]))
+        for plan in plans
+    ]
+    mazes = await asyncio.to_thread(_build_mazes, plans)
+    for maze, task in zip(mazes, story_tasks):
+        if isinstance(maze, Exception):
+            task.cancel()
+    stories = await asyncio.gather(*story_tasks, return_exceptions=True)
+
+    results = []
+    for plan, maze, story in zip(plans, mazes, stories):
+        error = maze if isinstance(maze, Exception) else story
+        if isinstance(error, BaseException):
+            print(f"  Error generating {plan['id']}: {error}")
+            continue
+        try:
+            results.append(plan["assemble"](maze, story))
+        except Exception as e:
+            print(f"  Error generating {plan['id']}: {e}")
+    return results
+
+
+def build_labyrinth_maze(age: int, difficulty: str, config: dict) -> tuple:
+    """Pick a shape for *age* and generate its maze: (maze_gen, maze_data)."""
     age_group = get_age_group(age, config)
 
     # Pick shape
@@ -90,9 +242,20 @@ def generate_labyrinth(
         canvas_width=600,
         canvas_height=500,
     )
+    return maze_gen, maze_data
 
-    # Generate story via Claude API
-    story = generate_story(client, age, difficulty, theme)
+
+def assemble_labyrinth(
+    lab_id: str,
+    age: int,
+    difficulty: str,
+    theme: str,
+    config: dict,
+    maze: tuple,
+    story: dict,
+) -> dict:
+    """Combine a build_labyrinth_maze() result and a story into a labyrinth package."""
+    maze_gen, maze_data = maze
 
     # Get visual theme
     visual_themes = config.get("visual_themes", {})
@@ -139,6 +302,7 @@ def generate_labyrinth(
             "canvas_width": maze_data.get("canvas_width", 600),
             "canvas_height": maze_data.get("canvas_height", 500),
             "control_points": maze_data.get("control_points", []),
+            "svg_stats": maze_data.get("svg_stats", {}),
         },
         "visual_theme": {
             "background_color": vt["background_color"],
@@ -150,8 +314,22 @@ def generate_labyrinth(
     return labyrinth
 
 
-def generate_batch(
+def generate_labyrinth(
     client: anthropic.Anthropic,
+    lab_id: str,
+    age: int,
+    difficulty: str,
+    theme: str,
+    config: dict,
+    cache: Optional[StoryCache] = None,
+) -> dict:
+    """Generate a complete labyrinth: story + maze data (synchronous client)."""
+    maze = build_labyrinth_maze(age, difficulty, config)
+    story = generate_story(client, age, difficulty, theme, cache, lab_id)
+    return assemble_labyrinth(lab_id, age, difficulty, theme, config, maze, story)
+
+
+def batch_plans(
     age: int,
     difficulty: str,
     themes: list,
@@ -159,19 +337,37 @@ def generate_batch(
     config: dict,
     start_id: int = 1,
 ) -> list:
-    """Generate a batch of labyrinths."""
-    results = []
+    """run_story_pipeline() plans for a batch of labyrinths."""
+    plans = []
     for i in range(count):
         theme = themes[i % len(themes)]
         lab_id = f"lab_{start_id + i:03d}"
         print(f"  Generating {lab_id}: age={age}, difficulty={difficulty}, theme={theme}...")
-        try:
-            lab = generate_labyrinth(client, lab_id, age, difficulty, theme, config)
-            results.append(lab)
-        except Exception as e:
-            print(f"  Error generating {lab_id}: {e}")
-            continue
-    return results
+        template, variables = story_prompt_parts(age, difficulty, theme)
+        plans.append({
+            "id": lab_id,
+            "template": template,
+            "variables": variables,
+            "build_maze": partial(build_labyrinth_maze, age, difficulty, config),
+            "assemble": partial(assemble_labyrinth, lab_id, age, difficulty, theme, config),
+        })
+    return plans
+
+
+def generate_batch(
+    client: anthropic.AsyncAnthropic,
+    age: int,
+    difficulty: str,
+    themes: list,
+    count: int,
+    config: dict,
+    start_id: int = 1,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: Optional[StoryCache] = None,
+) -> list:
+    """Generate a batch of labyrinths with concurrent story requests."""
+    plans = batch_plans(age, difficulty, themes, count, config, start_id)
+    return asyncio.run(run_story_pipeline(client, plans, concurrency, cache))
 
 
 def save_labyrinths(labyrinths: list, output_dir: Path):
@@ -180,6 +376,7 @@ def save_labyrinths(labyrinths: list, output_dir: Path):
     for lab in labyrinths:
         # Save JSON (without preview SVG to keep files smaller for bundling)
         lab_for_bundle = {k: v for k, v in lab.items() if k != "preview_svg"}
+        add_segment_index(lab_for_bundle["path_data"])
         json_path = output_dir / f"{lab['id']}.json"
         with open(json_path, "w") as f:
             json.dump(lab_for_bundle, f, indent=2)
@@ -193,44 +390,42 @@ def save_labyrinths(labyrinths: list, output_dir: Path):
             f.write(lab.get("preview_svg", ""))
 
 
-def generate_starter_pack(client: anthropic.Anthropic, config: dict, output_dir: Path):
-    """Generate the 30-labyrinth starter pack."""
-    all_labs = []
+def generate_starter_pack(client: anthropic.AsyncAnthropic, config: dict, output_dir: Path,
+                          concurrency: int = DEFAULT_CONCURRENCY,
+                          cache: Optional[StoryCache] = None):
+    """Generate the 30-labyrinth starter pack.
+
+    All three batches share one pipeline, so their story requests overlap.
+    """
+    plans = []
 
     # 10 easy for ages 3-4
     print("\n=== Generating EASY labyrinths (ages 3-4) ===")
     young_themes = config["age_groups"]["young"]["themes"]
-    easy_labs = generate_batch(client, 3, "easy", young_themes, 10, config, start_id=1)
-    all_labs.extend(easy_labs)
+    plans.extend(batch_plans(3, "easy", young_themes, 10, config, start_id=1))
 
     # 10 medium for ages 4-5
     print("\n=== Generating MEDIUM labyrinths (ages 4-5) ===")
     middle_themes = config["age_groups"]["middle"]["themes"]
-    medium_labs = generate_batch(client, 5, "medium", middle_themes, 10, config, start_id=11)
-    all_labs.extend(medium_labs)
+    plans.extend(batch_plans(5, "medium", middle_themes, 10, config, start_id=11))
 
     # 10 hard for ages 5-6
     print("\n=== Generating HARD labyrinths (ages 5-6) ===")
     older_themes = config["age_groups"]["older"]["themes"]
-    hard_labs = generate_batch(client, 6, "hard", older_themes, 10, config, start_id=21)
-    all_labs.extend(hard_labs)
+    plans.extend(batch_plans(6, "hard", older_themes, 10, config, start_id=21))
+
+    all_labs = asyncio.run(run_story_pipeline(client, plans, concurrency, cache))
 
     save_labyrinths(all_labs, output_dir)
 
-    # Save manifest
-    manifest = {
-        "total": len(all_labs),
-        "labyrinths": [
-            {"id": lab["id"], "age_range": lab["age_range"],
-             "difficulty": lab["difficulty"], "theme": lab["theme"],
-             "title": lab["title"]}
-            for lab in all_labs
-        ],
-    }
+    # Merge into the manifest, keeping other packs' entries
     manifest_path = output_dir / "manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
-    print(f"\nManifest saved: {manifest_path}")
+    with ManifestStore(manifest_path) as store:
+        for lab in all_labs:
+            store.add({"id": lab["id"], "age_range": lab["age_range"],
+                       "difficulty": lab["difficulty"], "theme": lab["theme"],
+                       "title": lab["title"]})
+    print(f"\nManifest saved: {manifest_path} ({store.total} labyrinths)")
     print(f"Total labyrinths generated: {len(all_labs)}")
 
 
@@ -248,12 +443,8 @@ def load_story_outlines() -> dict:
         return json.load(f)
 
 
-def generate_denny_story(
-    client: anthropic.Anthropic,
-    outline: dict,
-    universe: dict,
-) -> dict:
-    """Call Claude API with denny_story_prompt.txt template for a single story."""
+def denny_prompt_parts(outline: dict, universe: dict) -> tuple:
+    """(template, variables) of denny_story_prompt.txt for a single story outline."""
     template_path = Path(__file__).parent / "templates" / "denny_story_prompt.txt"
     with open(template_path) as f:
         template = f.read()
@@ -263,636 +454,181 @@ def generate_denny_story(
     end_char = universe["characters"][end_char_key]
     location = universe["locations"][outline["location"]]
 
-    prompt = template.format(
-        start_character_type=denny["type"],
-        start_character_description=denny["description"],
-        end_character_name=end_char["name"],
-        end_character_type=end_char["type"],
-        end_character_description=end_char["description"],
-        end_character_key=end_char_key,
-        location_name=location["name"],
-        location_description=location["description"],
-        story_summary=outline["story_summary"],
-        age_range=outline["age_range"],
+    return template, {
+        "start_character_type": denny["type"],
+        "start_character_description": denny["description"],
+        "end_character_name": end_char["name"],
+        "end_character_type": end_char["type"],
+        "end_character_description": end_char["description"],
+        "end_character_key": end_char_key,
+        "location_name": location["name"],
+        "location_description": location["description"],
+        "story_summary": outline["story_summary"],
+        "age_range": outline["age_range"],
+        "difficulty": outline["difficulty"],
+    }
+
+
+def generate_denny_story(
+    client: anthropic.Anthropic,
+    outline: dict,
+    universe: dict,
+    cache: Optional[StoryCache] = None,
+) -> dict:
+    """Call Claude API with denny_story_prompt.txt template for a single story."""
+    template, variables = denny_prompt_parts(outline, universe)
+    return request_story(client, template, variables, cache, outline["id"])
+
+
+# Map difficulty to age for maze generation
+DENNY_DIFFICULTY_AGE = {"easy": 3, "medium": 5, "hard": 6}
+
+
+def build_denny_maze(maze_gen: FullMazeGenerator, outline: dict) -> dict:
+    """Generate a maze with the grid size and shape from *outline*."""
+    rows, cols = outline["grid_size"]
+    return maze_gen.generate_maze(
         difficulty=outline["difficulty"],
+        age=DENNY_DIFFICULTY_AGE[outline["difficulty"]],
+        shape=outline["shape"],
+        canvas_width=600,
+        canvas_height=500,
+        override_rows=rows,
+        override_cols=cols,
     )
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}],
-    )
 
-    response_text = message.content[0].text.strip()
-    if response_text.startswith("```"):
-        lines = response_text.split("\n")
-        lines = [l for l in lines if not l.startswith("```")]
-        response_text = "\n".join(lines)
+def assemble_denny_labyrinth(
+    maze_gen: FullMazeGenerator,
+    outline: dict,
+    universe: dict,
+    maze_data: dict,
+    story: dict,
+) -> dict:
+    """Combine a Denny outline's maze and story into a labyrinth package."""
+    lab_id = outline["id"]
+    difficulty = outline["difficulty"]
+    end_char_key = outline["character_end"]
+    end_char = universe["characters"][end_char_key]
+    denny = universe["characters"]["denny"]
+    location = universe["locations"][outline["location"]]
 
-    return json.loads(response_text)
+    # Visual theme from location
+    bg_color = location["background_color"]
+    decorative = location["decorative_elements"]
 
+    # Generate preview SVG
+    svg = maze_gen.to_full_svg(maze_data, bg_color)
 
-def generate_denny_pack(client: anthropic.Anthropic, output_dir: Path):
+    return {
+        "id": lab_id,
+        "age_range": outline["age_range"],
+        "difficulty": difficulty,
+        "theme": "ocean",
+        "location": outline["location"],
+        "title": story.get("title", f"Denny's {location['name']} Adventure"),
+        "story_setup": story.get("story_setup", ""),
+        "instruction": story.get("instruction", ""),
+        "tts_instruction": story.get("tts_instruction", ""),
+        "character_start": story.get("character_start", {
+            "type": denny["type"],
+            "description": denny["description"],
+            "position": "bottom_left",
+            "name": "Denny",
+            "image_asset": "denny",
+        }),
+        "character_end": story.get("character_end", {
+            "type": end_char["type"],
+            "description": end_char["description"],
+            "position": "top_right",
+            "name": end_char["name"],
+            "image_asset": end_char_key,
+        }),
+        "educational_question": story.get("educational_question", ""),
+        "fun_fact": story.get("fun_fact", ""),
+        "completion_message": story.get("completion_message", "Well done!"),
+        "path_data": {
+            "svg_path": maze_data.get("svg_path", ""),
+            "solution_path": maze_data.get("solution_path", ""),
+            "width": maze_data.get("path_width", 30),
+            "complexity": difficulty,
+            "maze_type": maze_data.get("maze_type", "grid"),
+            "start_point": maze_data.get("start_point", {}),
+            "end_point": maze_data.get("end_point", {}),
+            "segments": maze_data.get("segments", []),
+            "canvas_width": maze_data.get("canvas_width", 600),
+            "canvas_height": maze_data.get("canvas_height", 500),
+            "control_points": maze_data.get("control_points", []),
+            "svg_stats": maze_data.get("svg_stats", {}),
+        },
+        "visual_theme": {
+            "background_color": bg_color,
+            "decorative_elements": decorative,
+        },
+        "preview_svg": svg,
+    }
+
+
+def generate_denny_pack(client: anthropic.AsyncAnthropic, output_dir: Path,
+                        concurrency: int = DEFAULT_CONCURRENCY,
+                        cache: Optional[StoryCache] = None):
     """Generate all 20 Denny labyrinths from story outlines."""
     universe = load_denny_universe()
     outlines_data = load_story_outlines()
     outlines = outlines_data["outlines"]
-
-    all_labs = []
     maze_gen = FullMazeGenerator()
 
-    # Map difficulty to age for maze generation
-    difficulty_age = {"easy": 3, "medium": 5, "hard": 6}
-
+    plans = []
     for outline in outlines:
-        lab_id = outline["id"]
-        difficulty = outline["difficulty"]
-        age = difficulty_age[difficulty]
-        rows, cols = outline["grid_size"]
-        shape = outline["shape"]
-        end_char_key = outline["character_end"]
-        end_char = universe["characters"][end_char_key]
-        denny = universe["characters"]["denny"]
-        location = universe["locations"][outline["location"]]
-
-        print(f"  Generating {lab_id}: {outline['story_summary']}...")
-
+        print(f"  Generating {outline['id']}: {outline['story_summary']}...")
         try:
-            # Generate maze with grid size from outline
-            maze_data = maze_gen.generate_maze(
-                difficulty=difficulty,
-                age=age,
-                shape=shape,
-                canvas_width=600,
-                canvas_height=500,
-                override_rows=rows,
-                override_cols=cols,
-            )
-
-            # Generate story via Claude API
-            story = generate_denny_story(client, outline, universe)
-
-            # Visual theme from location
-            bg_color = location["background_color"]
-            decorative = location["decorative_elements"]
-
-            # Generate preview SVG
-            svg = maze_gen.to_full_svg(maze_data, bg_color)
-
-            labyrinth = {
-                "id": lab_id,
-                "age_range": outline["age_range"],
-                "difficulty": difficulty,
-                "theme": "ocean",
-                "location": outline["location"],
-                "title": story.get("title", f"Denny's {location['name']} Adventure"),
-                "story_setup": story.get("story_setup", ""),
-                "instruction": story.get("instruction", ""),
-                "tts_instruction": story.get("tts_instruction", ""),
-                "character_start": story.get("character_start", {
-                    "type": denny["type"],
-                    "description": denny["description"],
-                    "position": "bottom_left",
-                    "name": "Denny",
-                    "image_asset": "denny",
-                }),
-                "character_end": story.get("character_end", {
-                    "type": end_char["type"],
-                    "description": end_char["description"],
-                    "position": "top_right",
-                    "name": end_char["name"],
-                    "image_asset": end_char_key,
-                }),
-                "educational_question": story.get("educational_question", ""),
-                "fun_fact": story.get("fun_fact", ""),
-                "completion_message": story.get("completion_message", "Well done!"),
-                "path_data": {
-                    "svg_path": maze_data.get("svg_path", ""),
-                    "solution_path": maze_data.get("solution_path", ""),
-                    "width": maze_data.get("path_width", 30),
-                    "complexity": difficulty,
-                    "maze_type": maze_data.get("maze_type", "grid"),
-                    "start_point": maze_data.get("start_point", {}),
-                    "end_point": maze_data.get("end_point", {}),
-                    "segments": maze_data.get("segments", []),
-                    "canvas_width": maze_data.get("canvas_width", 600),
-                    "canvas_height": maze_data.get("canvas_height", 500),
-                    "control_points": maze_data.get("control_points", []),
-                },
-                "visual_theme": {
-                    "background_color": bg_color,
-                    "decorative_elements": decorative,
-                },
-                "preview_svg": svg,
-            }
-
-            all_labs.append(labyrinth)
+            template, variables = denny_prompt_parts(outline, universe)
         except Exception as e:
-            print(f"  Error generating {lab_id}: {e}")
+            print(f"  Error generating {outline['id']}: {e}")
             continue
+        plans.append({
+            "id": outline["id"],
+            "template": template,
+            "variables": variables,
+            "build_maze": partial(build_denny_maze, maze_gen, outline),
+            "assemble": partial(assemble_denny_labyrinth, maze_gen, outline, universe),
+        })
+    all_labs = asyncio.run(run_story_pipeline(client, plans, concurrency, cache))
 
     save_labyrinths(all_labs, output_dir)
 
-    # Save manifest
-    manifest = {
-        "universe": "denny",
-        "total": len(all_labs),
-        "labyrinths": [
-            {"id": lab["id"], "age_range": lab["age_range"],
-             "difficulty": lab["difficulty"], "theme": lab["theme"],
-             "location": lab["location"], "title": lab["title"]}
-            for lab in all_labs
-        ],
-    }
+    # Merge into the manifest, keeping other packs' entries
     manifest_path = output_dir / "manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
-    print(f"\nManifest saved: {manifest_path}")
+    with ManifestStore(manifest_path) as store:
+        for lab in all_labs:
+            store.add({"id": lab["id"], "age_range": lab["age_range"],
+                       "difficulty": lab["difficulty"], "theme": lab["theme"],
+                       "location": lab["location"], "title": lab["title"]})
+    print(f"\nManifest saved: {manifest_path} ({store.total} labyrinths)")
     print(f"Total Denny labyrinths generated: {len(all_labs)}")
 
 
-def generate_difficulty_variants(source_dir: Path, output_dir: Path):
+def generate_difficulty_variants(source_dir: Path, output_dir: Path, workers: Optional[int] = None,
+                                 candidates: int = 1):
     """Generate 30 labyrinth variants (10 stories x 3 difficulty levels).
 
     Reuses story content from the first 10 existing JSONs (denny_001-010)
-    and generates new maze data at each difficulty level's grid size.
-    Audio is shared: all variants reference the base story's audio files.
+    and generates new maze data at each difficulty level's grid size
+    (packs/difficulty.yaml). Audio is shared: all variants reference the
+    base story's audio files.
     """
-    config = load_config()
-    difficulty_levels = config["difficulty_levels"]
-    maze_gen = FullMazeGenerator()
-
-    # Load existing base stories (denny_001 through denny_010)
-    base_stories = {}
-    for i in range(1, 11):
-        base_id = f"denny_{i:03d}"
-        json_path = source_dir / f"{base_id}.json"
-        if not json_path.exists():
-            print(f"  Warning: {json_path} not found, skipping")
-            continue
-        with open(json_path) as f:
-            base_stories[base_id] = json.load(f)
-
-    if not base_stories:
-        print("Error: No base story JSONs found")
-        return
-
-    output_dir.mkdir(parents=True, exist_ok=True)
-    all_labs = []
-    difficulty_names = ["easy", "medium", "hard"]
-
-    for base_id, base in base_stories.items():
-        story_num = base_id.split("_")[1]  # e.g. "001"
-        positions = STORY_POSITIONS.get(story_num, {})
-        start_pos = positions.get("start")
-        end_pos = positions.get("end")
+    build_packs(["difficulty"], output_dir, source_dir, workers, candidates)
 
-        for diff_name in difficulty_names:
-            variant_id = f"{base_id}_{diff_name}"
-            diff_config = difficulty_levels[diff_name]
-            rows, cols = diff_config["grid_size"]
-            path_width = diff_config["path_width"]
 
-            print(f"  Generating {variant_id} ({diff_name} {rows}x{cols})...")
-
-            try:
-                maze_data = maze_gen.generate_maze(
-                    difficulty=diff_name,
-                    age=4,
-                    shape="rect",
-                    canvas_width=600,
-                    canvas_height=500,
-                    override_rows=rows,
-                    override_cols=cols,
-                    start_position=start_pos,
-                    end_position=end_pos,
-                )
-
-                # Build variant from base story content + new maze
-                variant = {
-                    "id": variant_id,
-                    "age_range": base.get("age_range", "3-6"),
-                    "difficulty": diff_name,
-                    "theme": base.get("theme", "ocean"),
-                    "location": base.get("location", "sandy_shore"),
-                    "title": base["title"],
-                    "story_setup": base["story_setup"],
-                    "instruction": base["instruction"],
-                    "tts_instruction": base.get("tts_instruction", ""),
-                    "character_start": base["character_start"],
-                    "character_end": base["character_end"],
-                    "educational_question": base.get("educational_question", ""),
-                    "fun_fact": base.get("fun_fact", ""),
-                    "completion_message": base.get("completion_message", "Well done!"),
-                    "path_data": {
-                        "svg_path": maze_data.get("svg_path", ""),
-                        "solution_path": maze_data.get("solution_path", ""),
-                        "width": path_width,
-                        "complexity": diff_name,
-                        "maze_type": maze_data.get("maze_type", "grid"),
-                        "start_point": maze_data.get("start_point", {}),
-                        "end_point": maze_data.get("end_point", {}),
-                        "segments": maze_data.get("segments", []),
-                        "canvas_width": maze_data.get("canvas_width", 600),
-                        "canvas_height": maze_data.get("canvas_height", 500),
-                        "control_points": maze_data.get("control_points", []),
-                    },
-                    "visual_theme": base.get("visual_theme", {
-                        "background_color": "#4A90E2",
-                        "decorative_elements": ["stars"],
-                    }),
-                }
-
-                # Shared audio — reference base story's audio files
-                if base.get("audio_instruction"):
-                    variant["audio_instruction"] = base["audio_instruction"]
-                if base.get("audio_completion"):
-                    variant["audio_completion"] = base["audio_completion"]
-
-                all_labs.append(variant)
-            except Exception as e:
-                print(f"  Error generating {variant_id}: {e}")
-                continue
-
-    # Save individual JSONs
-    for lab in all_labs:
-        json_path = output_dir / f"{lab['id']}.json"
-        with open(json_path, "w") as f:
-            json.dump(lab, f, indent=2)
-        print(f"  Saved: {json_path}")
-
-    # Save manifest
-    manifest = {
-        "universe": "denny",
-        "total": len(all_labs),
-        "labyrinths": [
-            {"id": lab["id"], "difficulty": lab["difficulty"],
-             "theme": lab["theme"], "location": lab["location"],
-             "title": lab["title"]}
-            for lab in all_labs
-        ],
-    }
-    manifest_path = output_dir / "manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
-
-    # Generate difficulty_samples.json (first labyrinth's svg_path per level for maze previews)
-    samples = {}
-    for diff_name in difficulty_names:
-        for lab in all_labs:
-            if lab["difficulty"] == diff_name:
-                samples[diff_name] = lab["path_data"]["svg_path"]
-                break
-    samples_path = output_dir / "difficulty_samples.json"
-    with open(samples_path, "w") as f:
-        json.dump(samples, f, indent=2)
-
-    print(f"\nManifest saved: {manifest_path}")
-    print(f"Difficulty samples saved: {samples_path}")
-    print(f"Total variants generated: {len(all_labs)}")
-
-
-ADVENTURE_STORIES = {
-    "011": {
-        "title": "Denny's Shell Collection",
-        "character_end": "mama_coral",
-        "location": "sandy_shore",
-        "item_rule": "collect",
-        "item_emoji": "\U0001f41a",
-        "shape": "triangle",
-        "story_setup": "Mommy Coral asked Denny to collect beautiful shells scattered along the sandy shore. Can you help Denny find them all?",
-        "instruction": "Draw a path and collect all the shells along the way to reach Mommy Coral!",
-        "tts_instruction": "Help Denny collect all the shells on the beach! Draw a path through the maze and pick up every shell before reaching Mommy Coral.",
-        "educational_question": "How many shells did Denny collect? Can you count them?",
-        "fun_fact": "Seashells are the homes of soft-bodied animals called mollusks. When the animal grows too big, it makes a bigger shell!",
-        "completion_message": "Denny collected all the shells! Mommy Coral is so proud!",
-    },
-    "012": {
-        "title": "Denny's Pearl Dive",
-        "character_end": "finn",
-        "location": "coral_garden",
-        "item_rule": "collect",
-        "item_emoji": "\U0001f9aa",
-        "shape": "diamond",
-        "story_setup": "Shiny pearls are hidden all around the coral garden! Denny and Finn want to collect them all before the tide comes in.",
-        "instruction": "Collect all the pearls as you draw a path to reach Finn!",
-        "tts_instruction": "Look at all those pearls! Help Denny explore the coral garden and collect every pearl before reaching Finn.",
-        "educational_question": "Where do pearls come from? Which animal makes them?",
-        "fun_fact": "Pearls are made by oysters! When a tiny grain of sand gets inside, the oyster covers it with smooth layers until it becomes a pearl.",
-        "completion_message": "Denny found all the pearls! Finn is amazed!",
-    },
-    "013": {
-        "title": "Denny's Bubble Chase",
-        "character_end": "sandy",
-        "location": "bubble_lagoon",
-        "item_rule": "collect",
-        "item_emoji": "\U0001fae7",
-        "shape": "circle",
-        "story_setup": "Sandy is blowing magical bubbles in the lagoon! Denny wants to catch them all before they float away.",
-        "instruction": "Catch all the bubbles as you draw a path to reach Sandy!",
-        "tts_instruction": "Sandy is making bubbles! Help Denny catch every bubble in the lagoon as you draw a path to reach Sandy.",
-        "educational_question": "What shape are bubbles? Are they always round?",
-        "fun_fact": "Bubbles are round because the air inside pushes equally in all directions, making a sphere — the shape with the smallest surface!",
-        "completion_message": "Denny caught all of Sandy's bubbles! What fun!",
-    },
-    "014": {
-        "title": "Denny's Coral Bits",
-        "character_end": "daddy_reef",
-        "location": "sandy_shore",
-        "item_rule": "avoid",
-        "item_emoji": "\U0001fab8",
-        "shape": "mountain",
-        "story_setup": "Sharp coral branches are sticking up all across the sandy shore. Denny needs to weave carefully between them to reach Daddy Reef without getting poked.",
-        "instruction": "Avoid the sharp coral branches and reach Daddy Reef safely!",
-        "tts_instruction": "Sharp coral is covering the beach path. Help Denny avoid every coral branch and find the safe way to Daddy Reef.",
-        "educational_question": "Why should ocean animals be careful around broken coral?",
-        "fun_fact": "Coral reefs are home to 25% of all ocean life! Tiny animals called polyps build the reef by creating hard skeletons around themselves.",
-        "completion_message": "Denny slipped past every sharp coral branch and reached Daddy Reef safely. What a careful little explorer!",
-    },
-    "015": {
-        "title": "Denny's Starfish Search",
-        "character_end": "stella",
-        "location": "starfish_cove",
-        "item_rule": "collect",
-        "item_emoji": "\u2b50",
-        "shape": "tree",
-        "story_setup": "Stella lost her favorite star-shaped treasures in the cove! Denny wants to help find them all.",
-        "instruction": "Collect all the stars to help Stella as you find your way to her!",
-        "tts_instruction": "Stella needs your help! Draw a path through the cove and collect all the lost stars before reaching Stella.",
-        "educational_question": "How many arms does a starfish have? Can they grow new ones?",
-        "fun_fact": "Starfish can regrow their arms if one breaks off! Some starfish have more than 5 arms — the sun star can have up to 40!",
-        "completion_message": "Denny found all of Stella's stars! She's so happy!",
-    },
-    "016": {
-        "title": "Denny's Clam Hunt",
-        "character_end": "bubbles",
-        "location": "coral_garden",
-        "item_rule": "collect",
-        "item_emoji": "\U0001f9aa",
-        "shape": "triangle",
-        "story_setup": "Bubbles spotted tasty clams hiding in the coral garden! Denny is helping gather them for a yummy seafood feast.",
-        "instruction": "Collect all the clams as you draw a path to reach Bubbles!",
-        "tts_instruction": "Yummy clams everywhere! Help Denny find every clam hiding in the coral garden on the way to Bubbles.",
-        "educational_question": "How do clams eat? Do they have mouths?",
-        "fun_fact": "Clams filter water to eat! A single clam can clean up to 50 gallons of water every day. That helps keep the ocean clean!",
-        "completion_message": "Denny found all the clams! Bubbles is ready for a feast!",
-    },
-    "017": {
-        "title": "Denny's Seaweed Shortcut",
-        "character_end": "shelly",
-        "location": "kelp_forest",
-        "item_rule": "avoid",
-        "item_emoji": "\U0001f33f",
-        "shape": "diamond",
-        "story_setup": "Long tangles of seaweed are drifting across the shortcut to Shelly. Denny has to slip around the swaying strands without getting tangled up.",
-        "instruction": "Avoid the drifting seaweed tangles and reach Shelly!",
-        "tts_instruction": "Seaweed is floating across the shortcut. Help Denny avoid the tangles and find the clear path to Shelly.",
-        "educational_question": "Do you know any foods that are made with seaweed?",
-        "fun_fact": "Seaweed is a superfood! It's used to make sushi wraps, ice cream, and even toothpaste. Kelp can grow up to 2 feet per day!",
-        "completion_message": "Denny dodged every swaying seaweed tangle and reached Shelly without getting stuck. Shelly gave a proud turtle grin.",
-    },
-    "018": {
-        "title": "Denny's Kelp Harvest",
-        "character_end": "ollie",
-        "location": "kelp_forest",
-        "item_rule": "collect",
-        "item_emoji": "\U0001f96c",
-        "shape": "circle",
-        "story_setup": "Ollie needs fresh kelp leaves for a special soup! Denny is swimming through the forest to gather the best ones.",
-        "instruction": "Collect all the kelp leaves as you draw a path to reach Ollie!",
-        "tts_instruction": "Ollie needs kelp for soup! Help Denny swim through the forest and collect every kelp leaf before reaching Ollie.",
-        "educational_question": "What is kelp? Is it a plant or something else?",
-        "fun_fact": "Giant kelp can grow up to 2 feet per day, making it one of the fastest growing things on Earth! Sea otters wrap themselves in kelp to sleep.",
-        "completion_message": "Denny gathered all the kelp! Ollie's soup will be delicious!",
-    },
-    "019": {
-        "title": "Denny's Treasure Hunt",
-        "character_end": "finn",
-        "location": "shipwreck_playground",
-        "item_rule": "collect",
-        "item_emoji": "\U0001f48e",
-        "shape": "mountain",
-        "story_setup": "Finn discovered sparkly gems near the old shipwreck! He and Denny are on a treasure hunt to collect them all.",
-        "instruction": "Collect all the gems on your way to meet Finn at the shipwreck!",
-        "tts_instruction": "Treasure hunt! Help Denny collect every sparkling gem hidden around the shipwreck before meeting Finn.",
-        "educational_question": "If you found a treasure chest, what would you wish was inside?",
-        "fun_fact": "Real treasure has been found in shipwrecks! The Atocha shipwreck had gold and emeralds worth over 400 million dollars!",
-        "completion_message": "Denny found all the treasure! What an amazing adventure with Finn!",
-    },
-    "020": {
-        "title": "Denny Dodges the Pufferfish",
-        "character_end": "pearl",
-        "location": "bubble_lagoon",
-        "item_rule": "avoid",
-        "item_emoji": "\U0001f421",
-        "shape": "rect",
-        "story_setup": "Round pufferfish are bobbing through Bubble Lagoon and blocking the path to Pearl. Denny needs to swim around them carefully all the way to the end.",
-        "instruction": "Avoid the pufferfish and find the safe path to Pearl!",
-        "tts_instruction": "Pufferfish are floating through the lagoon. Help Denny avoid every pufferfish and swim safely to Pearl.",
-        "educational_question": "Why do pufferfish puff up when they feel scared?",
-        "fun_fact": "Pufferfish puff up with water to look bigger when they are frightened. That helps warn other animals to stay back.",
-        "completion_message": "Denny swam safely past every pufferfish and reached Pearl at the end of the lagoon. Pearl cheered for his careful swimming!",
-    },
-}
-
-# Item counts per difficulty for adventure mazes (all collect)
-ADVENTURE_ITEM_COUNTS = {
-    "easy": 2, "medium": 4, "hard": 6,
-}
-
-
-# Start/end positions per story — start never at top to avoid iOS curtain gesture
-# Grid scale factors for shaped mazes — compensates for mask cell loss
-# so effective cell count stays appropriate for the difficulty level.
-SHAPE_GRID_SCALE = {
-    "rect": 1.0,
-    "mountain": 1.25,
-    "tree": 1.3,
-    "triangle": 1.5,
-    "diamond": 1.5,
-    "circle": 1.8,
-    "shell": 1.55,
-}
-
-STORY_POSITIONS = {
-    "001": {"start": "bottom_left", "end": "top_right"},
-    "002": {"start": "bottom_right", "end": "top_left"},
-    "003": {"start": "bottom_right", "end": "top_left"},
-    "004": {"start": "bottom_left", "end": "top_right"},
-    "005": {"start": "bottom_left", "end": "top_right"},
-    "006": {"start": "bottom_right", "end": "top_left"},
-    "007": {"start": "bottom_left", "end": "top_right"},
-    "008": {"start": "bottom_right", "end": "top_left"},
-    "009": {"start": "bottom_left", "end": "top_right"},
-    "010": {"start": "bottom_right", "end": "top_left"},
-    "011": {"start": "bottom_left", "end": "top_right"},
-    "012": {"start": "bottom_left", "end": "top_right"},
-    "013": {"start": "bottom_right", "end": "top_left"},
-    "014": {"start": "bottom_right", "end": "top_left"},
-    "015": {"start": "bottom_left", "end": "top_right"},
-    "016": {"start": "bottom_right", "end": "top_left"},
-    "017": {"start": "bottom_left", "end": "top_right"},
-    "018": {"start": "bottom_left", "end": "top_right"},
-    "019": {"start": "bottom_left", "end": "top_right"},
-    "020": {"start": "bottom_right", "end": "top_left"},
-}
-
-
-def generate_adventure_variants(output_dir: Path):
+def generate_adventure_variants(output_dir: Path, workers: Optional[int] = None, candidates: int = 1):
     """Generate 30 adventure labyrinth variants (10 stories x 3 difficulty levels).
 
-    Stories 011-020 with corridor-style mazes and collect items.
+    Stories 011-020 (packs/adventure.yaml) with corridor-style mazes and items.
     """
-    config = load_config()
-    difficulty_levels = config["difficulty_levels"]
-    universe = load_denny_universe()
-    maze_gen = FullMazeGenerator()
-
-    output_dir.mkdir(parents=True, exist_ok=True)
-    all_labs = []
-    difficulty_names = ["easy", "medium", "hard"]
-
-    for story_num_str, story in ADVENTURE_STORIES.items():
-        end_char_key = story["character_end"]
-        end_char = universe["characters"][end_char_key]
-        denny = universe["characters"]["denny"]
-        location = universe["locations"][story["location"]]
-        item_rule = story["item_rule"]
-        item_emoji = story["item_emoji"]
-        shape = story["shape"]
-        positions = STORY_POSITIONS.get(story_num_str, {})
-        start_pos = positions.get("start")
-        end_pos = positions.get("end")
-
-        for diff_name in difficulty_names:
-            variant_id = f"denny_{story_num_str}_{diff_name}"
-            diff_config = difficulty_levels[diff_name]
-            base_rows, base_cols = diff_config["grid_size"]
-            path_width = diff_config["path_width"]
-            item_count = ADVENTURE_ITEM_COUNTS[diff_name]
-
-            # Scale up grid for shaped mazes to compensate for mask cell loss
-            grid_scale = SHAPE_GRID_SCALE.get(shape, 1.0)
-            rows = max(base_rows, round(base_rows * grid_scale))
-            cols = max(base_cols, round(base_cols * grid_scale))
-            if item_rule == "avoid":
-                rows = max(rows, 5)
-                cols = max(cols, 7)
-
-            print(f"  Generating {variant_id} ({diff_name} {rows}x{cols} {item_rule} {item_emoji})...")
-
-            try:
-                maze_data = maze_gen.generate_maze(
-                    difficulty=diff_name,
-                    age=4,
-                    shape=shape,
-                    canvas_width=600,
-                    canvas_height=500,
-                    override_rows=rows,
-                    override_cols=cols,
-                    render_style="corridor",
-                    item_rule=item_rule,
-                    item_count=item_count,
-                    item_emoji=item_emoji,
-                    start_position=start_pos,
-                    end_position=end_pos,
-                )
-
-                bg_color = location["background_color"]
-                decorative = location["decorative_elements"]
-
-                variant = {
-                    "id": variant_id,
-                    "age_range": "3-6",
-                    "difficulty": diff_name,
-                    "theme": "ocean",
-                    "location": story["location"],
-                    "title": story["title"],
-                    "story_setup": story["story_setup"],
-                    "instruction": story["instruction"],
-                    "tts_instruction": story["tts_instruction"],
-                    "character_start": {
-                        "type": denny["type"],
-                        "description": denny["description"],
-                        "position": "bottom_left",
-                        "name": "Denny",
-                        "image_asset": "denny",
-                    },
-                    "character_end": {
-                        "type": end_char["type"],
-                        "description": end_char["description"],
-                        "position": "top_right",
-                        "name": end_char["name"],
-                        "image_asset": end_char_key,
-                    },
-                    "educational_question": story["educational_question"],
-                    "fun_fact": story["fun_fact"],
-                    "completion_message": story["completion_message"],
-                    "item_rule": item_rule,
-                    "item_emoji": item_emoji,
-                    "path_data": {
-                        "svg_path": maze_data.get("svg_path", ""),
-                        "solution_path": maze_data.get("solution_path", ""),
-                        "width": path_width,
-                        "complexity": diff_name,
-                        "maze_type": maze_data.get("maze_type", "corridor_rect"),
-                        "start_point": maze_data.get("start_point", {}),
-                        "end_point": maze_data.get("end_point", {}),
-                        "segments": maze_data.get("segments", []),
-                        "canvas_width": maze_data.get("canvas_width", 600),
-                        "canvas_height": maze_data.get("canvas_height", 500),
-                        "control_points": maze_data.get("control_points", []),
-                        "items": maze_data.get("items", []),
-                    },
-                    "visual_theme": {
-                        "background_color": bg_color,
-                        "decorative_elements": decorative,
-                    },
-                    "audio_instruction": f"denny_{story_num_str}_instruction.mp3",
-                    "audio_completion": f"denny_{story_num_str}_completion.mp3",
-                }
-
-                all_labs.append(variant)
-            except Exception as e:
-                print(f"  Error generating {variant_id}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-
-    # Save individual JSONs
-    for lab in all_labs:
-        json_path = output_dir / f"{lab['id']}.json"
-        with open(json_path, "w") as f:
-            json.dump(lab, f, indent=2, ensure_ascii=False)
-        print(f"  Saved: {json_path}")
+    build_packs(["adventure"], output_dir, workers=workers, candidates=candidates)
 
-    # Append adventure entries to manifest (merge with existing if present)
-    manifest_path = output_dir / "manifest.json"
-    manifest = {"universe": "denny", "total": 0, "labyrinths": []}
-    if manifest_path.exists():
-        with open(manifest_path) as f:
-            manifest = json.load(f)
-
-    # Remove any old adventure entries (011-020) before appending fresh ones
-    existing = [e for e in manifest["labyrinths"] if not any(
-        f"denny_{s}_" in e["id"] for s in ADVENTURE_STORIES.keys()
-    )]
-    new_entries = [
-        {"id": lab["id"], "difficulty": lab["difficulty"],
-         "theme": lab["theme"], "location": lab["location"],
-         "title": lab["title"]}
-        for lab in all_labs
-    ]
-    manifest["labyrinths"] = existing + new_entries
-    manifest["total"] = len(manifest["labyrinths"])
-
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
-    print(f"\nManifest updated: {manifest_path} ({manifest['total']} entries)")
-    print(f"Total adventure variants generated: {len(all_labs)}")
 
-
-def generate_audio_for_labyrinths(labyrinth_dir: Path):
+def generate_audio_for_labyrinths(labyrinth_dir: Path, workers: int = 8, base_url: Optional[str] = None):
     """Generate ElevenLabs TTS audio for all labyrinths in a directory."""
     elevenlabs_key = os.environ.get("ELEVENLABS_API_KEY")
     if not elevenlabs_key:
@@ -900,100 +636,13 @@ def generate_audio_for_labyrinths(labyrinth_dir: Path):
         sys.exit(1)
 
     try:
-        import requests
+        from tts_audio import DEFAULT_VOICE_ID, synthesize_labyrinth_audio
     except ImportError:
         print("Error: requests package not installed. Run: pip install requests")
         sys.exit(1)
 
-    audio_dir = labyrinth_dir / "audio"
-    audio_dir.mkdir(parents=True, exist_ok=True)
-
-    # ElevenLabs API settings — Charlotte voice (warm, kid-friendly)
-    voice_id = os.environ.get("ELEVENLABS_VOICE_ID", "XB0fDUnXU5powFXDhCwa")
-    api_url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-    headers = {
-        "xi-api-key": elevenlabs_key,
-        "Content-Type": "application/json",
-        "Accept": "audio/mpeg",
-    }
-
-    json_files = sorted(labyrinth_dir.glob("denny_*.json"))
-    print(f"\nGenerating audio for {len(json_files)} labyrinths...")
-
-    # Track already-generated shared audio to avoid duplicates across difficulty variants
-    generated_audio: set[str] = set()
-
-    for json_path in json_files:
-        with open(json_path) as f:
-            lab = json.load(f)
-
-        lab_id = lab["id"]
-
-        # Use audio filename from JSON if set (shared across difficulty levels),
-        # otherwise construct from lab_id
-        instruction_file = lab.get("audio_instruction") or f"{lab_id}_instruction.mp3"
-        instruction_path = audio_dir / instruction_file
-        if not instruction_path.exists() and instruction_file not in generated_audio:
-            tts_text = lab.get("tts_instruction", "")
-            if tts_text:
-                print(f"  Generating instruction audio: {instruction_file}...")
-                _call_elevenlabs(api_url, headers, tts_text, instruction_path)
-                generated_audio.add(instruction_file)
-            else:
-                instruction_file = None
-        else:
-            print(f"  Skipping {instruction_file} (already exists)")
-
-        completion_file = lab.get("audio_completion") or f"{lab_id}_completion.mp3"
-        completion_path = audio_dir / completion_file
-        if not completion_path.exists() and completion_file not in generated_audio:
-            completion_text = f"{lab.get('completion_message', '')} {lab.get('educational_question', '')}"
-            if completion_text.strip():
-                print(f"  Generating completion audio: {completion_file}...")
-                _call_elevenlabs(api_url, headers, completion_text, completion_path)
-                generated_audio.add(completion_file)
-            else:
-                completion_file = None
-        else:
-            print(f"  Skipping {completion_file} (already exists)")
-
-        # Update JSON with audio filenames if not already set
-        updated = False
-        if instruction_file and lab.get("audio_instruction") != instruction_file:
-            lab["audio_instruction"] = instruction_file
-            updated = True
-        if completion_file and lab.get("audio_completion") != completion_file:
-            lab["audio_completion"] = completion_file
-            updated = True
-
-        if updated:
-            with open(json_path, "w") as f:
-                json.dump(lab, f, indent=2)
-            print(f"  Updated {json_path.name} with audio fields")
-
-    print(f"\nAudio generation complete. Files saved to: {audio_dir}")
-
-
-def _call_elevenlabs(api_url: str, headers: dict, text: str, output_path: Path):
-    """Call ElevenLabs API to generate speech audio."""
-    import requests
-
-    payload = {
-        "text": text,
-        "model_id": "eleven_turbo_v2_5",
-        "voice_settings": {
-            "stability": 0.6,
-            "similarity_boost": 0.75,
-        },
-    }
-
-    try:
-        response = requests.post(api_url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        with open(output_path, "wb") as f:
-            f.write(response.content)
-    except Exception as e:
-        print(f"    Error generating audio: {e}")
+    voice_id = os.environ.get("ELEVENLABS_VOICE_ID", DEFAULT_VOICE_ID)
+    synthesize_labyrinth_audio(labyrinth_dir, elevenlabs_key, voice_id, base_url, workers)
 
 
 def main():
@@ -1006,9 +655,19 @@ def main():
     parser.add_argument("--universe", type=str, choices=["denny"], help="Generate labyrinths for a character universe")
     parser.add_argument("--output", type=str, default=None, help="Output directory")
     parser.add_argument("--generate-audio", action="store_true", help="Generate ElevenLabs TTS audio for existing labyrinths")
+    parser.add_argument("--audio-workers", type=int, default=8, help="Concurrent TTS requests for --generate-audio")
+    parser.add_argument("--tts-base-url", type=str, default=None, help="ElevenLabs API base URL (default: $ELEVENLABS_BASE_URL or the public API)")
     parser.add_argument("--difficulty-variants", action="store_true", help="Generate 30 difficulty variants from first 10 stories")
     parser.add_argument("--adventure-variants", action="store_true", help="Generate 30 adventure maze variants (stories 011-020)")
     parser.add_argument("--source-dir", type=str, default=None, help="Source directory with base story JSONs (for --difficulty-variants)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Story requests in flight at once")
+    parser.add_argument("--base-url", type=str, default=None, help="Anthropic API base URL (default: $ANTHROPIC_BASE_URL or the public API)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API instead of reusing cached stories")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Story cache directory (default: cache/)")
+    parser.add_argument("--cache-max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS, help="Evict cached stories older than this")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_MB, help="Evict the oldest cached stories beyond this size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes for variant builds (1 = serial, same output)")
+    parser.add_argument("--candidates", type=int, default=1, help="Mazes to try per variant build, keeping the best-scoring one")
 
     args = parser.parse_args()
     load_dotenv()
@@ -1017,16 +676,16 @@ def main():
     output_dir = Path(args.output) if args.output else Path(__file__).parent / "output" / "labyrinths"
 
     if args.adventure_variants:
-        generate_adventure_variants(output_dir)
+        generate_adventure_variants(output_dir, args.workers, args.candidates)
         return
 
     if args.difficulty_variants:
         source_dir = Path(args.source_dir) if args.source_dir else output_dir
-        generate_difficulty_variants(source_dir, output_dir)
+        generate_difficulty_variants(source_dir, output_dir, args.workers, args.candidates)
         return
 
     if args.generate_audio:
-        generate_audio_for_labyrinths(output_dir)
+        generate_audio_for_labyrinths(output_dir, args.audio_workers, args.tts_base_url)
         return
 
     api_key = os.environ.get("ANTHROPIC_API_KEY")
@@ -1034,15 +693,24 @@ def main():
         print("Error: ANTHROPIC_API_KEY environment variable not set")
         sys.exit(1)
 
-    client = anthropic.Anthropic(api_key=api_key)
+    # Retries are handled by request_story_async so the semaphore slot is freed while backing off.
+    client = anthropic.AsyncAnthropic(api_key=api_key, base_url=args.base_url, max_retries=0)
+    cache = None
+    if not args.no_cache:
+        cache = StoryCache(
+            Path(args.cache_dir) if args.cache_dir else None,
+            max_age_days=args.cache_max_age_days,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        )
 
     if args.universe == "denny":
-        generate_denny_pack(client, output_dir)
+        generate_denny_pack(client, output_dir, args.concurrency, cache)
     elif args.starter_pack:
-        generate_starter_pack(client, config, output_dir)
+        generate_starter_pack(client, config, output_dir, args.concurrency, cache)
     elif args.age and args.difficulty and args.theme:
         themes = [args.theme]
-        labs = generate_batch(client, args.age, args.difficulty, themes, args.count, config)
+        labs = generate_batch(client, args.age, args.difficulty, themes, args.count, config,
+                              concurrency=args.concurrency, cache=cache)
         save_labyrinths(labs, output_dir)
     else:
         parser.print_help()
@@ -1052,6 +720,10 @@ def main():
         print("  python generator.py --age 4 --difficulty easy --theme animals --count 2")
         print("  python generator.py --generate-audio --output path/to/labyrinths")
 
+    if cache:
+        cache.evict()
+        print(cache.summary())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,174 @@
+"""
+Locked, atomic read-modify-write of a pack build's manifest.json.
+
+Every pack build merges its levels into the same manifest.json, so two
+builds running at once used to read the same old file and the second write
+dropped the first one's entries. ManifestStore holds an exclusive
+fcntl.flock on manifest.json.lock from reading the manifest until the new
+one has replaced it, so concurrent builds merge one after the other.
+
+Entries are indexed by id and by story ("denny_041"), so replacing a pack's
+stories removes exactly their entries instead of scanning every entry for
+every story. The manifest is written sorted (levels by story number, then
+easy/medium/hard; packs by their first story), through a temp file and
+os.replace, and only when its bytes change.
+
+Usage:
+    with ManifestStore(output_dir / "manifest.json") as store:
+        store.replace_stories("denny", ["041", "042"], entries)
+        store.set_pack({"id": "forest_adventures", ...})
+    # written and unlocked here (not written if the block raised)
+"""
+
+import fcntl
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+DIFFICULTY_ORDER = {"easy": 0, "medium": 1, "hard": 2}
+
+# Read once at import: os.umask can only be read by setting it, which would
+# race other threads if done per write.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def replace_file(tmp: str, path: Path):
+    """os.replace *tmp* onto *path*, giving it the mode a plain open("w") would.
+
+    mkstemp creates files 0600; keep the existing file's mode, or use
+    0666 minus the umask for a new file.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Atomically replace *path* with *text* unless it already holds exactly that.
+
+    Returns True if the file was written. Unchanged files keep their mtime,
+    and readers never see a half-written file.
+    """
+    path = Path(path)
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        replace_file(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def story_key(level_id: str) -> Optional[str]:
+    """"denny_041" for "denny_041_easy"; None for ids without a story number."""
+    prefix, sep, _ = level_id.rpartition("_")
+    if not sep or not prefix.rpartition("_")[2].isdigit():
+        return None
+    return prefix
+
+
+def _level_order(entry: dict) -> tuple:
+    key = story_key(entry["id"])
+    if key is None:
+        return (1, 0, 99, entry["id"])
+    return (0, int(key.rpartition("_")[2]), DIFFICULTY_ORDER.get(entry.get("difficulty"), 99), entry["id"])
+
+
+class ManifestStore:
+    """manifest.json as indexed entries, locked for one read-modify-write."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.header: Dict[str, object] = {}
+        self.entries: Dict[str, dict] = {}
+        self.by_story: Dict[str, Set[str]] = {}
+        self.packs: Dict[str, dict] = {}
+        self.written = False
+        self._lock_file = None
+
+    def __enter__(self) -> "ManifestStore":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.lock_path, "a")
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            self.load()
+        except BaseException:
+            self._unlock()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.save()
+        finally:
+            self._unlock()
+
+    def _unlock(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._lock_file.close()
+        self._lock_file = None
+
+    def load(self):
+        """Read the manifest on disk (or start a new one) and index it."""
+        manifest = {"universe": "denny", "total": 0, "packs": [], "labyrinths": []}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        self.header = {key: value for key, value in manifest.items()
+                       if key not in ("total", "packs", "labyrinths")}
+        self.entries = {}
+        self.by_story = {}
+        for entry in manifest.get("labyrinths", []):
+            self.add(entry)
+        self.packs = {pack["id"]: pack for pack in manifest.get("packs", [])}
+
+    def add(self, entry: dict):
+        """Insert or replace the entry with entry["id"]."""
+        self.entries[entry["id"]] = entry
+        key = story_key(entry["id"])
+        if key is not None:
+            self.by_story.setdefault(key, set()).add(entry["id"])
+
+    def replace_stories(self, id_prefix: str, story_ids: Iterable[str], entries: List[dict]):
+        """Drop every entry of <id_prefix>_<story> for *story_ids*, then add *entries*."""
+        for story_id in story_ids:
+            for level_id in self.by_story.pop(f"{id_prefix}_{story_id}", ()):
+                del self.entries[level_id]
+        for entry in entries:
+            self.add(entry)
+
+    def set_pack(self, pack: dict):
+        self.packs[pack["id"]] = pack
+
+    def to_manifest(self) -> dict:
+        """The manifest in its canonical, sorted form."""
+        levels = sorted(self.entries.values(), key=_level_order)
+        packs = sorted(self.packs.values(), key=lambda pack: (min(pack.get("stories") or [0]), pack["id"]))
+        return {**self.header, "total": len(levels), "packs": packs, "labyrinths": levels}
+
+    @property
+    def total(self) -> int:
+        return len(self.entries)
+
+    def save(self) -> bool:
+        """Write the manifest if it changed; True if written."""
+        text = json.dumps(self.to_manifest(), indent=2, ensure_ascii=False)
+        self.written = write_if_changed(self.path, text)
+        return self.written
@@ -9,62 +9,213 @@ Generates solvable mazes in three styles:
 Output: SVG strings and path data for the iOS app.
 """
 
+import functools
+import inspect
+import itertools
 import random
 import math
 import json
-from typing import List, Tuple, Optional, Dict, Any
+import time
+import collections
+from collections.abc import MutableMapping
+from typing import Callable, Iterator, List, Tuple, Optional, Dict, Any
+
+from svg_path_writer import SVGPathWriter, chain_segments
+
+
+# Packed cell layout used by MazeGenerator: the low nibble holds the four
+# walls and bit 4 marks a cell the carver has already visited.
+WALL_TOP = 1
+WALL_RIGHT = 2
+WALL_BOTTOM = 4
+WALL_LEFT = 8
+ALL_WALLS = WALL_TOP | WALL_RIGHT | WALL_BOTTOM | WALL_LEFT
+VISITED = 16
+
+WALL_BITS = {"top": WALL_TOP, "right": WALL_RIGHT, "bottom": WALL_BOTTOM, "left": WALL_LEFT}
+OPPOSITE_WALL = {WALL_TOP: WALL_BOTTOM, WALL_RIGHT: WALL_LEFT, WALL_BOTTOM: WALL_TOP, WALL_LEFT: WALL_RIGHT}
+
+# (wall bit, row offset, col offset) in the top/right/bottom/left order the
+# carver and braider walk neighbours in.
+DIRECTIONS = ((WALL_TOP, -1, 0), (WALL_RIGHT, 0, 1), (WALL_BOTTOM, 1, 0), (WALL_LEFT, 0, -1))
+# BFS expands top/bottom/left/right, which fixes which shortest path solve() returns.
+SOLVE_ORDER = (WALL_TOP, WALL_BOTTOM, WALL_LEFT, WALL_RIGHT)
+
+# Number of open passages for every packed cell value.
+OPEN_PASSAGES = bytes(4 - bin(value & ALL_WALLS).count("1") for value in range(32))
+
+
+class CellWalls(MutableMapping):
+    """Dict-like view of one packed cell's walls, keyed "top"/"right"/"bottom"/"left"."""
+
+    __slots__ = ("_cells", "_index")
+
+    def __init__(self, cells: bytearray, index: int):
+        self._cells = cells
+        self._index = index
+
+    def __getitem__(self, name: str) -> bool:
+        return bool(self._cells[self._index] & WALL_BITS[name])
+
+    def __setitem__(self, name: str, value: bool):
+        bit = WALL_BITS[name]
+        if value:
+            self._cells[self._index] |= bit
+        else:
+            self._cells[self._index] &= ~bit
+
+    def __delitem__(self, name: str):
+        raise TypeError("cell walls cannot be deleted")
+
+    def __iter__(self):
+        return iter(WALL_BITS)
+
+    def __len__(self) -> int:
+        return len(WALL_BITS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
 class Cell:
-    """Represents a single cell in the maze grid."""
-    def __init__(self, row: int, col: int):
+    """Represents a single cell in the maze grid.
+
+    Cells from MazeGenerator.grid are views onto the generator's packed
+    cell array; a Cell created on its own keeps a private byte.
+    """
+
+    __slots__ = ("row", "col", "_cells", "_index")
+
+    def __init__(self, row: int, col: int, cells: Optional[bytearray] = None, index: int = 0):
         self.row = row
         self.col = col
-        self.walls = {"top": True, "right": True, "bottom": True, "left": True}
-        self.visited = False
+        if cells is None:
+            cells, index = bytearray([ALL_WALLS]), 0
+        self._cells = cells
+        self._index = index
+
+    @property
+    def walls(self) -> CellWalls:
+        return CellWalls(self._cells, self._index)
+
+    @walls.setter
+    def walls(self, walls: Dict[str, bool]):
+        packed = self._cells[self._index] & VISITED
+        for name, bit in WALL_BITS.items():
+            if walls[name]:
+                packed |= bit
+        self._cells[self._index] = packed
+
+    @property
+    def visited(self) -> bool:
+        return bool(self._cells[self._index] & VISITED)
+
+    @visited.setter
+    def visited(self, value: bool):
+        if value:
+            self._cells[self._index] |= VISITED
+        else:
+            self._cells[self._index] &= ~VISITED
 
 
 class MazeGenerator:
-    """Generates mazes using recursive backtracking."""
+    """Generates mazes using recursive backtracking (or any MAZE_ALGORITHMS entry).
+
+    The grid lives in ``cells``: one packed byte per cell (see WALL_* and
+    VISITED), stored row-major.  ``grid`` exposes the same data as Cell views.
+    All randomness comes from ``rng`` (a random.Random, or the random module
+    itself by default), so a seeded Random makes a maze reproducible.
+    """
 
-    def __init__(self, rows: int, cols: int, cell_size: int = 40, path_width: int = 30):
+    def __init__(self, rows: int, cols: int, cell_size: int = 40, path_width: int = 30,
+                 rng: Optional[random.Random] = None):
         self.rows = rows
         self.cols = cols
         self.cell_size = cell_size
         self.path_width = path_width
-        self.grid: List[List[Cell]] = []
+        self.rng = rng if rng is not None else random
+        self.cells = bytearray(rows * cols)
         self.solution_path: List[Tuple[int, int]] = []
+        self.attempts = 0
+        self.stats: Dict[str, Any] = {}
+        # (source, target) indices solution_path was solved for, cleared on any wall change.
+        self._solved_for: Optional[Tuple[int, int]] = None
+        self._blank = bytes([ALL_WALLS]) * (rows * cols)
+        self._links = self._build_links(rows, cols, [bit for bit, _, _ in DIRECTIONS])
+        self._solve_links = self._build_links(rows, cols, SOLVE_ORDER)
+        self._grid: Optional[List[List[Cell]]] = None
         self._init_grid()
 
+    @staticmethod
+    def _build_links(rows: int, cols: int, order) -> List[Tuple[Tuple[int, int], ...]]:
+        """Per-cell (wall bit, neighbour index) pairs for in-bounds neighbours."""
+        offsets = {bit: (dr, dc) for bit, dr, dc in DIRECTIONS}
+        links = []
+        for r in range(rows):
+            for c in range(cols):
+                cell_links = []
+                for bit in order:
+                    dr, dc = offsets[bit]
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols:
+                        cell_links.append((bit, nr * cols + nc))
+                links.append(tuple(cell_links))
+        return links
+
+    @property
+    def grid(self) -> List[List[Cell]]:
+        if self._grid is None:
+            self._grid = [
+                [Cell(r, c, self.cells, r * self.cols + c) for c in range(self.cols)]
+                for r in range(self.rows)
+            ]
+        return self._grid
+
     def _init_grid(self):
-        self.grid = [[Cell(r, c) for c in range(self.cols)] for r in range(self.rows)]
+        self._reset_cells(self._blank)
+
+    def _reset_cells(self, blank: bytes):
+        self.cells[:] = blank
+        self._solved_for = None
+
+    def _mask_flags(self, mask: Optional[set]) -> bytes:
+        """Per-cell 1/0 membership flags for *mask* (every cell when no mask).
+
+        A CellMask of the maze's size is returned as-is (its flags); a legacy
+        set of (row, col) tuples is converted.
+        """
+        size = self.rows * self.cols
+        if not mask:
+            return b"\x01" * size
+        if isinstance(mask, CellMask) and (mask.rows, mask.cols) == (self.rows, self.cols):
+            return mask.flags
+        flags = bytearray(size)
+        for r, c in mask:
+            if 0 <= r < self.rows and 0 <= c < self.cols:
+                flags[r * self.cols + c] = 1
+        return flags
+
+    def _open_wall(self, index: int, bit: int, neighbor: int):
+        self.cells[index] &= ~bit
+        self.cells[neighbor] &= ~OPPOSITE_WALL[bit]
+        self._solved_for = None
 
     def _get_neighbors(self, cell: Cell) -> List[Cell]:
+        cells = self.cells
+        grid = self.grid
         neighbors = []
-        directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-        for dr, dc in directions:
-            nr, nc = cell.row + dr, cell.col + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                neighbor = self.grid[nr][nc]
-                if not neighbor.visited:
-                    neighbors.append(neighbor)
+        for _, index in self._links[cell.row * self.cols + cell.col]:
+            if not cells[index] & VISITED:
+                neighbors.append(grid[index // self.cols][index % self.cols])
         return neighbors
 
     def _remove_wall(self, current: Cell, next_cell: Cell):
-        dr = next_cell.row - current.row
-        dc = next_cell.col - current.col
-        if dr == -1:
-            current.walls["top"] = False
-            next_cell.walls["bottom"] = False
-        elif dr == 1:
-            current.walls["bottom"] = False
-            next_cell.walls["top"] = False
-        elif dc == 1:
-            current.walls["right"] = False
-            next_cell.walls["left"] = False
-        elif dc == -1:
-            current.walls["left"] = False
-            next_cell.walls["right"] = False
+        index = current.row * self.cols + current.col
+        neighbor = next_cell.row * self.cols + next_cell.col
+        for bit, linked in self._links[index]:
+            if linked == neighbor:
+                self._open_wall(index, bit, neighbor)
+                return
 
     @staticmethod
     def _count_turns(path: List[Tuple[int, int]]) -> int:
@@ -81,157 +232,411 @@ class MazeGenerator:
                 turns += 1
         return turns
 
+    def _internal_walls(self, inside: bytearray) -> List[Tuple[int, int, int]]:
+        """(index, wall bit, neighbour) for every closed wall between two in-maze cells."""
+        cells = self.cells
+        cols = self.cols
+        internal_walls = []
+        for r in range(self.rows):
+            for c in range(cols):
+                index = r * cols + c
+                if not inside[index]:
+                    continue
+                if cells[index] & WALL_RIGHT and c + 1 < cols and inside[index + 1]:
+                    internal_walls.append((index, WALL_RIGHT, index + 1))
+                if cells[index] & WALL_BOTTOM and r + 1 < self.rows and inside[index + cols]:
+                    internal_walls.append((index, WALL_BOTTOM, index + cols))
+        return internal_walls
+
     def _add_extra_connections(self, count: int, mask: Optional[set] = None):
         """Remove extra internal walls to create loops/cycles in the maze.
 
         Finds all walls between two adjacent in-maze cells and randomly
         removes `count` of them, giving the player multiple route choices.
         """
-        # Collect all internal walls (between two adjacent visited cells that still have a wall)
-        internal_walls = []
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if mask and (r, c) not in mask:
-                    continue
-                cell = self.grid[r][c]
-                # Check right wall
-                if cell.walls["right"] and c + 1 < self.cols:
-                    if not mask or (r, c + 1) in mask:
-                        internal_walls.append((r, c, "right"))
-                # Check bottom wall
-                if cell.walls["bottom"] and r + 1 < self.rows:
-                    if not mask or (r + 1, c) in mask:
-                        internal_walls.append((r, c, "bottom"))
-
-        random.shuffle(internal_walls)
-        removed = 0
-        for r, c, direction in internal_walls:
-            if removed >= count:
-                break
-            cell = self.grid[r][c]
-            if direction == "right":
-                neighbor = self.grid[r][c + 1]
-                cell.walls["right"] = False
-                neighbor.walls["left"] = False
-            elif direction == "bottom":
-                neighbor = self.grid[r + 1][c]
-                cell.walls["bottom"] = False
-                neighbor.walls["top"] = False
-            removed += 1
+        internal_walls = self._internal_walls(self._mask_flags(mask))
+        self.rng.shuffle(internal_walls)
+        for index, bit, neighbor in internal_walls[:count]:
+            self._open_wall(index, bit, neighbor)
+
+    def _carve_backtracker(self, start_index: int):
+        """Depth-first carve from *start_index* over every unvisited cell."""
+        cells = self.cells
+        links = self._links
+        current = start_index
+        cells[current] |= VISITED
+        stack = [current]
+
+        while stack:
+            options = [(bit, index) for bit, index in links[current] if not cells[index] & VISITED]
+            if options:
+                bit, next_index = self.rng.choice(options)
+                cells[current] &= ~bit
+                cells[next_index] = (cells[next_index] & ~OPPOSITE_WALL[bit]) | VISITED
+                stack.append(current)
+                current = next_index
+            else:
+                current = stack.pop()
 
     def generate(self, start: Tuple[int, int] = (0, 0), mask: Optional[set] = None,
                  end: Optional[Tuple[int, int]] = None, min_solution_ratio: float = 0.0,
-                 min_turns: int = 0, extra_connections: int = 0):
-        """Generate maze using recursive backtracking with optional cell mask.
+                 min_turns: int = 0, extra_connections: int = 0,
+                 strategy: str = "reject", algorithm: str = "backtracker") -> bool:
+        """Generate maze with the named algorithm and optional cell mask.
 
-        If min_solution_ratio > 0 and end is provided, regenerates until the
-        solution path visits at least that fraction of the total cells.
+        If min_solution_ratio > 0 and end is provided, the solution path must
+        visit at least that fraction of the total cells.
         min_turns enforces a minimum number of direction changes in the solution.
         This prevents trivially short or straight-line paths.
         extra_connections: number of extra walls to remove to create loops.
+
+        strategy="reject" regenerates whole mazes until the constraints hold
+        (up to 50 attempts).  strategy="guided" grows a conforming solution
+        path first and carves the rest of the maze around it in one pass;
+        if the end cannot be reached inside the mask it falls back to
+        "reject".
+
+        algorithm names an entry of MAZE_ALGORITHMS (recursive backtracking
+        by default).
+
+        Returns True if the final maze meets the constraints; the number of
+        attempts used is left in ``self.attempts`` and timings in ``self.stats``.
         """
-        total_cells = len(mask) if mask else self.rows * self.cols
-        max_attempts = 50
+        if strategy not in ("reject", "guided"):
+            raise ValueError(f"Unknown maze strategy: {strategy}")
+        if algorithm not in MAZE_ALGORITHMS:
+            raise ValueError(f"Unknown maze algorithm: {algorithm}")
+        carve = MAZE_ALGORITHMS[algorithm]
+        started = time.perf_counter()
+        self.stats = {"algorithm": algorithm, "carve_ms": 0.0, "elapsed_ms": 0.0}
 
+        total_cells = len(mask) if mask else self.rows * self.cols
+        constrained = bool(end) and (min_solution_ratio > 0 or min_turns > 0)
+        max_attempts = 50 if constrained else 1
+
+        # Cells outside the mask start out visited so the carver never enters them.
+        inside = self._mask_flags(mask)
+        blank = bytes(ALL_WALLS if flag else ALL_WALLS | VISITED for flag in inside)
+        start_index = start[0] * self.cols + start[1]
+
+        if strategy == "guided" and constrained:
+            self.attempts = 1
+            # Eller's sweeps whole rows and cannot grow around a fixed path.
+            fill = MAZE_ALGORITHMS["backtracker"] if algorithm == "eller" else carve
+            met = self._generate_guided(start, end, inside, blank, total_cells,
+                                        min_solution_ratio, min_turns, extra_connections, fill)
+            if met is not None:
+                self.stats["elapsed_ms"] = (time.perf_counter() - started) * 1000
+                return met
+            # No in-mask path to grow: carve whole mazes so the grid is not left uncarved.
+
+        met = False
         for attempt in range(max_attempts):
-            self._init_grid()
-            if mask:
-                for r in range(self.rows):
-                    for c in range(self.cols):
-                        if (r, c) not in mask:
-                            self.grid[r][c].visited = True
-
-            stack = []
-            current = self.grid[start[0]][start[1]]
-            current.visited = True
-            stack.append(current)
-
-            while stack:
-                neighbors = self._get_neighbors(current)
-                if neighbors:
-                    next_cell = random.choice(neighbors)
-                    self._remove_wall(current, next_cell)
-                    next_cell.visited = True
-                    stack.append(current)
-                    current = next_cell
-                else:
-                    current = stack.pop()
+            self.attempts = attempt + 1
+            self._reset_cells(blank)
+            carve_started = time.perf_counter()
+            carve(self, [start_index])
+            self.stats["carve_ms"] += (time.perf_counter() - carve_started) * 1000
 
             # Add extra connections (loops) after the spanning tree is built
             if extra_connections > 0:
                 self._add_extra_connections(extra_connections, mask)
 
             # Check solution quality if requirements specified
-            if end and (min_solution_ratio > 0 or min_turns > 0):
-                solution = self.solve(start, end)
-                ratio = len(solution) / total_cells if total_cells > 0 else 0
-                turns = self._count_turns(solution)
-                if ratio >= min_solution_ratio and turns >= min_turns:
-                    return
-                # Otherwise loop and regenerate
-            else:
-                return
+            if not constrained:
+                met = True
+                break
+            solution = self.solve(start, end)
+            if self._meets_targets(solution, total_cells, min_solution_ratio, min_turns):
+                met = True
+                break
+            # Otherwise loop and regenerate
+        self.stats["elapsed_ms"] = (time.perf_counter() - started) * 1000
+        return met
+
+    def _meets_targets(self, solution: List[Tuple[int, int]], total_cells: int,
+                       min_solution_ratio: float, min_turns: int) -> bool:
+        ratio = len(solution) / total_cells if total_cells > 0 else 0
+        return bool(solution) and ratio >= min_solution_ratio and self._count_turns(solution) >= min_turns
+
+    def _generate_guided(self, start: Tuple[int, int], end: Tuple[int, int],
+                         inside: bytearray, blank: bytes, total_cells: int,
+                         min_solution_ratio: float, min_turns: int,
+                         extra_connections: int, fill) -> Optional[bool]:
+        """Carve a grown solution path, then fill the remaining cells from it.
+
+        Returns None, leaving the cells untouched, if no path from start to
+        end exists inside the mask.
+        """
+        cols = self.cols
+        target_length = math.ceil(min_solution_ratio * total_cells)
+        path = self._grow_solution_path(start[0] * cols + start[1], end[0] * cols + end[1],
+                                        inside, target_length, min_turns)
+        if not path:
+            return None
+
+        cells = self.cells
+        self._reset_cells(blank)
+        for index, next_index in zip(path, path[1:]):
+            for bit, neighbor in self._links[index]:
+                if neighbor == next_index:
+                    self._open_wall(index, bit, neighbor)
+        for index in path:
+            cells[index] |= VISITED
+
+        # Every branch hangs off the path, so the path stays the unique solution.
+        fill_order = path[:]
+        self.rng.shuffle(fill_order)
+        carve_started = time.perf_counter()
+        fill(self, fill_order)
+        self.stats["carve_ms"] += (time.perf_counter() - carve_started) * 1000
+
+        # Only keep loops that do not shortcut the solution below the targets.
+        if extra_connections > 0:
+            internal_walls = self._internal_walls(inside)
+            self.rng.shuffle(internal_walls)
+            added = 0
+            for index, bit, neighbor in internal_walls:
+                if added >= extra_connections:
+                    break
+                before = cells[index], cells[neighbor]
+                self._open_wall(index, bit, neighbor)
+                if self._meets_targets(self.solve(start, end), total_cells,
+                                       min_solution_ratio, min_turns):
+                    added += 1
+                else:
+                    cells[index], cells[neighbor] = before
+                    self._solved_for = None
+
+        solution = self.solve(start, end)
+        return self._meets_targets(solution, total_cells, min_solution_ratio, min_turns)
+
+    def _grow_solution_path(self, source: int, target: int, inside: bytearray,
+                            target_length: int, min_turns: int) -> List[int]:
+        """Grow a simple source→target cell path to the requested length and turns.
+
+        Starts from a random shortest path and repeatedly replaces a step a→b
+        with a detour a→c→d→b through the two free cells beside it.  Each
+        detour adds two cells and, on a straight run, up to four turns.
+        """
+        path = self._random_shortest_path(source, target, inside)
+        if not path:
+            return []
+        neighbor_at = [dict(links) for links in self._links]
+        perpendicular = {
+            WALL_TOP: (WALL_LEFT, WALL_RIGHT), WALL_BOTTOM: (WALL_LEFT, WALL_RIGHT),
+            WALL_LEFT: (WALL_TOP, WALL_BOTTOM), WALL_RIGHT: (WALL_TOP, WALL_BOTTOM),
+        }
+        on_path = bytearray(len(self.cells))
+        for index in path:
+            on_path[index] = 1
+
+        # Grow a little past the minimum so lengths vary between mazes.
+        free_cells = sum(inside) - len(path)
+        goal_length = target_length + self.rng.randint(0, max(0, free_cells - target_length) // 4)
+
+        def turns(cells_path: List[int]) -> int:
+            return sum(1 for i in range(2, len(cells_path))
+                       if cells_path[i] - cells_path[i - 1] != cells_path[i - 1] - cells_path[i - 2])
+
+        while len(path) < goal_length or turns(path) < min_turns:
+            detours = []
+            straight = []
+            for i in range(len(path) - 1):
+                a, b = path[i], path[i + 1]
+                step = next(bit for bit, neighbor in self._links[a] if neighbor == b)
+                for side in perpendicular[step]:
+                    c = neighbor_at[a].get(side)
+                    d = neighbor_at[b].get(side)
+                    if c is None or d is None:
+                        continue
+                    if not inside[c] or not inside[d] or on_path[c] or on_path[d]:
+                        continue
+                    detours.append((i, c, d))
+                    delta = b - a
+                    if (i > 0 and a - path[i - 1] == delta) or (i + 2 < len(path) and path[i + 2] - b == delta):
+                        straight.append((i, c, d))
+            if not detours:
+                break
+            # Detours on straight runs add turns; prefer them while turns are short.
+            pool = straight if straight and turns(path) < min_turns else detours
+            i, c, d = self.rng.choice(pool)
+            path[i + 1:i + 1] = [c, d]
+            on_path[c] = on_path[d] = 1
+        return path
+
+    def _random_shortest_path(self, source: int, target: int, inside: bytearray) -> List[int]:
+        """A uniformly-wandering shortest path through in-maze cells."""
+        from collections import deque
+        distance = [-1] * len(self.cells)
+        distance[target] = 0
+        queue = deque([target])
+        while queue:
+            index = queue.popleft()
+            for _, neighbor in self._links[index]:
+                if inside[neighbor] and distance[neighbor] < 0:
+                    distance[neighbor] = distance[index] + 1
+                    queue.append(neighbor)
+        if distance[source] < 0:
+            return []
+
+        path = [source]
+        current = source
+        while current != target:
+            current = self.rng.choice([neighbor for _, neighbor in self._links[current]
+                                     if distance[neighbor] == distance[current] - 1])
+            path.append(current)
+        return path
 
     def solve(self, start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
-        """Find solution path using BFS."""
+        """Find solution path using BFS.
+
+        The last path is reused while no wall has been opened since it was
+        found, so solving the maze generate() just solved is free.
+        """
         from collections import deque
-        visited = set()
-        parent = {}
-        queue = deque([start])
-        visited.add(start)
+        cols = self.cols
+        cells = self.cells
+        links = self._solve_links
+        source = start[0] * cols + start[1]
+        target = end[0] * cols + end[1]
+        if self._solved_for == (source, target):
+            return self.solution_path
+        parent = [-1] * len(cells)
+        parent[source] = source
+        queue = deque([source])
 
         while queue:
-            r, c = queue.popleft()
-            if (r, c) == end:
+            index = queue.popleft()
+            if index == target:
                 path = []
-                pos = end
-                while pos != start:
-                    path.append(pos)
-                    pos = parent[pos]
+                while index != source:
+                    path.append(divmod(index, cols))
+                    index = parent[index]
                 path.append(start)
                 path.reverse()
                 self.solution_path = path
+                self._solved_for = (source, target)
                 return path
 
-            cell = self.grid[r][c]
-            moves = []
-            if not cell.walls["top"]:
-                moves.append((r - 1, c))
-            if not cell.walls["bottom"]:
-                moves.append((r + 1, c))
-            if not cell.walls["left"]:
-                moves.append((r, c - 1))
-            if not cell.walls["right"]:
-                moves.append((r, c + 1))
-
-            for nr, nc in moves:
-                if 0 <= nr < self.rows and 0 <= nc < self.cols and (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    parent[(nr, nc)] = (r, c)
-                    queue.append((nr, nc))
+            walls = cells[index]
+            for bit, neighbor in links[index]:
+                if not walls & bit and parent[neighbor] < 0:
+                    parent[neighbor] = index
+                    queue.append(neighbor)
 
         return []
 
-    def to_svg_walls(self, offset_x: int = 0, offset_y: int = 0, mask: Optional[set] = None) -> str:
-        """Generate SVG path data for maze walls."""
-        paths = []
+    def texture_metrics(self, mask: Optional[set] = None) -> Dict[str, float]:
+        """Share of in-mask cells that are dead ends, junctions, straights and turns.
+
+        Backtracking mazes are long and straight with few junctions; Prim's
+        and Kruskal's are bushy with many short dead ends.
+        """
+        inside = self._mask_flags(mask)
+        counts = {"dead_ends": 0, "junctions": 0, "straights": 0, "turns": 0}
+        total = 0
+        for index, value in enumerate(self.cells):
+            if not inside[index]:
+                continue
+            total += 1
+            passages = OPEN_PASSAGES[value]
+            if passages == 1:
+                counts["dead_ends"] += 1
+            elif passages >= 3:
+                counts["junctions"] += 1
+            elif passages == 2:
+                walls = value & ALL_WALLS
+                if walls in (WALL_TOP | WALL_BOTTOM, WALL_LEFT | WALL_RIGHT):
+                    counts["straights"] += 1
+                else:
+                    counts["turns"] += 1
+        return {name: round(count / total, 3) if total else 0.0 for name, count in counts.items()}
+
+    def to_svg_walls(self, offset_x: int = 0, offset_y: int = 0, mask: Optional[set] = None,
+                     coalesce: bool = False) -> str:
+        """Generate SVG path data for maze walls.
+
+        coalesce=False draws every wall of every cell as its own subpath, so
+        walls shared by two cells appear twice. coalesce=True draws each wall
+        edge once and merges straight runs along a grid line into one
+        "M x1 y L x2 y". Runs are never joined around corners: walls are
+        stroked with the default miter join, so that would change the look.
+        Either way the command counts land in self.stats["svg"].
+        """
+        if coalesce:
+            return self._svg_wall_runs(offset_x, offset_y, mask)
+        writer = SVGPathWriter()
         cs = self.cell_size
+        cells = self.cells
+        inside = self._mask_flags(mask)
         for r in range(self.rows):
+            y = offset_y + r * cs
             for c in range(self.cols):
-                if mask and (r, c) not in mask:
+                index = r * self.cols + c
+                if not inside[index]:
                     continue
-                cell = self.grid[r][c]
+                walls = cells[index]
                 x = offset_x + c * cs
-                y = offset_y + r * cs
-                if cell.walls["top"]:
-                    paths.append(f"M {x} {y} L {x + cs} {y}")
-                if cell.walls["right"]:
-                    paths.append(f"M {x + cs} {y} L {x + cs} {y + cs}")
-                if cell.walls["bottom"]:
-                    paths.append(f"M {x} {y + cs} L {x + cs} {y + cs}")
-                if cell.walls["left"]:
-                    paths.append(f"M {x} {y} L {x} {y + cs}")
-        return " ".join(paths)
+                if walls & WALL_TOP:
+                    writer.line(x, y, x + cs, y)
+                if walls & WALL_RIGHT:
+                    writer.line(x + cs, y, x + cs, y + cs)
+                if walls & WALL_BOTTOM:
+                    writer.line(x, y + cs, x + cs, y + cs)
+                if walls & WALL_LEFT:
+                    writer.line(x, y, x, y + cs)
+        self.stats["svg"] = {"commands": writer.commands, "raw_commands": writer.commands}
+        return writer.getvalue()
+
+    def _svg_wall_runs(self, offset_x: int, offset_y: int, mask: Optional[set]) -> str:
+        """Coalesced wall rendering for to_svg_walls(coalesce=True)."""
+        writer = SVGPathWriter()
+        cs = self.cell_size
+        rows, cols = self.rows, self.cols
+        cells = self.cells
+        inside = self._mask_flags(mask)
+        raw = 0
+        for index in range(rows * cols):
+            if inside[index]:
+                raw += 2 * (4 - OPEN_PASSAGES[cells[index]])
+
+        # Horizontal grid line r lies between cell rows r - 1 and r.
+        for r in range(rows + 1):
+            y = offset_y + r * cs
+            run_start = None
+            for c in range(cols + 1):
+                wall = False
+                if c < cols:
+                    below = r * cols + c
+                    above = below - cols
+                    wall = ((r < rows and inside[below] and cells[below] & WALL_TOP)
+                            or (r > 0 and inside[above] and cells[above] & WALL_BOTTOM))
+                if wall and run_start is None:
+                    run_start = c
+                elif not wall and run_start is not None:
+                    writer.line(offset_x + run_start * cs, y, offset_x + c * cs, y)
+                    run_start = None
+
+        # Vertical grid line c lies between cell columns c - 1 and c.
+        for c in range(cols + 1):
+            x = offset_x + c * cs
+            run_start = None
+            for r in range(rows + 1):
+                wall = False
+                if r < rows:
+                    right = r * cols + c
+                    left = right - 1
+                    wall = ((c < cols and inside[right] and cells[right] & WALL_LEFT)
+                            or (c > 0 and inside[left] and cells[left] & WALL_RIGHT))
+                if wall and run_start is None:
+                    run_start = r
+                elif not wall and run_start is not None:
+                    writer.line(x, offset_y + run_start * cs, x, offset_y + r * cs)
+                    run_start = None
+
+        self.stats["svg"] = {"commands": writer.commands, "raw_commands": raw}
+        return writer.getvalue()
 
     def solution_to_svg_path(self, offset_x: int = 0, offset_y: int = 0) -> str:
         """Generate SVG path for the solution."""
@@ -239,148 +644,635 @@ class MazeGenerator:
             return ""
         cs = self.cell_size
         half = cs // 2
-        points = []
-        for r, c in self.solution_path:
-            x = offset_x + c * cs + half
-            y = offset_y + r * cs + half
-            points.append((x, y))
-        if not points:
-            return ""
-        d = f"M {points[0][0]} {points[0][1]}"
-        for x, y in points[1:]:
-            d += f" L {x} {y}"
-        return d
+        # One L per cell: the avoid editor matches these steps against segments.
+        writer = SVGPathWriter()
+        writer.polyline([(offset_x + c * cs + half, offset_y + r * cs + half)
+                         for r, c in self.solution_path])
+        return writer.getvalue()
 
     def to_svg_corridors(self, offset_x: int = 0, offset_y: int = 0, mask: Optional[set] = None) -> str:
         """Generate SVG path data for corridor-style rendering.
 
         Draws lines between cell centers where walls are removed,
         rendered with wide stroke + round line caps = natural corridor look.
+        Corridors are chained into polylines (straight runs become one L);
+        the round joins cover each cell center, so only cells with no open
+        corridor need a dot of their own.
         """
-        paths = []
+        edges = []
+        linked = bytearray(self.rows * self.cols)
         cs = self.cell_size
         half = cs // 2
+        cols = self.cols
+        cells = self.cells
+        inside = self._mask_flags(mask)
         for r in range(self.rows):
-            for c in range(self.cols):
-                if mask and (r, c) not in mask:
+            cy = offset_y + r * cs + half
+            for c in range(cols):
+                index = r * cols + c
+                if not inside[index]:
                     continue
-                cell = self.grid[r][c]
                 cx = offset_x + c * cs + half
-                cy = offset_y + r * cs + half
                 # Only draw right and bottom connections to avoid duplicates
-                if not cell.walls["right"] and c + 1 < self.cols:
-                    if not mask or (r, c + 1) in mask:
-                        nx = offset_x + (c + 1) * cs + half
-                        paths.append(f"M {cx} {cy} L {nx} {cy}")
-                if not cell.walls["bottom"] and r + 1 < self.rows:
-                    if not mask or (r + 1, c) in mask:
-                        ny = offset_y + (r + 1) * cs + half
-                        paths.append(f"M {cx} {cy} L {cx} {ny}")
-        # Add dots at each cell center for round nodes
+                if not cells[index] & WALL_RIGHT and c + 1 < cols and inside[index + 1]:
+                    nx = offset_x + (c + 1) * cs + half
+                    edges.append(((cx, cy), (nx, cy)))
+                    linked[index] = linked[index + 1] = 1
+                if not cells[index] & WALL_BOTTOM and r + 1 < self.rows and inside[index + cols]:
+                    ny = offset_y + (r + 1) * cs + half
+                    edges.append(((cx, cy), (cx, ny)))
+                    linked[index] = linked[index + cols] = 1
+        writer = SVGPathWriter()
+        for polyline in chain_segments(edges):
+            writer.polyline(polyline)
+        # Dots for isolated cells so they still render as round nodes
         for r in range(self.rows):
-            for c in range(self.cols):
-                if mask and (r, c) not in mask:
+            cy = offset_y + r * cs + half
+            for c in range(cols):
+                if inside[r * cols + c] and not linked[r * cols + c]:
+                    writer.dot(offset_x + c * cs + half, cy)
+        # raw: one subpath per corridor plus a dot per cell, as before chaining
+        self.stats["svg"] = {"commands": writer.commands,
+                             "raw_commands": 2 * (len(edges) + sum(inside))}
+        return writer.getvalue()
+
+
+def eller_rows(rows: int, cols: int, row_mask: Optional[Callable[[int], bytes]] = None,
+               rng=random):
+    """Yield the packed walls of an Eller's-algorithm maze one row at a time.
+
+    Only the current row's set labels are kept between rows, so memory is
+    O(cols) however tall the maze is.  row_mask(r) may return 1/0 in-mask
+    flags for row r; cells outside the mask come back fully walled.  Sets
+    that a mask strands (no in-mask cell below) are joined sideways where
+    possible, but a mask that pinches off can still leave separate pieces.
+    """
+    full = b"\x01" * cols
+    labels = [0] * cols
+    next_label = 1
+    open_above = bytearray(cols)
+    inside = row_mask(0) if row_mask else full
+
+    def join(row: bytearray, c: int):
+        keep, drop = labels[c], labels[c + 1]
+        row[c] &= ~WALL_RIGHT
+        row[c + 1] &= ~WALL_LEFT
+        for k in range(cols):
+            if labels[k] == drop:
+                labels[k] = keep
+
+    for r in range(rows):
+        last = r == rows - 1
+        below = bytes(cols) if last else (row_mask(r + 1) if row_mask else full)
+        row = bytearray([ALL_WALLS]) * cols
+        for c in range(cols):
+            if not inside[c]:
+                labels[c] = 0
+            elif open_above[c]:
+                row[c] &= ~WALL_TOP
+            else:
+                labels[c] = next_label
+                next_label += 1
+
+        for c in range(cols - 1):
+            if (inside[c] and inside[c + 1] and labels[c] != labels[c + 1]
+                    and (last or rng.random() < 0.5)):
+                join(row, c)
+
+        if not last:
+            droppable = {labels[c] for c in range(cols) if inside[c] and below[c]}
+            stranded = {labels[c] for c in range(cols) if inside[c]} - droppable
+            for c in range(cols - 1):
+                a, b = labels[c], labels[c + 1]
+                if inside[c] and inside[c + 1] and a != b and (a in stranded or b in stranded):
+                    join(row, c)
+                    if not (a in stranded and b in stranded):
+                        stranded.discard(a)
+                    stranded.discard(b)
+
+            groups: Dict[int, List[int]] = {}
+            for c in range(cols):
+                if inside[c] and below[c]:
+                    groups.setdefault(labels[c], []).append(c)
+            open_above = bytearray(cols)
+            for members in groups.values():
+                drops = [c for c in members if rng.random() < 0.5] or [rng.choice(members)]
+                for c in drops:
+                    row[c] &= ~WALL_BOTTOM
+                    open_above[c] = 1
+
+        yield row
+        inside = below
+
+
+class MazeAlgorithms:
+    """Spanning-tree carvers selectable through MAZE_ALGORITHMS.
+
+    Every carver takes the generator and a list of seed cell indices.  Cells
+    flagged VISITED are already settled (outside the mask, or a guided
+    solution path); the carver joins every other cell it can reach to the
+    seeds with a spanning tree, marking them VISITED as it goes.
+    """
+
+    @staticmethod
+    def backtracker(maze: MazeGenerator, seeds: List[int]):
+        """Recursive backtracking: long winding corridors, few junctions."""
+        for index in seeds:
+            maze._carve_backtracker(index)
+
+    @staticmethod
+    def growing_tree(maze: MazeGenerator, seeds: List[int], newest: float = 0.5):
+        """Growing tree picking the newest active cell half the time, else a random one."""
+        cells = maze.cells
+        links = maze._links
+        active = list(seeds)
+        for index in active:
+            cells[index] |= VISITED
+        while active:
+            i = len(active) - 1 if maze.rng.random() < newest else maze.rng.randrange(len(active))
+            current = active[i]
+            options = [(bit, index) for bit, index in links[current] if not cells[index] & VISITED]
+            if options:
+                bit, next_index = maze.rng.choice(options)
+                maze._open_wall(current, bit, next_index)
+                cells[next_index] |= VISITED
+                active.append(next_index)
+            else:
+                del active[i]
+
+    @staticmethod
+    def prim(maze: MazeGenerator, seeds: List[int]):
+        """Randomized Prim's: grows from a random frontier wall, short bushy branches."""
+        cells = maze.cells
+        links = maze._links
+        frontier = []
+        for index in seeds:
+            cells[index] |= VISITED
+        for index in seeds:
+            frontier.extend((index, bit, n) for bit, n in links[index] if not cells[n] & VISITED)
+        while frontier:
+            i = maze.rng.randrange(len(frontier))
+            frontier[i], frontier[-1] = frontier[-1], frontier[i]
+            index, bit, neighbor = frontier.pop()
+            if cells[neighbor] & VISITED:
+                continue
+            maze._open_wall(index, bit, neighbor)
+            cells[neighbor] |= VISITED
+            frontier.extend((neighbor, b, n) for b, n in links[neighbor] if not cells[n] & VISITED)
+
+    @staticmethod
+    def kruskal(maze: MazeGenerator, seeds: List[int]):
+        """Randomized Kruskal's: union-find over the walls between unsettled cells."""
+        cells = maze.cells
+        free = bytearray(0 if value & VISITED else 1 for value in cells)
+        parent = list(range(len(cells)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Seeds are already joined to each other (a guided path, or one start cell).
+        for index in seeds:
+            free[index] = 1
+            parent[find(index)] = find(seeds[0])
+        walls = maze._internal_walls(free)
+        maze.rng.shuffle(walls)
+        for index, bit, neighbor in walls:
+            a, b = find(index), find(neighbor)
+            if a != b:
+                parent[b] = a
+                maze._open_wall(index, bit, neighbor)
+        for index, flag in enumerate(free):
+            if flag:
+                cells[index] |= VISITED
+
+    @staticmethod
+    def wilson(maze: MazeGenerator, seeds: List[int]):
+        """Wilson's loop-erased random walks: an unbiased uniform spanning tree."""
+        cells = maze.cells
+        links = maze._links
+        in_tree = bytearray(len(cells))
+        reachable = []
+        for index in seeds:
+            cells[index] |= VISITED
+            in_tree[index] = 1
+        # Only cells connected to the seeds can be reached by a walk.
+        seen = bytearray(value & VISITED and 1 for value in cells)
+        queue = list(seeds)
+        for index in queue:
+            for _, n in links[index]:
+                if not seen[n]:
+                    seen[n] = 1
+                    queue.append(n)
+                    reachable.append(n)
+        moves = [[(bit, n) for bit, n in links[index] if in_tree[n] or not cells[n] & VISITED]
+                 for index in range(len(cells))]
+
+        maze.rng.shuffle(reachable)
+        exit_bit = bytearray(len(cells))
+        exit_to = [0] * len(cells)
+        for walk_start in reachable:
+            current = walk_start
+            while not in_tree[current]:
+                bit, n = maze.rng.choice(moves[current])
+                exit_bit[current] = bit
+                exit_to[current] = n
+                current = n
+            # Retracing the last exits erases every loop the walk made.
+            current = walk_start
+            while not in_tree[current]:
+                maze._open_wall(current, exit_bit[current], exit_to[current])
+                in_tree[current] = 1
+                cells[current] |= VISITED
+                current = exit_to[current]
+
+    @staticmethod
+    def eller(maze: MazeGenerator, seeds: List[int]):
+        """Eller's row sweep (see eller_rows); pieces a mask cuts off are stitched back."""
+        cells = maze.cells
+        cols = maze.cols
+        inside = bytes(0 if value & VISITED else 1 for value in cells)
+        for r, row in enumerate(eller_rows(maze.rows, cols,
+                                           lambda r: inside[r * cols:(r + 1) * cols], maze.rng)):
+            base = r * cols
+            for c, walls in enumerate(row):
+                cells[base + c] = walls | VISITED
+        MazeAlgorithms._stitch(maze, inside)
+
+    @staticmethod
+    def _stitch(maze: MazeGenerator, inside: bytes):
+        """Open the fewest walls needed to join every connected piece of the mask."""
+        cells = maze.cells
+        parent = list(range(len(cells)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        cols = maze.cols
+        for index, value in enumerate(cells):
+            if not inside[index]:
+                continue
+            if not value & WALL_RIGHT:
+                parent[find(index + 1)] = find(index)
+            if not value & WALL_BOTTOM:
+                parent[find(index + cols)] = find(index)
+        walls = maze._internal_walls(inside)
+        maze.rng.shuffle(walls)
+        for index, bit, neighbor in walls:
+            a, b = find(index), find(neighbor)
+            if a != b:
+                parent[b] = a
+                maze._open_wall(index, bit, neighbor)
+
+
+MAZE_ALGORITHMS: Dict[str, Callable[[MazeGenerator, List[int]], None]] = {
+    "backtracker": MazeAlgorithms.backtracker,
+    "growing_tree": MazeAlgorithms.growing_tree,
+    "prim": MazeAlgorithms.prim,
+    "kruskal": MazeAlgorithms.kruskal,
+    "wilson": MazeAlgorithms.wilson,
+    "eller": MazeAlgorithms.eller,
+}
+
+
+class MazeConnectivity:
+    """Distance fields and cut structure of one finished maze.
+
+    Built once per final maze: BFS distance fields from the start and the
+    end, plus the articulation points and bridges of the open-passage graph
+    (Tarjan, iterative).  From those, the cells that every start-to-end
+    route must pass through are marked, so "is there a detour around this
+    cell" is a lookup instead of a fresh BFS.  Cells in *blocked* are
+    treated as removed from the maze.
+    """
+
+    def __init__(self, maze: MazeGenerator, start: Tuple[int, int], end: Tuple[int, int],
+                 blocked=()):
+        cols = maze.cols
+        size = len(maze.cells)
+        self.maze = maze
+        self.source = start[0] * cols + start[1]
+        self.target = end[0] * cols + end[1]
+        self.blocked = bytearray(size)
+        for r, c in blocked:
+            self.blocked[r * cols + c] = 1
+
+        self._parent = [-1] * size
+        self.dist_start = self._distances(self.source, self._parent)
+        self.dist_end = self._distances(self.target)
+        self.articulation = bytearray(size)
+        self.bridges: set = set()
+        self.separators = bytearray(size)
+        self._tarjan()
+
+    def _distances(self, source: int, parent: Optional[List[int]] = None) -> List[int]:
+        """BFS step counts from *source* (-1 where unreachable).
+
+        Expands neighbours in solve() order, so the parents recorded for the
+        start field trace the same shortest path solve() returns.
+        """
+        cells = self.maze.cells
+        links = self.maze._solve_links
+        blocked = self.blocked
+        dist = [-1] * len(cells)
+        if blocked[source]:
+            return dist
+        dist[source] = 0
+        if parent is not None:
+            parent[source] = source
+        queue = [source]
+        for index in queue:
+            walls = cells[index]
+            step = dist[index] + 1
+            for bit, neighbor in links[index]:
+                if not walls & bit and dist[neighbor] < 0 and not blocked[neighbor]:
+                    dist[neighbor] = step
+                    if parent is not None:
+                        parent[neighbor] = index
+                    queue.append(neighbor)
+        return dist
+
+    def _tarjan(self):
+        """Articulation points, bridges and start/end separators in one DFS."""
+        cells = self.maze.cells
+        links = self.maze._links
+        blocked = self.blocked
+        source, target = self.source, self.target
+        if blocked[source]:
+            return
+        size = len(cells)
+        disc = [-1] * size
+        low = [0] * size
+        tree_parent = [-1] * size
+        cursor = [0] * size
+        disc[source] = 0
+        timer = 0
+        root_children = 0
+        stack = [source]
+
+        while stack:
+            v = stack[-1]
+            v_links = links[v]
+            i = cursor[v]
+            if i < len(v_links):
+                cursor[v] = i + 1
+                bit, w = v_links[i]
+                if cells[v] & bit or blocked[w]:
                     continue
-                cx = offset_x + c * cs + half
-                cy = offset_y + r * cs + half
-                paths.append(f"M {cx} {cy} L {cx} {cy}")
-        return " ".join(paths)
+                if disc[w] < 0:
+                    timer += 1
+                    disc[w] = low[w] = timer
+                    tree_parent[w] = v
+                    stack.append(w)
+                elif w != tree_parent[v] and disc[w] < low[v]:
+                    low[v] = disc[w]
+                continue
+
+            stack.pop()
+            p = tree_parent[v]
+            if p < 0:
+                continue
+            if low[v] < low[p]:
+                low[p] = low[v]
+            if low[v] > disc[p]:
+                self.bridges.add((min(p, v), max(p, v)))
+            if p == source:
+                root_children += 1
+            elif low[v] >= disc[p]:
+                self.articulation[p] = 1
+
+        if root_children > 1:
+            self.articulation[source] = 1
+
+        # A cut vertex separates start from end exactly when the end lies in
+        # the DFS subtree it cuts off, i.e. on the tree path back from the end.
+        if disc[target] < 0:
+            return
+        self.separators[source] = self.separators[target] = 1
+        child, v = target, tree_parent[target]
+        while v != source:
+            if low[child] >= disc[v]:
+                self.separators[v] = 1
+            child, v = v, tree_parent[v]
+
+    @property
+    def connected(self) -> bool:
+        return self.dist_start[self.target] >= 0
+
+    def solution(self) -> List[Tuple[int, int]]:
+        """The shortest start-to-end path, identical to MazeGenerator.solve()."""
+        if not self.connected:
+            return []
+        cols = self.maze.cols
+        index = self.target
+        path = []
+        while index != self.source:
+            path.append(divmod(index, cols))
+            index = self._parent[index]
+        path.append(divmod(self.source, cols))
+        path.reverse()
+        return path
+
+    def distance(self, cell: Tuple[int, int]) -> Tuple[int, int]:
+        """(steps from start, steps to end) for *cell*, -1 where unreachable."""
+        index = cell[0] * self.maze.cols + cell[1]
+        return self.dist_start[index], self.dist_end[index]
+
+    def has_detour(self, cell: Tuple[int, int]) -> bool:
+        """True if start still reaches end with *cell* blocked as well."""
+        return self.connected and not self.separators[cell[0] * self.maze.cols + cell[1]]
+
+    def is_bridge(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        """True if the open passage between cells *a* and *b* is the only link across it."""
+        cols = self.maze.cols
+        i, j = a[0] * cols + a[1], b[0] * cols + b[1]
+        return (min(i, j), max(i, j)) in self.bridges
+
+
+class CellMask:
+    """Immutable in-shape flags for a rows x cols grid.
+
+    flags[r * cols + c] is 1 for cells inside the shape, the same row-major
+    layout as MazeGenerator.cells, so mask consumers index it directly.
+    CellMask also answers the read-only questions the old set of (row, col)
+    tuples did: ``(r, c) in mask``, len(), truthiness, and iteration in
+    sorted (row-major) order. to_set() / from_cells() convert to and from
+    that legacy set.
+    """
+
+    __slots__ = ("rows", "cols", "flags", "_count")
+
+    def __init__(self, rows: int, cols: int, flags: bytes):
+        if len(flags) != rows * cols:
+            raise ValueError(f"CellMask needs {rows * cols} flags, got {len(flags)}")
+        self.rows = rows
+        self.cols = cols
+        self.flags = bytes(flags)
+        self._count = self.flags.count(1)
+
+    @classmethod
+    def from_cells(cls, rows: int, cols: int, cells) -> "CellMask":
+        """Build from (row, col) tuples; cells off the grid are dropped."""
+        flags = bytearray(rows * cols)
+        for r, c in cells:
+            if 0 <= r < rows and 0 <= c < cols:
+                flags[r * cols + c] = 1
+        return cls(rows, cols, flags)
+
+    @classmethod
+    def from_spans(cls, rows: int, cols: int, spans) -> "CellMask":
+        """Build from (row, first_col, width) runs, clipped to the grid."""
+        flags = bytearray(rows * cols)
+        for r, start_c, width in spans:
+            lo, hi = max(start_c, 0), min(start_c + width, cols)
+            if 0 <= r < rows and lo < hi:
+                base = r * cols
+                flags[base + lo:base + hi] = b"\x01" * (hi - lo)
+        return cls(rows, cols, flags)
+
+    def indices(self) -> Iterator[int]:
+        """Flat indices of the in-shape cells, ascending."""
+        return itertools.compress(range(len(self.flags)), self.flags)
+
+    def cells(self) -> List[Tuple[int, int]]:
+        """In-shape (row, col) cells in sorted order."""
+        cols = self.cols
+        return [divmod(index, cols) for index in self.indices()]
+
+    def to_set(self) -> set:
+        """The legacy set-of-tuples form."""
+        return set(self.cells())
+
+    def __contains__(self, cell) -> bool:
+        r, c = cell
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.flags[r * self.cols + c] == 1
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.cells())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CellMask):
+            return (self.rows, self.cols, self.flags) == (other.rows, other.cols, other.flags)
+        if isinstance(other, (set, frozenset)):
+            return self.to_set() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.rows, self.cols, self.flags))
+
+    def __repr__(self) -> str:
+        return f"CellMask({self.rows}x{self.cols}, {self._count} cells)"
 
 
 class ShapeMask:
-    """Generates cell masks for shaped mazes."""
+    """Generates cell masks for shaped mazes.
+
+    Each shape is built row by row as slice fills (or one comparison per
+    cell against precomputed column terms for the round shapes) into a
+    CellMask. ShapeMask.get() memoizes them by (shape, rows, cols); masks
+    are immutable, so every caller can share one.
+    """
+
+    SHAPES = ("triangle", "tree", "mountain", "diamond", "circle", "moon", "shell", "rocket")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def get(shape: str, rows: int, cols: int) -> CellMask:
+        """Memoized mask for one of SHAPES."""
+        if shape not in ShapeMask.SHAPES:
+            raise ValueError(f"Unknown mask shape: {shape}")
+        return getattr(ShapeMask, shape)(rows, cols)
 
     @staticmethod
-    def triangle(rows: int, cols: int) -> set:
-        mask = set()
+    def triangle(rows: int, cols: int) -> CellMask:
+        spans = []
         for r in range(rows):
             progress = r / max(rows - 1, 1)
             width = max(1, int(cols * progress))
-            start_c = (cols - width) // 2
-            for c in range(start_c, start_c + width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
-        return mask
+            spans.append((r, (cols - width) // 2, width))
+        return CellMask.from_spans(rows, cols, spans)
 
     @staticmethod
-    def tree(rows: int, cols: int) -> set:
-        mask = set()
+    def tree(rows: int, cols: int) -> CellMask:
+        spans = []
         trunk_width = max(2, cols // 5)
         trunk_height = max(2, rows // 4)
         canopy_rows = rows - trunk_height
         for r in range(canopy_rows):
             progress = r / max(canopy_rows - 1, 1)
             width = max(2, int(cols * 0.3 + cols * 0.7 * progress))
-            start_c = (cols - width) // 2
-            for c in range(start_c, start_c + width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
+            spans.append((r, (cols - width) // 2, width))
         trunk_start = (cols - trunk_width) // 2
         for r in range(canopy_rows, rows):
-            for c in range(trunk_start, trunk_start + trunk_width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
-        return mask
+            spans.append((r, trunk_start, trunk_width))
+        return CellMask.from_spans(rows, cols, spans)
 
     @staticmethod
-    def mountain(rows: int, cols: int) -> set:
-        mask = set()
+    def mountain(rows: int, cols: int) -> CellMask:
+        spans = []
         peak_col = cols // 2
         for r in range(rows):
             inv_progress = 1.0 - (r / max(rows - 1, 1))
             width = max(1, int(cols * (1.0 - inv_progress * 0.7)))
-            start_c = peak_col - width // 2
-            for c in range(start_c, start_c + width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
-        return mask
+            spans.append((r, peak_col - width // 2, width))
+        return CellMask.from_spans(rows, cols, spans)
 
     @staticmethod
-    def diamond(rows: int, cols: int) -> set:
-        mask = set()
+    def diamond(rows: int, cols: int) -> CellMask:
+        spans = []
         mid_r = rows // 2
         for r in range(rows):
             dist = abs(r - mid_r)
             frac = 1.0 - dist / max(mid_r, 1)
             width = max(1, int(cols * frac))
-            start_c = (cols - width) // 2
-            for c in range(start_c, start_c + width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
-        return mask
+            spans.append((r, (cols - width) // 2, width))
+        return CellMask.from_spans(rows, cols, spans)
 
     @staticmethod
-    def circle(rows: int, cols: int) -> set:
-        mask = set()
+    def circle(rows: int, cols: int) -> CellMask:
         cr, cc = rows / 2, cols / 2
         radius = min(rows, cols) / 2 - 0.5
+        limit = radius ** 2
+        dx2 = [(c - cc + 0.5) ** 2 for c in range(cols)]
+        flags = bytearray()
         for r in range(rows):
-            for c in range(cols):
-                if ((r - cr + 0.5) ** 2 + (c - cc + 0.5) ** 2) <= radius ** 2:
-                    mask.add((r, c))
-        return mask
+            dy2 = (r - cr + 0.5) ** 2
+            flags += bytes(dy2 + d <= limit for d in dx2)
+        return CellMask(rows, cols, flags)
 
     @staticmethod
-    def moon(rows: int, cols: int) -> set:
+    def moon(rows: int, cols: int) -> CellMask:
         """Crescent moon shape — full circle with inner circle cut out offset to one side."""
-        mask = set()
         cr, cc = rows / 2, cols / 2
         outer_r = min(rows, cols) / 2 - 0.5
         # Inner circle offset to create crescent
         inner_r = outer_r * 0.72
         inner_cc = cc + outer_r * 0.38
+        outer_limit, inner_limit = outer_r ** 2, inner_r ** 2
+        outer_dx2 = [(c - cc + 0.5) ** 2 for c in range(cols)]
+        inner_dx2 = [(c - inner_cc + 0.5) ** 2 for c in range(cols)]
+        flags = bytearray()
         for r in range(rows):
-            for c in range(cols):
-                in_outer = ((r - cr + 0.5) ** 2 + (c - cc + 0.5) ** 2) <= outer_r ** 2
-                in_inner = ((r - cr + 0.5) ** 2 + (c - inner_cc + 0.5) ** 2) <= inner_r ** 2
-                if in_outer and not in_inner:
-                    mask.add((r, c))
-        return mask
+            dy2 = (r - cr + 0.5) ** 2
+            flags += bytes(dy2 + o <= outer_limit and not dy2 + i <= inner_limit
+                           for o, i in zip(outer_dx2, inner_dx2))
+        return CellMask(rows, cols, flags)
 
     @staticmethod
-    def shell(rows: int, cols: int) -> set:
+    def shell(rows: int, cols: int) -> CellMask:
         """Scallop shell shape — broad rounded fan with a narrower hinged base."""
-        mask = set()
+        spans = []
         for r in range(rows):
             progress = r / max(rows - 1, 1)
             if progress < 0.14:
@@ -390,16 +1282,13 @@ class ShapeMask:
                 width_ratio = 0.94 - 0.58 * (eased ** 0.82)
             width = max(2, int(cols * width_ratio))
             center_shift = int((0.5 - progress) * cols * 0.04)
-            start_c = (cols - width) // 2 + center_shift
-            for c in range(start_c, start_c + width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
-        return mask
+            spans.append((r, (cols - width) // 2 + center_shift, width))
+        return CellMask.from_spans(rows, cols, spans)
 
     @staticmethod
-    def rocket(rows: int, cols: int) -> set:
+    def rocket(rows: int, cols: int) -> CellMask:
         """Rocket ship — pointed nose cone, rectangular body, flared fins at base."""
-        mask = set()
+        spans = []
         body_width = max(3, cols // 3)
         body_start_c = (cols - body_width) // 2
 
@@ -408,30 +1297,21 @@ class ShapeMask:
         for r in range(nose_rows):
             progress = r / max(nose_rows - 1, 1)
             width = max(1, round(body_width * progress))
-            start_c = (cols - width) // 2
-            for c in range(start_c, start_c + width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
+            spans.append((r, (cols - width) // 2, width))
 
         # Body (middle 55%)
         body_rows = max(3, rows * 55 // 100)
         for r in range(nose_rows, nose_rows + body_rows):
-            for c in range(body_start_c, body_start_c + body_width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
+            spans.append((r, body_start_c, body_width))
 
         # Fins (bottom 17%): flare outward
         fin_start = nose_rows + body_rows
         extra = max(2, cols // 7)
-        fin_width = min(cols - 2, body_width + extra * 2)
         for r in range(fin_start, rows):
             progress = (r - fin_start) / max(rows - fin_start - 1, 1)
             current_width = body_width + round(extra * 2 * progress)
-            start_c = (cols - current_width) // 2
-            for c in range(start_c, start_c + current_width):
-                if 0 <= c < cols:
-                    mask.add((r, c))
-        return mask
+            spans.append((r, (cols - current_width) // 2, current_width))
+        return CellMask.from_spans(rows, cols, spans)
 
 
 class OrganicPathGenerator:
@@ -444,10 +1324,12 @@ class OrganicPathGenerator:
     style="flower"    — daisy/flower: N petal loops around a hub, items at petal tips
     """
 
-    def __init__(self, width: int = 600, height: int = 500, path_width: int = 35):
+    def __init__(self, width: int = 600, height: int = 500, path_width: int = 35,
+                 rng: Optional[random.Random] = None):
         self.width = width
         self.height = height
         self.path_width = path_width
+        self.rng = rng if rng is not None else random
 
     def generate(self, num_turns: int = 4, style: str = "labyrinth",
                  grid_cols: int = 7, grid_rows: int = 5,
@@ -571,68 +1453,126 @@ class OrganicPathGenerator:
     # Labyrinth style — grid Hamiltonian path
     # ------------------------------------------------------------------
 
+    # Search nodes per grid cell each restart of _find_hamiltonian_path may
+    # expand. A node count, not a clock, so a seed always gives the same path.
+    HAMILTONIAN_NODES_PER_CELL = 200
+    HAMILTONIAN_RESTARTS = 60
+
     def _find_hamiltonian_path(self, rows: int, cols: int,
                                start: tuple, end: tuple) -> list:
-        """Randomised DFS with Warnsdorf tie-breaking.
+        """Randomised iterative DFS with Warnsdorf tie-breaking.
 
         Tries to visit as many cells as possible (≥70% of grid) before
         reaching *end*.  Returns the best path found across several attempts.
+
+        Cells are indices r * cols + c and the visited set is an int bitmask.
+        Warnsdorf degrees (unvisited neighbours per cell) are kept up to date
+        as cells are visited and released, and a branch is pruned as soon as
+        the unvisited region it can still reach no longer touches *end* or is
+        too small to meet the coverage target.  Each restart stops after
+        HAMILTONIAN_NODES_PER_CELL nodes per cell, so the whole search is
+        bounded by the grid size and never by machine speed.
         """
-        dirs = [(0, 1), (0, -1), (1, 0), (-1, 0)]
         total = rows * cols
+        full = (1 << total) - 1
+        first_col = sum(1 << (r * cols) for r in range(rows))
+        not_first_col = full & ~first_col
+        not_last_col = full & ~(first_col << (cols - 1))
 
-        def nbrs(r: int, c: int, visited: set) -> list:
-            return [(r + dr, c + dc) for dr, dc in dirs
-                    if 0 <= r + dr < rows and 0 <= c + dc < cols
-                    and (r + dr, c + dc) not in visited]
+        adj: list = []
+        adj_mask: list = []
+        for r in range(rows):
+            for c in range(cols):
+                cells = [(r + dr) * cols + c + dc for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0))
+                         if 0 <= r + dr < rows and 0 <= c + dc < cols]
+                adj.append(tuple(cells))
+                adj_mask.append(sum(1 << n for n in cells))
+        base_degree = [len(cells) for cells in adj]
+
+        # Shortest paths (before stepping onto end) that satisfy each rule.
+        need_end = next(n for n in range(total + 1) if n / total >= 0.70)
+        need_stuck = next(n for n in range(total + 1) if n / total >= 0.55)
+
+        s = start[0] * cols + start[1]
+        e = end[0] * cols + end[1]
+        end_bit = 1 << e
+        node_budget = self.HAMILTONIAN_NODES_PER_CELL * total
+
+        def reachable(cell: int, free: int) -> int:
+            """Unvisited cells reachable from *cell* without passing through end."""
+            free &= ~end_bit
+            region = adj_mask[cell] & free
+            while True:
+                grown = (region | ((region << 1) & not_first_col) | ((region >> 1) & not_last_col)
+                         | (region << cols) | (region >> cols)) & free
+                if grown == region:
+                    return region
+                region = grown
 
         best: list = [start, end]
 
-        for _ in range(60):
-            visited: set = {start}
-            path: list = [start]
-            found = [False]
-
-            def dfs(r: int, c: int) -> None:
-                if found[0]:
-                    return
-                coverage = len(path) / total
-                candidates = nbrs(r, c, visited)
-
+        for _ in range(self.HAMILTONIAN_RESTARTS):
+            visited = 1 << s
+            degree = base_degree[:]
+            for n in adj[s]:
+                degree[n] -= 1
+            path = [s]
+
+            def expand(cell: int) -> Optional[list]:
+                """Ordered moves from *cell*, or None once the path may finish at end."""
+                free = full & ~visited
+                moves = [n for n in adj[cell] if free >> n & 1]
                 # Allow ending only once we've covered enough of the grid
-                if end in candidates:
-                    if coverage >= 0.70:
-                        path.append(end)
-                        found[0] = True
-                        return
-                    candidates = [n for n in candidates if n != end]
-
-                # No moves: if we happen to be next to end still accept
-                if not candidates:
-                    if end in nbrs(r, c, visited - {end}) and coverage >= 0.55:
-                        path.append(end)
-                        found[0] = True
-                    return
-
-                random.shuffle(candidates)
+                if e in moves:
+                    if len(path) >= need_end:
+                        return None
+                    moves.remove(e)
+                    # No other moves: next to end still counts at lower coverage
+                    if not moves and len(path) >= need_stuck:
+                        return None
+                if not moves:
+                    return moves
+                region = reachable(cell, free)
+                if (not adj_mask[e] & (region | 1 << cell)
+                        or len(path) + bin(region).count("1") < need_stuck):
+                    return []
+                self.rng.shuffle(moves)
                 # Warnsdorf: fewest onward moves first → avoids dead-end traps
-                candidates.sort(
-                    key=lambda n: len(nbrs(n[0], n[1], visited | {n}))
-                )
-
-                for nr, nc in candidates:
-                    visited.add((nr, nc))
-                    path.append((nr, nc))
-                    dfs(nr, nc)
-                    if found[0]:
-                        return
-                    path.pop()
-                    visited.remove((nr, nc))
-
-            dfs(*start)
-
-            if found[0] and len(path) > len(best):
-                best = path[:]
+                moves.sort(key=degree.__getitem__)
+                return moves
+
+            moves = expand(s)
+            found = moves is None
+            stack = [] if found else [[moves, 0]]
+            nodes = 0
+            while stack:
+                frame = stack[-1]
+                moves, i = frame
+                if i == len(moves):
+                    stack.pop()
+                    if stack:
+                        cell = path.pop()
+                        visited &= ~(1 << cell)
+                        for n in adj[cell]:
+                            degree[n] += 1
+                    continue
+                frame[1] = i + 1
+                cell = moves[i]
+                path.append(cell)
+                visited |= 1 << cell
+                for n in adj[cell]:
+                    degree[n] -= 1
+                nodes += 1
+                child = expand(cell)
+                if child is None:
+                    found = True
+                    break
+                stack.append([child, 0])
+                if nodes >= node_budget:
+                    break
+
+            if found and len(path) + 1 > len(best):
+                best = [divmod(cell, cols) for cell in path] + [end]
             if len(best) >= total * 0.80 and best[-1] == end:
                 break
 
@@ -672,8 +1612,8 @@ class OrganicPathGenerator:
             # Jitter tapers to zero at start/end for clean entry/exit
             is_edge = (i == 0 or i == len(cells) - 1)
             jitter_scale = 0.0 if is_edge else 0.9
-            jx = random.uniform(-cell_w * 0.28, cell_w * 0.28) * jitter_scale
-            jy = random.uniform(-cell_h * 0.28, cell_h * 0.28) * jitter_scale
+            jx = self.rng.uniform(-cell_w * 0.28, cell_w * 0.28) * jitter_scale
+            jy = self.rng.uniform(-cell_h * 0.28, cell_h * 0.28) * jitter_scale
 
             x = max(left + 5, min(right  - 5, base_x + jx))
             y = max(top  + 5, min(bottom - 5, base_y + jy))
@@ -700,8 +1640,8 @@ class OrganicPathGenerator:
             t = (i + 1) / (num_turns + 1)
             base_x = start_x + (end_x - start_x) * t
             base_y = start_y + (end_y - start_y) * t
-            offset_x = random.uniform(-80, 80)
-            offset_y = random.uniform(-40, 40)
+            offset_x = self.rng.uniform(-80, 80)
+            offset_y = self.rng.uniform(-40, 40)
             points.append((base_x + offset_x, base_y + offset_y))
 
         points.append((end_x, end_y))
@@ -748,8 +1688,8 @@ class OrganicPathGenerator:
                 edge_dist = min(t, 1.0 - t)          # 0 at edges, 0.5 in middle
                 jitter_scale = min(edge_dist * 4, 1.0)
 
-                jitter_x = random.uniform(-28, 28) * jitter_scale
-                jitter_y = random.uniform(-row_spacing * 0.22, row_spacing * 0.22) * jitter_scale
+                jitter_x = self.rng.uniform(-28, 28) * jitter_scale
+                jitter_y = self.rng.uniform(-row_spacing * 0.22, row_spacing * 0.22) * jitter_scale
 
                 x = max(left + 8, min(right - 8, base_x + jitter_x))
                 y = max(top + 8, min(bottom - 8, row_y + jitter_y))
@@ -763,14 +1703,14 @@ class OrganicPathGenerator:
 
     def _build_result(self, points: list) -> Dict[str, Any]:
         """Convert waypoint list into the standard maze_data dict."""
-        svg_path = f"M {points[0][0]:.1f} {points[0][1]:.1f}"
+        writer = SVGPathWriter(precision=1)
+        writer.move_to(*points[0])
         for i in range(1, len(points) - 1):
-            cx = points[i][0]
-            cy = points[i][1]
             nx = (points[i][0] + points[i + 1][0]) / 2
             ny = (points[i][1] + points[i + 1][1]) / 2
-            svg_path += f" Q {cx:.1f} {cy:.1f} {nx:.1f} {ny:.1f}"
-        svg_path += f" L {points[-1][0]:.1f} {points[-1][1]:.1f}"
+            writer.quad_to(points[i][0], points[i][1], nx, ny)
+        writer.line_to(*points[-1])
+        svg_path = writer.getvalue()
 
         segments = [
             {
@@ -793,7 +1733,10 @@ class OrganicPathGenerator:
 
 
 class FullMazeGenerator:
-    """High-level maze generator that combines all maze types."""
+    """High-level maze generator that combines all maze types.
+
+    rng is handed to every MazeGenerator it builds (see MazeGenerator).
+    """
 
     SHAPE_MASKS = {
         "rect": None,
@@ -807,6 +1750,9 @@ class FullMazeGenerator:
         "rocket": ShapeMask.rocket,
     }
 
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random
+
     @staticmethod
     def _rect_position(rows: int, cols: int, position_name: str) -> Optional[Tuple[int, int]]:
         """Map position name to cell coordinates for rectangular (non-masked) mazes."""
@@ -824,67 +1770,60 @@ class FullMazeGenerator:
         return positions.get(position_name)
 
     @staticmethod
-    def _braid_dead_ends(maze: MazeGenerator, mask: Optional[set] = None):
-        """Remove one wall from every dead-end cell, eliminating all dead ends.
-
-        A dead end has exactly one open passage.  We repeatedly scan and open a
-        random closed wall on each dead-end cell until none remain.  This turns
-        a perfect (tree) maze into a braided maze with multiple routes.
+    def _braid_dead_ends(maze: MazeGenerator, mask: Optional[set] = None,
+                         fraction: float = 1.0) -> int:
+        """Open a wall at dead-end cells until *fraction* of the dead ends are gone.
+
+        A dead end has at most one open passage; opening a random closed wall
+        to an in-maze neighbour turns the perfect (tree) maze into a braided
+        one with multiple routes.  Passage counts are taken once and updated
+        only for the two cells each opening touches, and the dead ends sit in
+        a work queue, so the whole pass is linear in the number of cells.
+
+        fraction=1.0 removes every dead end, in row-major order.  A smaller
+        fraction works through the dead ends in shuffled order, spreading the
+        loops over the maze, and stops once that share of them is gone (an
+        opening between two dead ends removes both).  Returns how many dead
+        ends were removed.
         """
-        opposites = {"top": "bottom", "bottom": "top", "left": "right", "right": "left"}
-        nbr_offsets = {"top": (-1, 0), "right": (0, 1), "bottom": (1, 0), "left": (0, -1)}
-
-        changed = True
-        while changed:
-            changed = False
-            for r in range(maze.rows):
-                for c in range(maze.cols):
-                    if mask and (r, c) not in mask:
-                        continue
-                    cell = maze.grid[r][c]
-                    open_passages = sum(1 for w in ["top", "right", "bottom", "left"]
-                                        if not cell.walls[w])
-                    if open_passages > 1:
-                        continue
-                    # Dead end — pick a random closed wall to an in-maze neighbour
-                    closed = []
-                    for wall, (dr, dc) in nbr_offsets.items():
-                        if not cell.walls[wall]:
-                            continue
-                        nr, nc = r + dr, c + dc
-                        if not (0 <= nr < maze.rows and 0 <= nc < maze.cols):
-                            continue
-                        if mask and (nr, nc) not in mask:
-                            continue
-                        closed.append((wall, nr, nc))
-                    if closed:
-                        wall, nr, nc = random.choice(closed)
-                        cell.walls[wall] = False
-                        maze.grid[nr][nc].walls[opposites[wall]] = False
-                        changed = True
+        cells = maze.cells
+        links = maze._links
+        inside = maze._mask_flags(mask)
+        degree = bytearray(OPEN_PASSAGES[value] for value in cells)
+
+        queue = collections.deque(index for index in range(len(cells))
+                                  if inside[index] and degree[index] <= 1)
+        target = len(queue) if fraction >= 1 else int(round(len(queue) * max(fraction, 0.0)))
+        if target < len(queue):
+            maze.rng.shuffle(queue)
+
+        removed = 0
+        while queue and removed < target:
+            index = queue.popleft()
+            if degree[index] > 1:
+                continue  # An earlier opening already reached this cell
+            # Dead end — pick a random closed wall to an in-maze neighbour
+            closed = [(bit, neighbor) for bit, neighbor in links[index]
+                      if cells[index] & bit and inside[neighbor]]
+            if not closed:
+                continue
+            bit, neighbor = maze.rng.choice(closed)
+            maze._open_wall(index, bit, neighbor)
+            degree[index] += 1
+            degree[neighbor] += 1
+            if degree[index] > 1:
+                removed += 1
+            else:
+                queue.append(index)  # Was sealed off; still needs another opening
+            if degree[neighbor] == 2:
+                removed += 1
+        return removed
 
     @staticmethod
     def _solve_avoiding(maze: MazeGenerator, start: Tuple[int, int],
                         end: Tuple[int, int], blocked: set) -> bool:
-        """BFS from start to end treating `blocked` cells as impassable."""
-        from collections import deque
-        visited: set = {start}
-        queue: deque = deque([start])
-        while queue:
-            r, c = queue.popleft()
-            if (r, c) == end:
-                return True
-            cell = maze.grid[r][c]
-            nbrs = []
-            if not cell.walls["top"]:    nbrs.append((r - 1, c))
-            if not cell.walls["bottom"]: nbrs.append((r + 1, c))
-            if not cell.walls["left"]:   nbrs.append((r, c - 1))
-            if not cell.walls["right"]:  nbrs.append((r, c + 1))
-            for pos in nbrs:
-                if pos not in visited and pos not in blocked:
-                    visited.add(pos)
-                    queue.append(pos)
-        return False
+        """True if start still reaches end with `blocked` cells impassable."""
+        return MazeConnectivity(maze, start, end, blocked).connected
 
     def _place_avoid_items(
         self,
@@ -898,6 +1837,7 @@ class FullMazeGenerator:
         offset_y: int,
         cell_size: int,
         mask: Optional[set] = None,
+        connectivity: Optional[MazeConnectivity] = None,
     ) -> List[Dict[str, Any]]:
         """Place avoid obstacles with enough room to steer around them.
 
@@ -905,17 +1845,17 @@ class FullMazeGenerator:
         but the rendered emoji is offset away from the path centerline so the
         player can pass without needing a perfect detour trace. Early solution
         cells are skipped to keep the first obstacle away from the start.
+        connectivity may pass in a MazeConnectivity already built for this maze.
         """
         half = cell_size // 2
-        lateral_offset = min(cell_size * 0.2, max(10.0, self.path_width * 0.32))
+        lateral_offset = min(cell_size * 0.2, max(10.0, maze.path_width * 0.32))
         min_start_steps = max(2, len(solution) // 5)
 
         def open_passages(r: int, c: int) -> int:
-            cell = maze.grid[r][c]
-            return sum(1 for w in ["top", "right", "bottom", "left"] if not cell.walls[w])
+            return OPEN_PASSAGES[maze.cells[r * maze.cols + c]]
 
         # Candidate: on solution, not start/end, has ≥2 open passages.
-        # The BFS detour check below is the real guard — even a 2-passage cell
+        # The detour check below is the real guard — even a 2-passage cell
         # can have an alternate route if the maze is sufficiently braided.
         candidates = [
             (i, pos) for i, pos in enumerate(solution)
@@ -930,13 +1870,18 @@ class FullMazeGenerator:
         selected: List[Tuple[int, Tuple[int, int]]] = []
         last_path_idx = -min_gap
 
+        # The connectivity cache answers each candidate in O(1); it only has
+        # to be rebuilt (with the chosen cells blocked) after a selection.
+        if connectivity is None:
+            connectivity = MazeConnectivity(maze, start, end)
         for path_idx, pos in candidates:
             if path_idx - last_path_idx < min_gap:
                 continue
-            blocked = {p for _, p in selected} | {pos}
-            if self._solve_avoiding(maze, start, end, blocked):
+            if connectivity.has_detour(pos):
                 selected.append((path_idx, pos))
                 last_path_idx = path_idx
+                if len(selected) < num_owls:
+                    connectivity = MazeConnectivity(maze, start, end, [p for _, p in selected])
             if len(selected) >= num_owls:
                 break
 
@@ -987,12 +1932,9 @@ class FullMazeGenerator:
         solution_cells = [c for c in solution if c != start and c != end]
 
         # All reachable cells not on the solution path
-        all_cells = set()
-        for r in range(maze.rows):
-            for c in range(maze.cols):
-                if mask and (r, c) not in mask:
-                    continue
-                all_cells.add((r, c))
+        cols = maze.cols
+        inside = maze._mask_flags(mask)
+        all_cells = set(divmod(index, cols) for index in itertools.compress(range(len(inside)), inside))
         branch_cells = [c for c in all_cells if c not in solution_set and c != start and c != end]
 
         # Split: ~40% on solution, ~60% on branches
@@ -1004,8 +1946,8 @@ class FullMazeGenerator:
             on_branch_count = len(branch_cells)
             on_solution_count = item_count - on_branch_count
 
-        random.shuffle(solution_cells)
-        random.shuffle(branch_cells)
+        self.rng.shuffle(solution_cells)
+        self.rng.shuffle(branch_cells)
 
         chosen_solution = solution_cells[:min(on_solution_count, len(solution_cells))]
         chosen_branch = branch_cells[:min(on_branch_count, len(branch_cells))]
@@ -1031,27 +1973,14 @@ class FullMazeGenerator:
             })
         return items
 
-    def generate_maze(
-        self,
-        difficulty: str = "easy",
-        age: int = 4,
-        shape: str = "rect",
-        canvas_width: int = 600,
-        canvas_height: int = 500,
-        override_rows: Optional[int] = None,
-        override_cols: Optional[int] = None,
-        render_style: str = "walls",
-        item_rule: Optional[str] = None,
-        item_count: int = 0,
-        item_emoji: Optional[str] = None,
-        start_position: Optional[str] = None,
-        end_position: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """Generate a complete maze with all data needed for the app.
+    def _maze_layout(self, difficulty: str, age: int, shape: str, canvas_width: int,
+                     canvas_height: int, override_rows: Optional[int], override_cols: Optional[int],
+                     start_position: Optional[str], end_position: Optional[str]) -> Dict[str, Any]:
+        """Everything generate_maze derives from its spec before carving.
 
-        render_style: "walls" (default) or "corridor"
-        item_rule: None or "collect"
-        start_position/end_position: override start/end placement
+        Grid and cell size, offsets, mask, default start/end and the
+        candidate cells for named positions depend only on the spec, so
+        generate_mazes computes this once per batch.
         """
         path_width = 35 if age <= 4 else 25
 
@@ -1079,15 +2008,12 @@ class FullMazeGenerator:
 
         # Generate mask for shaped mazes
         mask = None
-        mask_fn = self.SHAPE_MASKS.get(shape)
-        if mask_fn:
-            mask = mask_fn(rows, cols)
-
-        maze = MazeGenerator(rows, cols, cell_size, path_width)
+        if self.SHAPE_MASKS.get(shape):
+            mask = ShapeMask.get(shape, rows, cols)
 
         # Find valid start/end within mask — pick maximally distant corners
         if mask:
-            mask_list = sorted(mask)
+            mask_list = mask.cells()
             # Pick the two cells with maximum Manhattan distance
             best_dist = 0
             start, end = mask_list[0], mask_list[-1]
@@ -1110,19 +2036,12 @@ class FullMazeGenerator:
             start = (0, 0)
             end = (rows - 1, cols - 1)
 
-        # Override start/end positions if specified
-        if start_position and mask:
-            mask_list = sorted(mask)
+        # Named start/end positions on shaped mazes are drawn per maze from these
+        start_choices = end_choices = None
+        if mask and (start_position or end_position):
             pos_map = self._position_candidates(mask_list, rows, cols)
-            if start_position in pos_map:
-                start = random.choice(pos_map[start_position])
-        if end_position and mask:
-            mask_list = sorted(mask)
-            pos_map = self._position_candidates(mask_list, rows, cols)
-            if end_position in pos_map:
-                candidates_end = [c for c in pos_map[end_position] if c != start]
-                if candidates_end:
-                    end = random.choice(candidates_end)
+            start_choices = pos_map.get(start_position) if start_position else None
+            end_choices = pos_map.get(end_position) if end_position else None
 
         # Override start/end for rect mazes (no mask)
         if not mask:
@@ -1146,21 +2065,104 @@ class FullMazeGenerator:
         extra_conns = {
             "easy": 1, "medium": 4, "hard": 8,
         }.get(difficulty, 2)
-        maze.generate(start, mask, end=end, min_solution_ratio=min_ratio,
-                      min_turns=min_turns, extra_connections=extra_conns)
+
+        return {
+            "rows": rows, "cols": cols, "cell_size": cell_size, "path_width": path_width,
+            "offset_x": offset_x, "offset_y": offset_y,
+            "canvas_width": canvas_width, "canvas_height": canvas_height,
+            "mask": mask, "start": start, "end": end,
+            "start_choices": start_choices, "end_choices": end_choices,
+            "min_ratio": min_ratio, "min_turns": min_turns, "extra_conns": extra_conns,
+        }
+
+    def generate_maze(
+        self,
+        difficulty: str = "easy",
+        age: int = 4,
+        shape: str = "rect",
+        canvas_width: int = 600,
+        canvas_height: int = 500,
+        override_rows: Optional[int] = None,
+        override_cols: Optional[int] = None,
+        render_style: str = "walls",
+        item_rule: Optional[str] = None,
+        item_count: int = 0,
+        item_emoji: Optional[str] = None,
+        start_position: Optional[str] = None,
+        end_position: Optional[str] = None,
+        strategy: str = "reject",
+        algorithm: str = "backtracker",
+        coalesce_walls: bool = True,
+        braid: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Generate a complete maze with all data needed for the app.
+
+        render_style: "walls" (default) or "corridor"
+        item_rule: None or "collect"
+        start_position/end_position: override start/end placement
+        strategy: "reject" (regenerate until targets hold) or "guided"
+        (grow the solution path first, see MazeGenerator.generate)
+        algorithm: MAZE_ALGORITHMS key used to carve the spanning tree
+        coalesce_walls: draw each wall once, merged into straight runs
+        (see to_svg_walls); result["svg_stats"] reports the saving
+        braid: share of dead ends to open up into loops (0.0-1.0); default
+        1.0 for avoid mazes, which need detours everywhere, else 0.0
+        """
+        layout = self._maze_layout(difficulty, age, shape, canvas_width, canvas_height,
+                                   override_rows, override_cols, start_position, end_position)
+        maze = MazeGenerator(layout["rows"], layout["cols"], layout["cell_size"],
+                             layout["path_width"], self.rng)
+        return self._generate_on(maze, layout, difficulty, shape, render_style, item_rule,
+                                 item_count, item_emoji, strategy, algorithm, coalesce_walls, braid)
+
+    def _generate_on(self, maze: MazeGenerator, layout: Dict[str, Any], difficulty: str,
+                     shape: str, render_style: str, item_rule: Optional[str], item_count: int,
+                     item_emoji: Optional[str], strategy: str, algorithm: str,
+                     coalesce_walls: bool, braid: Optional[float]) -> Dict[str, Any]:
+        """Carve, solve and render one maze for *layout* into the reused *maze*."""
+        rows, cols = layout["rows"], layout["cols"]
+        cell_size, path_width = layout["cell_size"], layout["path_width"]
+        offset_x, offset_y = layout["offset_x"], layout["offset_y"]
+        canvas_width, canvas_height = layout["canvas_width"], layout["canvas_height"]
+        mask = layout["mask"]
+        min_ratio, min_turns = layout["min_ratio"], layout["min_turns"]
+        extra_conns = layout["extra_conns"]
+
+        # Named positions on shaped mazes are drawn per maze
+        start, end = layout["start"], layout["end"]
+        if layout["start_choices"] is not None:
+            start = self.rng.choice(layout["start_choices"])
+        if layout["end_choices"] is not None:
+            candidates_end = [c for c in layout["end_choices"] if c != start]
+            if candidates_end:
+                end = self.rng.choice(candidates_end)
+
+        meets_targets = maze.generate(start, mask, end=end, min_solution_ratio=min_ratio,
+                                      min_turns=min_turns, extra_connections=extra_conns,
+                                      strategy=strategy, algorithm=algorithm)
+        if not meets_targets:
+            print(f"  Warning: {shape} {rows}x{cols} maze missed its solution targets "
+                  f"(ratio {min_ratio}, turns {min_turns}) after {maze.attempts} attempts")
 
         # Avoid-type mazes need every dead end removed so detour routes always exist.
+        if braid is None:
+            braid = 1.0 if item_rule == "avoid" else 0.0
+        if braid > 0:
+            self._braid_dead_ends(maze, mask, braid)
+        connectivity = None
         if item_rule == "avoid":
-            self._braid_dead_ends(maze, mask)
-
-        solution = maze.solve(start, end)
+            connectivity = MazeConnectivity(maze, start, end)
+            solution = connectivity.solution()
+            maze.solution_path = solution
+        else:
+            solution = maze.solve(start, end)
 
         # Choose SVG rendering style
         if render_style == "corridor":
             svg_path = maze.to_svg_corridors(offset_x, offset_y, mask)
             maze_type_prefix = "corridor"
         else:
-            svg_path = maze.to_svg_walls(offset_x, offset_y, mask)
+            svg_path = maze.to_svg_walls(offset_x, offset_y, mask, coalesce=coalesce_walls)
             maze_type_prefix = "grid" if shape == "rect" else "shaped"
 
         solution_svg = maze.solution_to_svg_path(offset_x, offset_y)
@@ -1173,35 +2175,25 @@ class FullMazeGenerator:
 
         # Build segments for hit testing from ALL open corridors (not just solution)
         segments = []
+        cells = maze.cells
+        inside = maze._mask_flags(mask)
         for r in range(rows):
+            cy = offset_y + r * cell_size + half
             for c in range(cols):
-                if mask and (r, c) not in mask:
+                index = r * cols + c
+                if not inside[index]:
                     continue
-                cell = maze.grid[r][c]
-                if not cell.walls["right"] and c + 1 < cols:
-                    if not mask or (r, c + 1) in mask:
-                        segments.append({
-                            "start": {
-                                "x": offset_x + c * cell_size + half,
-                                "y": offset_y + r * cell_size + half
-                            },
-                            "end": {
-                                "x": offset_x + (c + 1) * cell_size + half,
-                                "y": offset_y + r * cell_size + half
-                            }
-                        })
-                if not cell.walls["bottom"] and r + 1 < rows:
-                    if not mask or (r + 1, c) in mask:
-                        segments.append({
-                            "start": {
-                                "x": offset_x + c * cell_size + half,
-                                "y": offset_y + r * cell_size + half
-                            },
-                            "end": {
-                                "x": offset_x + c * cell_size + half,
-                                "y": offset_y + (r + 1) * cell_size + half
-                            }
-                        })
+                cx = offset_x + c * cell_size + half
+                if not cells[index] & WALL_RIGHT and c + 1 < cols and inside[index + 1]:
+                    segments.append({
+                        "start": {"x": cx, "y": cy},
+                        "end": {"x": cx + cell_size, "y": cy},
+                    })
+                if not cells[index] & WALL_BOTTOM and r + 1 < rows and inside[index + cols]:
+                    segments.append({
+                        "start": {"x": cx, "y": cy},
+                        "end": {"x": cx, "y": cy + cell_size},
+                    })
 
         if render_style == "corridor":
             maze_type = f"corridor_{shape}"
@@ -1223,6 +2215,18 @@ class FullMazeGenerator:
             "canvas_height": canvas_height,
             "complexity": difficulty,
             "shape": shape,
+            "generation": {
+                "strategy": strategy,
+                "algorithm": algorithm,
+                "attempts": maze.attempts,
+                "meets_targets": meets_targets,
+                "carve_ms": round(maze.stats["carve_ms"], 2),
+                "elapsed_ms": round(maze.stats["elapsed_ms"], 2),
+                "solution_cells": len(solution),
+                "solution_turns": maze._count_turns(solution),
+                "texture": maze.texture_metrics(mask),
+            },
+            "svg_stats": self._svg_stats(maze.stats["svg"]),
         }
 
         # Place collect items across the maze if requested
@@ -1239,12 +2243,55 @@ class FullMazeGenerator:
             num_owls = {"easy": 2, "medium": 3, "hard": 4}.get(difficulty, 2)
             avoid_items = self._place_avoid_items(
                 maze, solution, start, end, num_owls, item_emoji or "🦉",
-                offset_x, offset_y, cell_size, mask,
+                offset_x, offset_y, cell_size, mask, connectivity,
             )
             result["avoid_items"] = avoid_items
 
         return result
 
+    def generate_mazes(self, spec: Dict[str, Any], n: int, seed: Optional[str] = None,
+                       first: int = 0) -> Iterator[Dict[str, Any]]:
+        """Lazily generate *n* mazes for one spec (generate_maze keyword arguments).
+
+        The layout (grid and cell size, mask, start/end candidates) is worked
+        out once and one MazeGenerator with its buffers is reused, so each
+        maze only pays for carving, solving and rendering. With a seed, maze
+        i (counting from *first*) is exactly what generate_maze(**spec)
+        returns after self.rng.seed(f"{seed}-{i}"), so any candidate can be
+        rebuilt alone. Results are yielded one at a time for callers to
+        stream to disk.
+        """
+        bound = inspect.signature(self.generate_maze).bind(**spec)
+        bound.apply_defaults()
+        kw = bound.arguments
+        layout = self._maze_layout(kw["difficulty"], kw["age"], kw["shape"],
+                                   kw["canvas_width"], kw["canvas_height"],
+                                   kw["override_rows"], kw["override_cols"],
+                                   kw["start_position"], kw["end_position"])
+        maze = MazeGenerator(layout["rows"], layout["cols"], layout["cell_size"],
+                             layout["path_width"], self.rng)
+
+        def mazes():
+            for i in range(first, first + n):
+                if seed is not None:
+                    self.rng.seed(f"{seed}-{i}")
+                yield self._generate_on(maze, layout, kw["difficulty"], kw["shape"],
+                                        kw["render_style"], kw["item_rule"], kw["item_count"],
+                                        kw["item_emoji"], kw["strategy"], kw["algorithm"],
+                                        kw["coalesce_walls"], kw["braid"])
+
+        return mazes()
+
+    @staticmethod
+    def _svg_stats(counts: Dict[str, int]) -> Dict[str, Any]:
+        """Path command counts and how much the renderer's merging saved."""
+        raw = counts["raw_commands"]
+        return {
+            "commands": counts["commands"],
+            "raw_commands": raw,
+            "reduction": round(1 - counts["commands"] / raw, 3) if raw else 0.0,
+        }
+
     @staticmethod
     def _position_candidates(mask_list: list, rows: int, cols: int) -> Dict[str, List[Tuple[int, int]]]:
         """Map position names to candidate cells within the mask."""
@@ -1280,6 +2327,39 @@ class FullMazeGenerator:
                 positions["center"].append((r, c))
         return positions
 
+    def compare_algorithms(self, difficulty: str = "hard", shape: str = "rect",
+                           runs: int = 20, strategy: str = "reject",
+                           seed: str = "compare", **maze_kwargs) -> List[Dict[str, Any]]:
+        """Generate *runs* mazes per algorithm and summarize speed and texture.
+
+        Each algorithm sees the same seeds, so the rows are comparable.
+        """
+        import contextlib
+        import io
+        summary = []
+        for algorithm in MAZE_ALGORITHMS:
+            mazes = []
+            for i in range(runs):
+                self.rng.seed(f"{seed}-{i}")
+                # Missed-target warnings are already counted in the "met" column.
+                with contextlib.redirect_stdout(io.StringIO()):
+                    maze = self.generate_maze(difficulty=difficulty, shape=shape,
+                                              strategy=strategy, algorithm=algorithm,
+                                              **maze_kwargs)
+                mazes.append(maze["generation"])
+            row = {
+                "algorithm": algorithm,
+                "runs": runs,
+                "met": sum(1 for g in mazes if g["meets_targets"]),
+                "attempts": round(sum(g["attempts"] for g in mazes) / runs, 2),
+                "elapsed_ms": round(sum(g["elapsed_ms"] for g in mazes) / runs, 2),
+                "solution_turns": round(sum(g["solution_turns"] for g in mazes) / runs, 1),
+            }
+            for name in ("dead_ends", "junctions", "straights", "turns"):
+                row[name] = round(sum(g["texture"][name] for g in mazes) / runs, 3)
+            summary.append(row)
+        return summary
+
     def to_full_svg(self, maze_data: Dict[str, Any], bg_color: str = "#4A90E2") -> str:
         """Render a complete SVG image for preview."""
         w = maze_data["canvas_width"]
@@ -1320,8 +2400,28 @@ class FullMazeGenerator:
 
 def main():
     """Demo: generate sample mazes and save as SVG."""
+    import argparse
     import os
+    parser = argparse.ArgumentParser(description="Generate sample mazes")
+    parser.add_argument("--compare-algorithms", action="store_true",
+                        help="Benchmark every maze algorithm instead of writing samples")
+    parser.add_argument("--difficulty", default="hard", help="Difficulty for --compare-algorithms")
+    parser.add_argument("--shape", default="rect", help="Shape for --compare-algorithms")
+    parser.add_argument("--strategy", default="reject", help="Strategy for --compare-algorithms")
+    parser.add_argument("--runs", type=int, default=20, help="Mazes per algorithm")
+    args = parser.parse_args()
+
     gen = FullMazeGenerator()
+    if args.compare_algorithms:
+        rows = gen.compare_algorithms(args.difficulty, args.shape, args.runs, args.strategy)
+        print(f"{'algorithm':<14}{'met':>6}{'tries':>7}{'ms':>8}{'turns':>7}"
+              f"{'dead':>7}{'junc':>7}{'strt':>7}")
+        for row in rows:
+            print(f"{row['algorithm']:<14}{row['met']:>3}/{row['runs']:<2}{row['attempts']:>7}"
+                  f"{row['elapsed_ms']:>8}{row['solution_turns']:>7}{row['dead_ends']:>7}"
+                  f"{row['junctions']:>7}{row['straights']:>7}")
+        return
+
     output_dir = os.path.join(os.path.dirname(__file__), "output", "svg_previews")
     os.makedirs(output_dir, exist_ok=True)
 
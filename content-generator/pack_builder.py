@@ -0,0 +1,666 @@
+#!/usr/bin/env python3
+"""Build engine for the declarative level packs in packs/*.yaml.
+
+A pack spec names everything that used to be hand-written per pack: the
+stories (title, texts, end character, location, shape, start/end corners,
+item rule), the universe JSON the characters and locations come from, item
+counts per difficulty, how the maze is drawn and what the pack adds to
+manifest.json. This module turns a spec into story × difficulty jobs for
+build_runner.run_variants(), assembles each level the same way for every
+pack, saves the JSONs and merges manifest.json (manifest_store), so adding a pack means adding
+a YAML file, not another copy of the pipeline.
+
+Spec keys (see packs/space.yaml for a full example):
+
+    order           position in manifest.json and in a full rebuild
+    id_prefix       level ids are <id_prefix>_<story>_<difficulty>
+    theme           level "theme"
+    universe        characters/locations JSON, relative to this directory
+    characters      {start: universe key of the start character,
+                     image_suffix: appended to both image assets}
+    base_stories    true: story content comes from <source_dir>/<id_prefix>_<story>.json
+                    (the difficulty pack); stories then only carry corners
+    maze            {style, shape, item_counts, avoid_min_grid, collect_background}
+                    defaults; a story may override shape, maze_style and algorithm
+    samples_file    also write the first svg_path per difficulty to this file
+    manifest        {pack: {id, title, free_stories, stories (default: all, sorted)}}
+    stories         story id -> story fields
+
+Builds are incremental: each level's level_fingerprint() (its story, pack
+settings, characters and location, difficulty config, seed, candidate count
+and build code) is kept in <output_dir>/.build_fingerprints, and only levels
+whose fingerprint changed are rebuilt. Files whose bytes come out the same
+are not rewritten.
+
+Maze styles: "walls" and "corridor" carve a grid with FullMazeGenerator
+(through candidate_search.search_maze); other styles name a
+"module.function" in MAZE_STYLES that returns path_data for a slot.
+
+Usage:
+    python pack_builder.py                       # list the packs
+    python pack_builder.py --check               # load and validate every spec
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import random
+import time
+import traceback
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from build_runner import DIFFICULTY_NAMES, run_variants, variant_seed
+from candidate_search import search_maze
+from manifest_store import ManifestStore, write_if_changed
+from maze_generator import FullMazeGenerator
+from path_graph import geometry_issues
+from segment_index import add_segment_index
+
+PACKS_DIR = Path(__file__).parent / "packs"
+# Sidecar in the output directory: level id -> level_fingerprint() of its last build.
+FINGERPRINT_FILE = ".build_fingerprints"
+CANVAS_WIDTH = 600
+CANVAS_HEIGHT = 500
+
+# Grid scale factors for shaped mazes — compensates for mask cell loss
+# so effective cell count stays appropriate for the difficulty level.
+SHAPE_GRID_SCALE = {
+    "rect": 1.0,
+    "mountain": 1.25,
+    "tree": 1.3,
+    "triangle": 1.5,
+    "diamond": 1.5,
+    "shell": 1.55,
+    "circle": 1.8,
+    "moon": 1.8,
+    "rocket": 2.0,
+}
+
+# maze style -> "module.function" taking a slot dict and returning path_data.
+MAZE_STYLES = {
+    "walls": "pack_builder.grid_maze",
+    "corridor": "pack_builder.grid_maze",
+    "organic": "generate_forest_pack.organic_maze",
+    "leaf": "generate_forest_pack.leaf_maze",
+}
+
+# Modules every level's content depends on; editing one marks all levels dirty.
+BUILD_CODE = ["pack_builder.py", "maze_generator.py", "candidate_search.py",
+              "validate_labyrinths.py", "path_graph.py", "segment_index.py", "svg_path_writer.py"]
+
+# path_graph.geometry_issues() types that make a level unplayable; a level
+# with one is counted as failed and not written.
+FATAL_GEOMETRY = {"DISCONNECTED", "AVOID_BLOCKS_PATH"}
+
+# Story text copied into every level, in level JSON order.
+STORY_FIELDS = ["title", "story_setup", "instruction", "tts_instruction"]
+ENDING_FIELDS = ["educational_question", "fun_fact", "completion_message"]
+
+
+def pack_names() -> List[str]:
+    """Every pack in packs/, in manifest order."""
+    return sorted((path.stem for path in PACKS_DIR.glob("*.yaml")),
+                  key=lambda name: (load_pack(name).get("order", 0), name))
+
+
+@lru_cache(maxsize=None)
+def load_pack(name: str) -> dict:
+    """Parse and check packs/<name>.yaml."""
+    with open(PACKS_DIR / f"{name}.yaml", encoding="utf-8") as f:
+        spec = yaml.safe_load(f)
+    default_style = spec.get("maze", {}).get("style", "walls")
+    for story_id, story in spec["stories"].items():
+        style = story.get("maze_style", default_style)
+        if style not in MAZE_STYLES:
+            raise ValueError(f"pack {name}: story {story_id} has unknown maze style {style!r}")
+        if not spec.get("base_stories") and "character_end" not in story:
+            raise ValueError(f"pack {name}: story {story_id} has no character_end")
+    return spec
+
+
+@lru_cache(maxsize=None)
+def _pack_context(name: str) -> tuple:
+    """(spec, difficulty levels, universe or None), loaded once per worker process."""
+    spec = load_pack(name)
+    with open(Path(__file__).parent / "config.yaml", encoding="utf-8") as f:
+        difficulty_levels = yaml.safe_load(f)["difficulty_levels"]
+    universe = None
+    if spec.get("universe"):
+        with open(Path(__file__).parent / spec["universe"], encoding="utf-8") as f:
+            universe = json.load(f)
+    return spec, difficulty_levels, universe
+
+
+def level_id(spec: dict, story_id: str, diff_name: str) -> str:
+    return f"{spec['id_prefix']}_{story_id}_{diff_name}"
+
+
+def pack_jobs(name: str, difficulty_names: List[str] = DIFFICULTY_NAMES,
+              source_dir: Optional[Path] = None,
+              story_ids: Optional[List[str]] = None) -> List[dict]:
+    """One run_variants job per story × difficulty, seeded "<pack>-<story>-<difficulty>".
+
+    Packs with base_stories read their base JSONs here, so each job carries
+    its story and workers never touch source_dir.
+    """
+    spec = load_pack(name)
+    bases = {}
+    for story_id in spec["stories"]:
+        if story_ids is not None and story_id not in story_ids:
+            continue
+        if spec.get("base_stories"):
+            json_path = Path(source_dir) / f"{spec['id_prefix']}_{story_id}.json"
+            if not json_path.exists():
+                print(f"  Warning: {json_path} not found, skipping")
+                continue
+            with open(json_path, encoding="utf-8") as f:
+                bases[story_id] = json.load(f)
+        else:
+            bases[story_id] = None
+
+    jobs = []
+    for story_id, base in bases.items():
+        for diff_name in difficulty_names:
+            job = {
+                "builder": "pack_builder.build_variant",
+                "pack": name,
+                "story": story_id,
+                "difficulty": diff_name,
+                "seed": variant_seed(name, story_id, diff_name),
+            }
+            if base is not None:
+                job["base"] = base
+            jobs.append(job)
+    return jobs
+
+
+def grid_maze(slot: dict) -> dict:
+    """Maze styles "walls" and "corridor": a carved grid, best of slot["candidates"]."""
+    base_rows, base_cols = slot["level"]["grid_size"]
+    grid_scale = SHAPE_GRID_SCALE.get(slot["shape"], 1.0)
+    rows = max(base_rows, round(base_rows * grid_scale))
+    cols = max(base_cols, round(base_cols * grid_scale))
+    if slot["item_rule"] == "avoid" and slot["avoid_min_grid"]:
+        rows = max(rows, slot["avoid_min_grid"][0])
+        cols = max(cols, slot["avoid_min_grid"][1])
+
+    spec = dict(
+        difficulty=slot["difficulty"],
+        age=4,
+        shape=slot["shape"],
+        canvas_width=CANVAS_WIDTH,
+        canvas_height=CANVAS_HEIGHT,
+        override_rows=rows,
+        override_cols=cols,
+        render_style=slot["style"],
+        start_position=slot["start"],
+        end_position=slot["end"],
+        algorithm=slot["algorithm"],
+    )
+    if slot["item_rule"]:
+        spec.update(item_rule=slot["item_rule"], item_count=slot["item_count"],
+                    item_emoji=slot["item_emoji"])
+    raw = search_maze(FullMazeGenerator(slot["rng"]), spec, slot["candidates"], slot["seed"])
+
+    path_data = {
+        "svg_path": raw.get("svg_path", ""),
+        "solution_path": raw.get("solution_path", ""),
+        "width": slot["level"]["path_width"],
+        "complexity": slot["difficulty"],
+        "maze_type": raw.get("maze_type", "grid"),
+        "start_point": raw.get("start_point", {}),
+        "end_point": raw.get("end_point", {}),
+        "segments": raw.get("segments", []),
+        "canvas_width": raw.get("canvas_width", CANVAS_WIDTH),
+        "canvas_height": raw.get("canvas_height", CANVAS_HEIGHT),
+        "control_points": raw.get("control_points", []),
+        "items": raw.get("items", []),
+    }
+    if raw.get("avoid_items"):
+        path_data["avoid_items"] = raw["avoid_items"]
+    if raw.get("svg_stats"):
+        path_data["svg_stats"] = raw["svg_stats"]
+    if "candidate" in raw:
+        path_data["candidate"] = raw["candidate"]
+    return path_data
+
+
+def _story_content(spec: dict, universe: Optional[dict], story_id: str, story: dict,
+                   base: Optional[dict]) -> dict:
+    """Level fields that come from the story rather than the maze."""
+    if base is not None:
+        content = {
+            "age_range": base.get("age_range", "3-6"),
+            "theme": base.get("theme", "ocean"),
+            "location": base.get("location", "sandy_shore"),
+            "title": base["title"],
+            "story_setup": base["story_setup"],
+            "instruction": base["instruction"],
+            "tts_instruction": base.get("tts_instruction", ""),
+            "character_start": base["character_start"],
+            "character_end": base["character_end"],
+            "educational_question": base.get("educational_question", ""),
+            "fun_fact": base.get("fun_fact", ""),
+            "completion_message": base.get("completion_message", "Well done!"),
+            "visual_theme": base.get("visual_theme", {
+                "background_color": "#4A90E2",
+                "decorative_elements": ["stars"],
+            }),
+        }
+        # Shared audio — reference the base story's audio files
+        for key in ("audio_instruction", "audio_completion"):
+            if base.get(key):
+                content[key] = base[key]
+        return content
+
+    characters = spec.get("characters", {})
+    suffix = characters.get("image_suffix", "")
+    start_key = characters.get("start", "denny")
+    end_key = story["character_end"]
+    start_char = universe["characters"][start_key]
+    end_char = universe["characters"][end_key]
+    location = universe["locations"][story["location"]]
+    background = location["background_color"]
+    if story.get("item_rule") == "collect":
+        background = spec.get("maze", {}).get("collect_background", background)
+
+    content = {
+        "age_range": "3-6",
+        "theme": spec["theme"],
+        "location": story["location"],
+        **{key: story[key] for key in STORY_FIELDS},
+        "character_start": {
+            "type": start_char["type"],
+            "description": start_char["description"],
+            "position": "bottom_left",
+            "name": start_char["name"],
+            "image_asset": f"{start_key}{suffix}",
+        },
+        "character_end": {
+            "type": end_char["type"],
+            "description": end_char["description"],
+            "position": "top_right",
+            "name": end_char["name"],
+            "image_asset": f"{end_key}{suffix}",
+        },
+        **{key: story[key] for key in ENDING_FIELDS},
+        "visual_theme": {
+            "background_color": background,
+            "decorative_elements": location["decorative_elements"],
+        },
+        "audio_instruction": f"{spec['id_prefix']}_{story_id}_instruction.mp3",
+        "audio_completion": f"{spec['id_prefix']}_{story_id}_completion.mp3",
+    }
+    return content
+
+
+def _build_level(spec: dict, difficulty_levels: dict, universe: Optional[dict],
+                 job: dict) -> Optional[dict]:
+    story_id = job["story"]
+    diff_name = job["difficulty"]
+    story = spec["stories"][story_id]
+    maze = spec.get("maze", {})
+    variant_id = level_id(spec, story_id, diff_name)
+    item_rule = story.get("item_rule")
+    item_emoji = story.get("item_emoji")
+    style = story.get("maze_style", maze.get("style", "walls"))
+    slot = {
+        "difficulty": diff_name,
+        "level": difficulty_levels[diff_name],
+        "style": style,
+        # Stories may pick any maze_generator.MAZE_ALGORITHMS carver.
+        "algorithm": story.get("algorithm", "backtracker"),
+        "shape": story.get("shape", maze.get("shape", "rect")),
+        "start": story.get("start"),
+        "end": story.get("end"),
+        "item_rule": item_rule,
+        "item_emoji": item_emoji,
+        "item_count": maze.get("item_counts", {}).get(diff_name, 0) if item_rule else 0,
+        "avoid_min_grid": maze.get("avoid_min_grid"),
+        "rng": random.Random(job["seed"]),
+        "seed": job["seed"],
+        "candidates": job.get("candidates", 1),
+    }
+
+    label = f"{item_rule} {item_emoji}" if item_rule else "regular"
+    print(f"  Generating {variant_id} ({diff_name} {style} {slot['shape']} {label})...")
+
+    try:
+        content = _story_content(spec, universe, story_id, story, job.get("base"))
+        module_name, function_name = MAZE_STYLES[style].rsplit(".", 1)
+        path_data = getattr(importlib.import_module(module_name), function_name)(slot)
+
+        variant = {
+            "id": variant_id,
+            "age_range": content["age_range"],
+            "difficulty": diff_name,
+            "theme": content["theme"],
+            "location": content["location"],
+            **{key: content[key] for key in STORY_FIELDS},
+            "character_start": content["character_start"],
+            "character_end": content["character_end"],
+            **{key: content[key] for key in ENDING_FIELDS},
+        }
+        if item_rule:
+            variant["item_rule"] = item_rule
+            variant["item_emoji"] = item_emoji
+        variant["path_data"] = path_data
+        variant["visual_theme"] = content["visual_theme"]
+        for key in ("audio_instruction", "audio_completion"):
+            if key in content:
+                variant[key] = content[key]
+        return variant
+    except Exception as e:
+        print(f"  Error generating {variant_id}: {e}")
+        traceback.print_exc()
+        return None
+
+
+def build_variant(job: dict) -> dict:
+    """Build one level from a pack_jobs() job.
+
+    Every level's path_data goes through path_graph.geometry_issues(); one
+    with a FATAL_GEOMETRY issue is dropped like a failed build.
+
+    Returns {"lab": level or None on failure, "seconds": build time,
+    "geometry": the level's geometry issue types}.
+    """
+    started = time.perf_counter()
+    spec, difficulty_levels, universe = _pack_context(job["pack"])
+    lab = _build_level(spec, difficulty_levels, universe, job)
+    issues = geometry_issues(lab["path_data"]) if lab is not None else []
+    for issue_type, desc in issues:
+        print(f"  {lab['id']}: [{issue_type}] {desc}")
+    if any(issue_type in FATAL_GEOMETRY for issue_type, _ in issues):
+        print(f"  Error generating {lab['id']}: unplayable maze")
+        lab = None
+    return {"lab": lab, "seconds": time.perf_counter() - started,
+            "geometry": [issue_type for issue_type, _ in issues]}
+
+
+@lru_cache(maxsize=None)
+def code_version(style: str) -> str:
+    """Digest of the build code plus the module behind maze *style*."""
+    module_name = MAZE_STYLES[style].rsplit(".", 1)[0]
+    digest = hashlib.sha256()
+    for file_name in sorted(set(BUILD_CODE) | {f"{module_name}.py"}):
+        digest.update(file_name.encode("utf-8"))
+        digest.update((Path(__file__).parent / file_name).read_bytes())
+    return digest.hexdigest()
+
+
+def level_fingerprint(name: str, job: dict, candidates: int = 1) -> str:
+    """SHA-256 of everything one level is built from.
+
+    That is the story (or base JSON), the pack's settings, the start and end
+    characters and location it uses from the universe, the difficulty's
+    config, the seed, the candidate count and code_version(). The manifest
+    and order keys only affect manifest.json, so they are left out.
+    """
+    spec, difficulty_levels, universe = _pack_context(name)
+    story = spec["stories"][job["story"]]
+    inputs = {
+        "pack": {key: value for key, value in spec.items() if key not in ("stories", "manifest", "order")},
+        "story": story,
+        "base": job.get("base"),
+        "difficulty": difficulty_levels[job["difficulty"]],
+        "seed": job["seed"],
+        "candidates": candidates,
+        "code": code_version(story.get("maze_style", spec.get("maze", {}).get("style", "walls"))),
+    }
+    if universe is not None:
+        start_key = spec.get("characters", {}).get("start", "denny")
+        inputs["characters"] = [universe["characters"][start_key],
+                                universe["characters"][story["character_end"]]]
+        inputs["location"] = universe["locations"][story["location"]]
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def save_variants(labs: List[dict], output_dir: Path) -> int:
+    """Write one JSON per level (with its segment index); returns how many changed on disk."""
+    written = 0
+    for lab in labs:
+        add_segment_index(lab["path_data"])
+        json_path = output_dir / f"{lab['id']}.json"
+        if write_if_changed(json_path, json.dumps(lab, indent=2, ensure_ascii=False)):
+            written += 1
+            print(f"  Saved: {json_path}")
+        else:
+            print(f"  Unchanged: {json_path}")
+    return written
+
+
+def save_samples(name: str, labs: List[dict], output_dir: Path):
+    """Write the pack's samples_file, if it has one, from all of its levels."""
+    spec = load_pack(name)
+    if not spec.get("samples_file"):
+        return
+    # First level's svg_path per difficulty, for the difficulty picker's maze previews
+    samples = {}
+    for diff_name in DIFFICULTY_NAMES:
+        for lab in labs:
+            if lab["difficulty"] == diff_name:
+                samples[diff_name] = lab["path_data"]["svg_path"]
+                break
+    samples_path = output_dir / spec["samples_file"]
+    if write_if_changed(samples_path, json.dumps(samples, indent=2)):
+        print(f"Difficulty samples saved: {samples_path}")
+
+
+def update_manifest(name: str, store: ManifestStore, labs: List[dict],
+                    story_ids: Optional[List[str]] = None):
+    """Replace the entries of the rebuilt stories with *labs* and refresh the pack entry."""
+    spec = load_pack(name)
+    rebuilt = [story_id for story_id in spec["stories"] if story_ids is None or story_id in story_ids]
+    store.replace_stories(spec["id_prefix"], rebuilt, [
+        {
+            "id": lab["id"],
+            "difficulty": lab["difficulty"],
+            "story": int(lab["id"].split("_")[1]),
+            "theme": lab["theme"],
+            "location": lab["location"],
+            "title": lab["title"],
+        }
+        for lab in labs
+    ])
+
+    pack = spec.get("manifest", {}).get("pack")
+    if pack:
+        store.set_pack({
+            "id": pack["id"],
+            "title": pack["title"],
+            "free_stories": pack.get("free_stories", 0),
+            "stories": pack.get("stories") or sorted(int(story_id) for story_id in spec["stories"]),
+        })
+
+
+def _load_fingerprints(output_dir: Path) -> Dict[str, str]:
+    try:
+        with open(output_dir / FINGERPRINT_FILE, encoding="utf-8") as f:
+            return json.load(f)["levels"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _read_level(path: Path, variant_id: str) -> Optional[dict]:
+    """The level JSON at *path*, or None if it is unreadable or not level *variant_id*."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            lab = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(lab, dict) or lab.get("id") != variant_id:
+        return None
+    return lab
+
+
+def build_packs(names: List[str], output_dir: Path, source_dir: Optional[Path] = None,
+                workers: Optional[int] = None, candidates: int = 1,
+                difficulty_names: List[str] = DIFFICULTY_NAMES,
+                story_ids: Optional[List[str]] = None,
+                dry_run: bool = False, force: bool = False) -> Dict[str, dict]:
+    """Rebuild the out-of-date levels of *names* in one process pool and merge manifest.json once.
+
+    A level is rebuilt when its JSON is missing or its level_fingerprint()
+    differs from the one recorded in <output_dir>/.build_fingerprints (every
+    level with force), or when the file no longer parses as that level
+    ("corrupt"). Up-to-date levels are read back for the manifest and
+    samples instead, and no file is rewritten unless its bytes change.
+    dry_run only lists what would be rebuilt.
+
+    Returns per-pack stats: jobs, rebuilt, up_to_date, failed, files written,
+    build seconds summed over workers, variants per build second, the pack
+    context cache's hits/misses while fingerprinting the pack's levels, and
+    the rebuilt levels' geometry issue counts by type.
+    """
+    output_dir = Path(output_dir)
+    source_dir = Path(source_dir) if source_dir else output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    names = [name for name in pack_names() if name in names]
+    fingerprints = _load_fingerprints(output_dir)
+
+    jobs_by_pack = {}
+    dirty_by_pack = {}
+    # pack -> (hits, misses) of _pack_context while fingerprinting it. This is
+    # where the cache is loaded; forked workers inherit it already warm.
+    context_by_pack = {}
+    # level id -> JSON of an up-to-date level, read once during the scan
+    up_to_date = {}
+    for name in names:
+        spec = load_pack(name)
+        jobs_by_pack[name] = pack_jobs(name, difficulty_names, source_dir, story_ids)
+        dirty = []
+        before = _pack_context.cache_info()
+        for job in jobs_by_pack[name]:
+            job["fingerprint"] = level_fingerprint(name, job, candidates)
+            variant_id = level_id(spec, job["story"], job["difficulty"])
+            if not (output_dir / f"{variant_id}.json").exists():
+                dirty.append((job, "missing"))
+            elif fingerprints.get(variant_id) != job["fingerprint"]:
+                dirty.append((job, "changed" if variant_id in fingerprints else "untracked"))
+            elif force:
+                dirty.append((job, "forced"))
+            else:
+                lab = _read_level(output_dir / f"{variant_id}.json", variant_id)
+                if lab is None:
+                    dirty.append((job, "corrupt"))
+                else:
+                    up_to_date[variant_id] = lab
+        dirty_by_pack[name] = dirty
+        after = _pack_context.cache_info()
+        context_by_pack[name] = (after.hits - before.hits, after.misses - before.misses)
+
+    all_jobs = [job for name in names for job, _ in dirty_by_pack[name]]
+    total = sum(len(jobs) for jobs in jobs_by_pack.values())
+    if dry_run:
+        for name in names:
+            spec = load_pack(name)
+            print(f"{name}: {len(dirty_by_pack[name])}/{len(jobs_by_pack[name])} levels to rebuild")
+            for job, reason in dirty_by_pack[name]:
+                print(f"  {level_id(spec, job['story'], job['difficulty'])} ({reason})")
+        return {name: {"jobs": len(jobs_by_pack[name]), "dirty": len(dirty_by_pack[name])}
+                for name in names}
+
+    print(f"Building {len(all_jobs)}/{total} variants from {len(names)} packs "
+          f"with {workers or 'all'} workers -> {output_dir}")
+    started = time.perf_counter()
+    results = iter(run_variants(all_jobs, workers, candidates))
+    elapsed = time.perf_counter() - started
+
+    stats = {}
+    labs_by_pack = {}
+    # level id -> new fingerprint, or None to forget a level whose rebuild failed
+    fingerprint_updates = {}
+    for name in names:
+        spec = load_pack(name)
+        records = {level_id(spec, job["story"], job["difficulty"]): record
+                   for (job, _), record in zip(dirty_by_pack[name], results)}
+        labs = []
+        fresh = []
+        for job in jobs_by_pack[name]:
+            variant_id = level_id(spec, job["story"], job["difficulty"])
+            record = records.get(variant_id)
+            if record is None:
+                labs.append(up_to_date[variant_id])
+            elif record["lab"] is not None:
+                labs.append(record["lab"])
+                fresh.append(record["lab"])
+                fingerprint_updates[variant_id] = job["fingerprint"]
+            else:
+                fingerprint_updates[variant_id] = None
+        written = save_variants(fresh, output_dir)
+        save_samples(name, labs, output_dir)
+        labs_by_pack[name] = labs
+        seconds = sum(record["seconds"] for record in records.values())
+        geometry = {}
+        for record in records.values():
+            for issue_type in record["geometry"]:
+                geometry[issue_type] = geometry.get(issue_type, 0) + 1
+        stats[name] = {
+            "jobs": len(jobs_by_pack[name]),
+            "rebuilt": len(fresh),
+            "up_to_date": len(jobs_by_pack[name]) - len(records),
+            "failed": len(records) - len(fresh),
+            "written": written,
+            "build_seconds": round(seconds, 3),
+            "variants_per_second": round(len(records) / seconds, 1) if seconds else 0.0,
+            "context_hits": context_by_pack[name][0],
+            "context_misses": context_by_pack[name][1],
+            "geometry_issues": dict(sorted(geometry.items())),
+        }
+
+    # One locked read-modify-write for the manifest and the fingerprints, so a
+    # concurrent build of other packs cannot lose this one's updates (or vice versa).
+    manifest_path = output_dir / "manifest.json"
+    with ManifestStore(manifest_path) as store:
+        for name in names:
+            update_manifest(name, store, labs_by_pack[name], story_ids)
+        fingerprints = _load_fingerprints(output_dir)
+        for variant_id, fingerprint in fingerprint_updates.items():
+            if fingerprint is None:
+                fingerprints.pop(variant_id, None)
+            else:
+                fingerprints[variant_id] = fingerprint
+        write_if_changed(output_dir / FINGERPRINT_FILE,
+                         json.dumps({"levels": dict(sorted(fingerprints.items()))}, indent=2))
+    state = "Manifest" if store.written else "Manifest unchanged"
+    print(f"\n{state}: {manifest_path} ({store.total} entries)")
+    for name, pack_stats in stats.items():
+        print(f"  {name}: {pack_stats['rebuilt']} rebuilt ({pack_stats['written']} changed on disk), "
+              f"{pack_stats['up_to_date']} up to date, {pack_stats['failed']} failed; "
+              f"{pack_stats['build_seconds']:.2f} build-s ({pack_stats['variants_per_second']}/s), "
+              f"context cache {pack_stats['context_hits']} hits / {pack_stats['context_misses']} misses")
+        for issue_type, count in pack_stats["geometry_issues"].items():
+            print(f"    geometry: {count} × {issue_type}")
+    rebuilt = sum(pack_stats["rebuilt"] for pack_stats in stats.values())
+    print(f"Rebuilt {rebuilt}/{total} variants in {elapsed:.1f}s")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or check the pack specs in packs/")
+    parser.add_argument("--check", action="store_true", help="Load every spec and report errors")
+    args = parser.parse_args()
+
+    for name in pack_names():
+        spec = load_pack(name)
+        if args.check and not spec.get("base_stories"):
+            # Resolves every story's characters and location in the universe.
+            spec, _, universe = _pack_context(name)
+            for story_id, story in spec["stories"].items():
+                _story_content(spec, universe, story_id, story, None)
+        styles = sorted({story.get("maze_style", spec.get("maze", {}).get("style", "walls"))
+                         for story in spec["stories"].values()})
+        print(f"{name:<12} {len(spec['stories']):>3} stories  "
+              f"{spec['id_prefix']}_{min(spec['stories'])}..{max(spec['stories'])}  "
+              f"styles: {', '.join(styles)}")
+
+
+if __name__ == "__main__":
+    main()
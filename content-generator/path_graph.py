@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Corridor graph of path_data.segments, and the geometric checks built on it.
+
+validate_labyrinths.py counts segments and measures distances, but never
+asks whether the level can be played: whether the segments actually join
+start_point to end_point, and whether items sit on a corridor the child can
+reach. PathGraph answers those in linear time, cheaply enough for
+pack_builder.build_variant to check every level it builds:
+
+  - segment endpoints are snapped into vertices (SNAP units apart at most)
+    through a dict of snap cells, so no pairwise comparison is needed;
+  - union-find over the segments gives connected components;
+  - points (start, end, items) are attached to their nearest segment through
+    segment_index's bucket grid, in constant time for points on the path;
+  - breadth-first search gives the shortest start-to-end route in segments,
+    optionally with what avoid items block removed: the vertex an item is
+    within AVOID_HIT_RADIUS of (the maze generator anchors each avoid item
+    to a cell it verified a detour around), or else just the segment it
+    sits on (the avoid editor places items along side branches).
+
+geometry_issues() turns that into validator issues (issue_type, description),
+in the same form as validate_labyrinths.validate_labyrinth.
+
+Usage:
+    graph = PathGraph(lab["path_data"])
+    start, end = graph.attach_point(pd["start_point"]), graph.attach_point(pd["end_point"])
+    graph.connected(start, end), graph.shortest_hops(start, end)
+    issues = geometry_issues(lab["path_data"])
+    python path_graph.py                    # check every bundled level
+"""
+
+import argparse
+import json
+import math
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from segment_index import (
+    DEFAULT_LEVELS_DIR,
+    build_segment_index,
+    default_bucket_size,
+    nearest_segment,
+)
+
+# Endpoints closer than this (canvas units) are the same vertex.
+SNAP = 0.5
+
+# The app's avoid-item hit radius (LabyrinthViewModel.checkAvoidItemHit).
+AVOID_HIT_RADIUS = 18
+
+# Items farther than this from a corridor, or half the path width if that is
+# larger, are off the path.
+MIN_ON_PATH_TOLERANCE = 12
+
+
+class PathGraph:
+    """Snapped-vertex graph over one level's segments."""
+
+    def __init__(self, path_data: dict):
+        self.segments: List[dict] = path_data.get("segments", [])
+        # Level JSON calls it width; generate_maze results, path_width.
+        width = path_data.get("width") or path_data.get("path_width") or 0
+        self.tolerance = max(width / 2, MIN_ON_PATH_TOLERANCE)
+        self.index = build_segment_index(self.segments, default_bucket_size(path_data))
+        self._snap: Dict[Tuple[int, int], List[int]] = {}
+        self.points: List[Tuple[float, float]] = []
+        self.edges: List[Tuple[int, int]] = []
+        self.adjacency: List[List[Tuple[int, int]]] = []
+        for i, segment in enumerate(self.segments):
+            u = self._vertex(segment["start"]["x"], segment["start"]["y"])
+            v = self._vertex(segment["end"]["x"], segment["end"]["y"])
+            self.edges.append((u, v))
+            self.adjacency[u].append((v, i))
+            self.adjacency[v].append((u, i))
+
+        self._parent = list(range(len(self.points)))
+        self._size = [1] * len(self.points)
+        for u, v in self.edges:
+            self._union(u, v)
+
+    def _vertex(self, x: float, y: float) -> int:
+        cx, cy = math.floor(x / SNAP), math.floor(y / SNAP)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for vertex in self._snap.get((cx + dx, cy + dy), ()):
+                    px, py = self.points[vertex]
+                    if abs(px - x) <= SNAP and abs(py - y) <= SNAP:
+                        return vertex
+        vertex = len(self.points)
+        self.points.append((x, y))
+        self.adjacency.append([])
+        self._snap.setdefault((cx, cy), []).append(vertex)
+        return vertex
+
+    def _find(self, vertex: int) -> int:
+        parent = self._parent
+        while parent[vertex] != vertex:
+            parent[vertex] = parent[parent[vertex]]
+            vertex = parent[vertex]
+        return vertex
+
+    def _union(self, u: int, v: int):
+        ru, rv = self._find(u), self._find(v)
+        if ru == rv:
+            return
+        if self._size[ru] < self._size[rv]:
+            ru, rv = rv, ru
+        self._parent[rv] = ru
+        self._size[ru] += self._size[rv]
+
+    @property
+    def component_count(self) -> int:
+        return sum(1 for vertex in range(len(self.points)) if self._parent[vertex] == vertex)
+
+    def connected(self, u: int, v: int) -> bool:
+        return self._find(u) == self._find(v)
+
+    def nearest(self, x: float, y: float) -> Tuple[Optional[int], float]:
+        """(segment index, distance) of the segment nearest to (x, y)."""
+        return nearest_segment(self.index, self.segments, x, y)
+
+    def attach(self, x: float, y: float) -> Tuple[Optional[int], float]:
+        """(vertex, distance): the nearer end of the nearest segment, if on the path.
+
+        The vertex is None when the point is farther than the tolerance from
+        every segment.
+        """
+        segment, distance = self.nearest(x, y)
+        if segment is None or distance > self.tolerance:
+            return None, distance
+        u, v = self.edges[segment]
+        (ux, uy), (vx, vy) = self.points[u], self.points[v]
+        return (u if math.hypot(x - ux, y - uy) <= math.hypot(x - vx, y - vy) else v), distance
+
+    def attach_point(self, point: dict) -> Optional[int]:
+        return self.attach(point["x"], point["y"])[0]
+
+    def blocks(self, x: float, y: float, radius: float = AVOID_HIT_RADIUS) -> Tuple[Set[int], Set[int]]:
+        """(vertices, segments) an avoid item at (x, y) makes impassable.
+
+        The ends of its nearest segment within *radius*, or if neither is,
+        that segment alone. Nothing if the item is off the path.
+        """
+        segment, distance = self.nearest(x, y)
+        if segment is None or distance > self.tolerance:
+            return set(), set()
+        vertices = {vertex for vertex in self.edges[segment]
+                    if math.hypot(x - self.points[vertex][0], y - self.points[vertex][1]) <= radius}
+        return vertices, (set() if vertices else {segment})
+
+    def shortest_hops(self, source: int, target: int, blocked: Iterable[int] = (),
+                      blocked_segments: Iterable[int] = ()) -> Optional[int]:
+        """Fewest segments from *source* to *target* avoiding *blocked* vertices and segments.
+
+        None if they are cut off.
+        """
+        blocked = set(blocked)
+        blocked_segments = set(blocked_segments)
+        if source in blocked or target in blocked:
+            return None
+        if source == target:
+            return 0
+        hops = {source: 0}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v, segment in self.adjacency[u]:
+                if v in hops or v in blocked or segment in blocked_segments:
+                    continue
+                if v == target:
+                    return hops[u] + 1
+                hops[v] = hops[u] + 1
+                queue.append(v)
+        return None
+
+
+def geometry_issues(path_data: dict) -> List[Tuple[str, str]]:
+    """Playability issues of one level's path_data: [(issue_type, description)]."""
+    if not path_data.get("segments"):
+        return [("NO_SEGMENTS", "path_data has no segments")]
+    graph = PathGraph(path_data)
+    issues = []
+
+    ends = {}
+    for name, key in (("Start", "start_point"), ("End", "end_point")):
+        point = path_data[key]
+        vertex, distance = graph.attach(point["x"], point["y"])
+        if vertex is None:
+            issues.append((f"{name.upper()}_OFF_PATH",
+                f"{name} is {distance:.0f}px from the nearest corridor (max {graph.tolerance:.0f})"))
+        ends[name] = vertex
+    start, end = ends["Start"], ends["End"]
+    reachable = start is not None and end is not None and graph.connected(start, end)
+    if start is not None and end is not None and not reachable:
+        issues.append(("DISCONNECTED",
+            f"End is not reachable from start ({graph.component_count} separate path pieces)"))
+
+    blocked, blocked_segments = set(), set()
+    for label, key in (("Item", "items"), ("Avoid item", "avoid_items")):
+        prefix = "ITEM" if key == "items" else "AVOID"
+        for i, item in enumerate(path_data.get(key) or []):
+            vertex, distance = graph.attach(item["x"], item["y"])
+            if vertex is None:
+                issues.append((f"{prefix}_OFF_PATH",
+                    f"{label} {i} is {distance:.0f}px from the nearest corridor (max {graph.tolerance:.0f})"))
+            elif start is not None and not graph.connected(start, vertex):
+                issues.append((f"{prefix}_UNREACHABLE", f"{label} {i} is on a corridor cut off from start"))
+            elif key == "avoid_items":
+                vertices, segments = graph.blocks(item["x"], item["y"])
+                blocked |= vertices
+                blocked_segments |= segments
+
+    if (reachable and (blocked or blocked_segments)
+            and graph.shortest_hops(start, end, blocked, blocked_segments) is None):
+        issues.append(("AVOID_BLOCKS_PATH", "Every route from start to end passes through an avoid item"))
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every level's corridors join start to end")
+    parser.add_argument("--levels", type=str, default=None, help="Labyrinth JSON directory (default: app Resources)")
+    args = parser.parse_args()
+
+    levels_dir = Path(args.levels) if args.levels else DEFAULT_LEVELS_DIR
+    paths = sorted(levels_dir.glob("denny_*.json"))
+    failing = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            issues = geometry_issues(json.load(f)["path_data"])
+        if issues:
+            failing += 1
+            print(f"{path.stem}:")
+            for issue_type, desc in issues:
+                print(f"  [{issue_type}] {desc}")
+    print(f"\n{failing}/{len(paths)} levels have geometry issues")
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
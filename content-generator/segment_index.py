@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Uniform-grid spatial index over path_data.segments for touch hit-testing.
+
+The app's DrawingValidator measures the distance from every touch sample to
+every segment. This module buckets the segments into a grid of square
+buckets (cell_size wide, aligned so maze cell centres sit at bucket centres)
+and embeds the result in path_data["segment_index"] as CSR arrays:
+
+    {"origin": {"x": .., "y": ..}, "bucket_size": b, "cols": c, "rows": r,
+     "offsets": [c*r + 1 ints], "entries": [segment indices]}
+
+The segments of bucket (col, row) are entries[offsets[k]:offsets[k + 1]]
+with k = row * cols + col. Each segment is listed in every bucket its
+bounding box touches, so the 3x3 buckets around a point hold every segment
+closer than bucket_size. nearest_segment() is the reference query: that
+neighbourhood answers any point within bucket_size of the path (every
+on-path touch) in constant time, and farther points widen ring by ring.
+
+Usage:
+    python segment_index.py                 # benchmark on the bundled levels
+    python segment_index.py --sizes 8 16 32 64
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+DEFAULT_LEVELS_DIR = (Path(__file__).parent.parent / "LowDopamineLabyrinth" / "LowDopamineLabyrinth"
+                      / "Resources" / "Labyrinths")
+
+
+def default_bucket_size(path_data: dict) -> float:
+    """cell_size if the level records it, else the median segment length."""
+    if path_data.get("cell_size"):
+        return path_data["cell_size"]
+    lengths = [math.hypot(s["end"]["x"] - s["start"]["x"], s["end"]["y"] - s["start"]["y"])
+               for s in path_data.get("segments", [])]
+    lengths = [length for length in lengths if length > 0]
+    return statistics.median(lengths) if lengths else 1
+
+
+def build_segment_index(segments: list, bucket_size: float) -> dict:
+    """CSR bucket grid over *segments* (see the module docstring for the layout)."""
+    if not segments:
+        return {"origin": {"x": 0, "y": 0}, "bucket_size": bucket_size,
+                "cols": 0, "rows": 0, "offsets": [0], "entries": []}
+
+    xs = [p["x"] for s in segments for p in (s["start"], s["end"])]
+    ys = [p["y"] for s in segments for p in (s["start"], s["end"])]
+    half = bucket_size // 2 if isinstance(bucket_size, int) else bucket_size / 2
+    ox = min(xs) - half
+    oy = min(ys) - half
+    cols = int((max(xs) - ox) // bucket_size) + 1
+    rows = int((max(ys) - oy) // bucket_size) + 1
+
+    buckets: List[List[int]] = [[] for _ in range(cols * rows)]
+    for i, s in enumerate(segments):
+        x1, x2 = sorted((s["start"]["x"], s["end"]["x"]))
+        y1, y2 = sorted((s["start"]["y"], s["end"]["y"]))
+        c1 = int((x1 - ox) // bucket_size)
+        c2 = int((x2 - ox) // bucket_size)
+        r1 = int((y1 - oy) // bucket_size)
+        r2 = int((y2 - oy) // bucket_size)
+        for r in range(r1, r2 + 1):
+            for c in range(c1, c2 + 1):
+                buckets[r * cols + c].append(i)
+
+    offsets = [0]
+    entries = []
+    for bucket in buckets:
+        entries.extend(bucket)
+        offsets.append(len(entries))
+    return {
+        "origin": {"x": ox, "y": oy},
+        "bucket_size": bucket_size,
+        "cols": cols,
+        "rows": rows,
+        "offsets": offsets,
+        "entries": entries,
+    }
+
+
+def add_segment_index(path_data: dict) -> dict:
+    """Set path_data["segment_index"] from its segments; returns path_data."""
+    path_data["segment_index"] = build_segment_index(
+        path_data.get("segments", []), default_bucket_size(path_data))
+    return path_data
+
+
+def point_segment_distance(x: float, y: float, segment: dict) -> float:
+    """Same math as DrawingValidator.pointToSegmentDistance (canvas units)."""
+    ax, ay = segment["start"]["x"], segment["start"]["y"]
+    bx, by = segment["end"]["x"], segment["end"]["y"]
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(x - ax, y - ay)
+    t = max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / length_sq))
+    return math.hypot(x - (ax + t * dx), y - (ay + t * dy))
+
+
+def nearest_segment_linear(segments: list, x: float, y: float) -> Tuple[Optional[int], float]:
+    """The app's current linear scan: (index, distance) of the nearest segment."""
+    best, best_dist = None, math.inf
+    for i, segment in enumerate(segments):
+        d = point_segment_distance(x, y, segment)
+        if d < best_dist:
+            best, best_dist = i, d
+    return best, best_dist
+
+
+def nearest_segment(index: dict, segments: list, x: float, y: float,
+                    stats: Optional[dict] = None) -> Tuple[Optional[int], float]:
+    """Reference indexed query; same (index, distance) as nearest_segment_linear.
+
+    Scans Chebyshev rings of buckets around the point's bucket. After ring k
+    every unseen segment is at least k * bucket_size away, so the search
+    stops at ring 1 for any point closer than bucket_size to the path. Ties
+    resolve to the lowest segment index, like the linear scan.
+    """
+    cols, rows = index["cols"], index["rows"]
+    if not cols or not rows:
+        return None, math.inf
+    size = index["bucket_size"]
+    offsets, entries = index["offsets"], index["entries"]
+    fc = (x - index["origin"]["x"]) / size
+    fr = (y - index["origin"]["y"]) / size
+    if not (0 <= fc < cols and 0 <= fr < rows):
+        # Off the indexed area (outside the maze): fall back to the full scan.
+        if stats is not None:
+            stats["checked"] = stats.get("checked", 0) + len(segments)
+        return nearest_segment_linear(segments, x, y)
+    col, row = int(fc), int(fr)
+
+    best, best_dist = None, math.inf
+    seen = set()
+    max_ring = max(col, cols - 1 - col, row, rows - 1 - row)
+    for ring in range(max_ring + 1):
+        for r in range(row - ring, row + ring + 1):
+            if not 0 <= r < rows:
+                continue
+            edge = r in (row - ring, row + ring)
+            step = 1 if edge else 2 * ring
+            for c in range(col - ring, col + ring + 1, max(step, 1)):
+                if not 0 <= c < cols:
+                    continue
+                k = r * cols + c
+                for i in entries[offsets[k]:offsets[k + 1]]:
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    d = point_segment_distance(x, y, segments[i])
+                    if d < best_dist or (d == best_dist and i < best):
+                        best, best_dist = i, d
+        if best_dist < ring * size:
+            break
+    if stats is not None:
+        stats["checked"] = stats.get("checked", 0) + len(seen)
+    return best, best_dist
+
+
+def _touch_samples(segments: list, count: int, jitter: float, rng: random.Random) -> list:
+    """Points scattered around the path, like a finger tracing it."""
+    samples = []
+    for _ in range(count):
+        s = rng.choice(segments)
+        t = rng.random()
+        x = s["start"]["x"] + t * (s["end"]["x"] - s["start"]["x"])
+        y = s["start"]["y"] + t * (s["end"]["y"] - s["start"]["y"])
+        samples.append((x + rng.uniform(-jitter, jitter), y + rng.uniform(-jitter, jitter)))
+    return samples
+
+
+def benchmark(segments: list, bucket_size: float, queries: int = 2000, seed: str = "bench") -> dict:
+    """Time linear vs indexed nearest-segment queries and check they agree."""
+    rng = random.Random(seed)
+    index = build_segment_index(segments, bucket_size)
+    samples = _touch_samples(segments, queries, bucket_size / 2, rng)
+
+    started = time.perf_counter()
+    expected = [nearest_segment_linear(segments, x, y) for x, y in samples]
+    linear_s = time.perf_counter() - started
+
+    stats = {}
+    started = time.perf_counter()
+    got = [nearest_segment(index, segments, x, y, stats) for x, y in samples]
+    indexed_s = time.perf_counter() - started
+
+    mismatches = sum(1 for (i, d), (j, e) in zip(expected, got) if i != j or abs(d - e) > 1e-9)
+    return {
+        "segments": len(segments),
+        "linear_us": linear_s / queries * 1e6,
+        "indexed_us": indexed_s / queries * 1e6,
+        "checked": stats["checked"] / queries,
+        "mismatches": mismatches,
+    }
+
+
+def _print_row(label: str, row: dict):
+    print(f"{label:<24} {row['segments']:>8} {row['linear_us']:>10.1f} {row['indexed_us']:>11.1f} "
+          f"{row['checked']:>9.1f} {row['mismatches']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the segment spatial index")
+    parser.add_argument("--levels", type=str, default=None, help="Labyrinth JSON directory (default: app Resources)")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[8, 16, 32, 64],
+                        help="Also benchmark generated square grids of these sizes")
+    parser.add_argument("--queries", type=int, default=2000, help="Touch samples per benchmark")
+    args = parser.parse_args()
+
+    print(f"{'level':<24} {'segments':>8} {'linear µs':>10} {'indexed µs':>11} "
+          f"{'checked':>9} {'mismatches':>10}")
+
+    levels_dir = Path(args.levels) if args.levels else DEFAULT_LEVELS_DIR
+    levels = []
+    for path in sorted(levels_dir.glob("denny_*.json")):
+        with open(path, encoding="utf-8") as f:
+            path_data = json.load(f).get("path_data", {})
+        if path_data.get("segments"):
+            levels.append((len(path_data["segments"]), path.stem, path_data))
+    levels.sort(key=lambda level: level[0])
+    if levels:
+        picks = [levels[0], levels[len(levels) // 2], levels[-1]]
+        for _, name, path_data in picks:
+            _print_row(name, benchmark(path_data["segments"], default_bucket_size(path_data),
+                                       args.queries))
+
+    if args.sizes:
+        from maze_generator import FullMazeGenerator
+        generator = FullMazeGenerator()
+        for size in args.sizes:
+            generator.rng.seed(f"segment-index-{size}")
+            maze = generator.generate_maze(difficulty="hard", override_rows=size, override_cols=size,
+                                           canvas_width=40 * size, canvas_height=40 * size)
+            _print_row(f"grid {size}x{size}", benchmark(maze["segments"], maze["cell_size"],
+                                                         args.queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+On-disk, content-addressed cache for Claude story responses.
+
+A story is keyed by a SHA-256 of the model name, the prompt template text and
+the variables it was formatted with, so editing the template or an outline
+misses the cache while re-running after a crash or a maze-only change hits
+it for every story. Entries are plain JSON files under cache/ (next to
+output/), sharded by the first two hex digits of the key.
+
+Usage:
+    cache = StoryCache()
+    key = cache.key(STORY_MODEL, template, variables)
+    story = cache.get(key)
+    if story is None:
+        story = ...  # call the API
+        cache.put(key, story)
+    cache.evict()
+    print(cache.summary())
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / "cache"
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_MB = 200
+
+
+class StoryCache:
+    """JSON response cache with hit/miss counters and age/size eviction."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS,
+        max_bytes: Optional[int] = DEFAULT_MAX_MB * 1024 * 1024,
+    ):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(model: str, template: str, variables: dict, variant: str = "") -> str:
+        """Stable hex digest of (model, template text, formatted variables).
+
+        *variant* tells apart stories requested with the same prompt, e.g. the
+        labyrinth ids of a --count 5 batch that all share one theme.
+        """
+        payload = json.dumps(
+            {"model": model, "template": template, "variables": variables, "variant": variant},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Cached story for *key*, or None (expired and unreadable entries miss)."""
+        path = self._path(key)
+        try:
+            if self.max_age_days is not None:
+                age = time.time() - path.stat().st_mtime
+                if age > self.max_age_days * 86400:
+                    self.misses += 1
+                    return None
+            with open(path, encoding="utf-8") as f:
+                story = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return story
+
+    def put(self, key: str, story: dict):
+        """Store *story* atomically, so a crash never leaves a half-written entry."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(story, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.writes += 1
+
+    def evict(self) -> int:
+        """Drop entries older than max_age_days, then the oldest until under max_bytes."""
+        if not self.root.exists():
+            return 0
+        now = time.time()
+        entries = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            expired = self.max_age_days is not None and now - mtime > self.max_age_days * 86400
+            oversize = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or oversize):
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.evicted += removed
+        return removed
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = f" ({self.hits / lookups:.0%} hit rate)" if lookups else ""
+        return (f"Story cache: {self.hits} hits, {self.misses} misses{rate}, "
+                f"{self.writes} written, {self.evicted} evicted -> {self.root}")
@@ -0,0 +1,185 @@
+"""
+Streaming SVG path-data writer shared by the maze renderers.
+
+Every renderer used to format its own f-strings and join or += them into a
+string. SVGPathWriter writes commands straight into a text stream (an
+io.StringIO by default, or any open file) with one number format:
+
+    precision=None  ints as "20", floats as Python prints them
+    precision=0     rounded to integers
+    precision=k     fixed k decimals ("300.0" for k=1)
+
+Output keeps the "M x y L x y" token layout (single spaces, absolute M/L/Q/C/Z
+only) that SVGPathParser.swift and the validators read.
+
+chain_segments() merges line segments into as few polylines as possible:
+pieces sharing an endpoint are joined and collinear runs collapse to their
+two ends. Only use it for paths stroked with round caps and joins (corridors,
+organic paths); there the stroke covers exactly the same area.
+
+path_points() reads such a path back in one tokenizing pass, for the
+validators.
+
+Usage:
+    writer = SVGPathWriter(precision=1)
+    writer.move_to(10, 20)
+    writer.quad_to(30, 40, 50, 60)
+    svg_path = writer.getvalue()
+
+    writer = SVGPathWriter()
+    for polyline in chain_segments(edges):
+        writer.polyline(polyline)
+"""
+
+import io
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+Point = Tuple[float, float]
+
+_PATH_TOKEN_RE = re.compile(r"[MLQCZ]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+# Numbers each absolute command takes per repeat; its end point is the last pair.
+_COMMAND_ARITY = {"M": 2, "L": 2, "Q": 4, "C": 6, "Z": 0}
+
+
+def format_number(value: float, precision: Optional[int] = None) -> str:
+    """Format a coordinate the way every renderer writes it."""
+    if precision is None:
+        return str(value)
+    if precision == 0:
+        return str(int(round(value)))
+    return f"{value:.{precision}f}"
+
+
+class SVGPathWriter:
+    """Writes SVG path commands into a text stream."""
+
+    def __init__(self, out: Optional[TextIO] = None, precision: Optional[int] = None):
+        self.out = out if out is not None else io.StringIO()
+        self.precision = precision
+        self.commands = 0
+        self.subpaths = 0
+        self._started = False
+
+    def _emit(self, command: str, *values: float):
+        fmt = self.precision
+        text = " ".join([command] + [format_number(v, fmt) for v in values])
+        self.out.write(f" {text}" if self._started else text)
+        self._started = True
+        self.commands += 1
+
+    def move_to(self, x: float, y: float):
+        self._emit("M", x, y)
+        self.subpaths += 1
+
+    def line_to(self, x: float, y: float):
+        self._emit("L", x, y)
+
+    def quad_to(self, cx: float, cy: float, x: float, y: float):
+        self._emit("Q", cx, cy, x, y)
+
+    def close(self):
+        self._emit("Z")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        """A standalone "M x1 y1 L x2 y2" subpath."""
+        self.move_to(x1, y1)
+        self.line_to(x2, y2)
+
+    def dot(self, x: float, y: float):
+        """Zero-length subpath: a round-capped stroke draws it as a dot."""
+        self.line(x, y, x, y)
+
+    def polyline(self, points: Sequence[Point]):
+        """M to the first point, then L through the rest."""
+        self.move_to(*points[0])
+        for x, y in points[1:]:
+            self.line_to(x, y)
+
+    def getvalue(self) -> str:
+        return self.out.getvalue()
+
+
+def _collinear(a: Point, b: Point, c: Point) -> bool:
+    """True if b lies on the straight line a -> c, between them."""
+    cross = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    dot = (b[0] - a[0]) * (c[0] - b[0]) + (b[1] - a[1]) * (c[1] - b[1])
+    return cross == 0 and dot > 0
+
+
+def simplify_polyline(points: List[Point]) -> List[Point]:
+    """Drop interior points that continue a straight run."""
+    out = points[:2]
+    for point in points[2:]:
+        if _collinear(out[-2], out[-1], point):
+            out[-1] = point
+        else:
+            out.append(point)
+    return out
+
+
+def chain_segments(segments: Iterable[Tuple[Point, Point]]) -> List[List[Point]]:
+    """Join segments that share endpoints into simplified polylines.
+
+    Walks start at odd-degree points (where trails must begin or end) and
+    prefer to continue straight, so straight corridors become one L. The
+    result is deterministic for a given segment order.
+    """
+    segments = list(segments)
+    links: Dict[Point, List[Tuple[int, Point]]] = {}
+    for i, (a, b) in enumerate(segments):
+        links.setdefault(a, []).append((i, b))
+        links.setdefault(b, []).append((i, a))
+
+    used = [False] * len(segments)
+    polylines = []
+    starts = [p for p, ends in links.items() if len(ends) % 2] + list(links)
+    for start in starts:
+        while True:
+            trail = [start]
+            while True:
+                here = trail[-1]
+                choice = None
+                for i, other in links[here]:
+                    if used[i]:
+                        continue
+                    if choice is None:
+                        choice = (i, other)
+                    if len(trail) > 1 and _collinear(trail[-2], here, other):
+                        choice = (i, other)
+                        break
+                if choice is None:
+                    break
+                used[choice[0]] = True
+                trail.append(choice[1])
+            if len(trail) == 1:
+                break
+            polylines.append(simplify_polyline(trail))
+    return polylines
+
+
+def path_points(path_data: str) -> List[Tuple[str, float, float]]:
+    """(command, x, y) for the end point of every drawing command in *path_data*.
+
+    Reads the absolute M/L/Q/C/Z paths this module writes; repeated
+    coordinate groups after one command letter (implicit repeats) count as
+    further commands of the same kind, M repeats as L, as in SVG. Z has no
+    end point of its own and is skipped.
+    """
+    points = []
+    command = None
+    numbers: List[float] = []
+    for token in _PATH_TOKEN_RE.findall(path_data or ""):
+        if token.isalpha():
+            command = token
+            numbers = []
+            continue
+        if command is None or command == "Z":
+            continue
+        numbers.append(float(token))
+        if len(numbers) == _COMMAND_ARITY[command]:
+            points.append((command, numbers[-2], numbers[-1]))
+            numbers = []
+            if command == "M":
+                command = "L"
+    return points
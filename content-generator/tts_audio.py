@@ -0,0 +1,246 @@
+"""
+ElevenLabs narration audio for the labyrinth JSONs.
+
+Runs in three passes over a labyrinth directory:
+
+1. Plan: read every denny_*.json once and work out its instruction and
+   completion clips. Clips are deduplicated by a hash of their normalized
+   text, so difficulty variants (or different stories) that say the same
+   thing share one MP3 even when their filenames differ.
+2. Synthesize: the missing unique clips are requested from a thread pool
+   whose workers each keep a keep-alive connection open, retried with backoff on 429/5xx, and
+   streamed to a temp file that is renamed into place once complete.
+3. Update: the audio_instruction / audio_completion fields are written back
+   in one pass, only for clips whose file exists.
+
+Usage:
+    synthesize_labyrinth_audio(labyrinth_dir, api_key)
+    synthesize_labyrinth_audio(labyrinth_dir, api_key, base_url="http://127.0.0.1:8766")
+"""
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from manifest_store import replace_file
+
+ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"
+# Charlotte voice (warm, kid-friendly)
+DEFAULT_VOICE_ID = "XB0fDUnXU5powFXDhCwa"
+TTS_MODEL = "eleven_turbo_v2_5"
+VOICE_SETTINGS = {
+    "stability": 0.6,
+    "similarity_boost": 0.75,
+}
+
+DEFAULT_AUDIO_WORKERS = 8
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+REQUEST_TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+
+# (json field, default filename suffix)
+CLIP_FIELDS = [
+    ("audio_instruction", "instruction"),
+    ("audio_completion", "completion"),
+]
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so clips differing only in spacing dedupe together."""
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def clip_text(lab: dict, field: str) -> str:
+    """The narration text for one audio field of a labyrinth."""
+    if field == "audio_instruction":
+        return lab.get("tts_instruction", "")
+    return f"{lab.get('completion_message', '')} {lab.get('educational_question', '')}"
+
+
+def plan_audio(labs: dict, audio_dir: Path) -> tuple:
+    """Assign every clip a filename and collect the ones still to synthesize.
+
+    *labs* maps JSON path -> labyrinth dict. Returns (assignments, jobs):
+    assignments maps (json path, field) -> filename, jobs maps filename ->
+    text for the unique clips with no file on disk yet.
+    """
+    clips = []
+    for json_path, lab in labs.items():
+        for field, suffix in CLIP_FIELDS:
+            text = normalize_text(clip_text(lab, field))
+            if not text:
+                continue
+            filename = lab.get(field) or f"{lab['id']}_{suffix}.mp3"
+            clips.append((json_path, field, filename, text))
+
+    # Existing files claim their text first, so reruns point duplicates at them.
+    by_hash = {}
+    for _, _, filename, text in clips:
+        if (audio_dir / filename).exists():
+            by_hash.setdefault(text_hash(text), filename)
+
+    assignments = {}
+    jobs = {}
+    for json_path, field, filename, text in clips:
+        if (audio_dir / filename).exists():
+            assignments[json_path, field] = filename
+            continue
+        filename = by_hash.setdefault(text_hash(text), filename)
+        assignments[json_path, field] = filename
+        if not (audio_dir / filename).exists():
+            jobs.setdefault(filename, text)
+    return assignments, jobs
+
+
+class ElevenLabsClient:
+    """Thread-safe TTS client: one keep-alive requests.Session per worker thread."""
+
+    def __init__(self, api_key: str, voice_id: str = DEFAULT_VOICE_ID,
+                 base_url: Optional[str] = None):
+        base_url = (base_url or os.environ.get("ELEVENLABS_BASE_URL") or ELEVENLABS_BASE_URL)
+        self.url = f"{base_url.rstrip('/')}/v1/text-to-speech/{voice_id}"
+        self.headers = {
+            "xi-api-key": api_key,
+            "Content-Type": "application/json",
+            "Accept": "audio/mpeg",
+        }
+        self._local = threading.local()
+        self._rng = random.Random()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+        delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY)
+        return delay * (0.5 + self._rng.random() / 2)
+
+    def synthesize(self, text: str, output_path: Path):
+        """Stream the MP3 for *text* to *output_path*, retrying transient failures."""
+        payload = {
+            "text": text,
+            "model_id": TTS_MODEL,
+            "voice_settings": VOICE_SETTINGS,
+        }
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                with self._session().post(self.url, json=payload, stream=True,
+                                          timeout=REQUEST_TIMEOUT) as response:
+                    if response.status_code in RETRYABLE_STATUS and attempt < MAX_RETRIES:
+                        delay = self._retry_delay(attempt, response.headers.get("retry-after"))
+                        print(f"    Retrying {output_path.name} in {delay:.1f}s ({response.status_code})")
+                        time.sleep(delay)
+                        continue
+                    response.raise_for_status()
+                    _stream_to_file(response, output_path)
+                    return
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"    Retrying {output_path.name} in {delay:.1f}s ({type(e).__name__})")
+                time.sleep(delay)
+
+
+def _stream_to_file(response: requests.Response, output_path: Path):
+    """Write the body chunk by chunk to a temp file, renamed once it is complete."""
+    fd, tmp = tempfile.mkstemp(dir=output_path.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+        replace_file(tmp, output_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def synthesize_labyrinth_audio(
+    labyrinth_dir: Path,
+    api_key: str,
+    voice_id: str = DEFAULT_VOICE_ID,
+    base_url: Optional[str] = None,
+    workers: int = DEFAULT_AUDIO_WORKERS,
+) -> dict:
+    """Generate missing narration for every denny_*.json in *labyrinth_dir*.
+
+    Returns counts: {"clips", "synthesized", "failed", "updated"}.
+    """
+    audio_dir = labyrinth_dir / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+
+    labs = {}
+    for json_path in sorted(labyrinth_dir.glob("denny_*.json")):
+        with open(json_path) as f:
+            labs[json_path] = json.load(f)
+    print(f"\nGenerating audio for {len(labs)} labyrinths...")
+
+    assignments, jobs = plan_audio(labs, audio_dir)
+    shared = len(assignments) - len(set(assignments.values()))
+    print(f"  {len(assignments)} clips, {len(jobs)} to synthesize "
+          f"({shared} shared with another level)")
+
+    client = ElevenLabsClient(api_key, voice_id, base_url)
+
+    def run(item):
+        filename, text = item
+        try:
+            client.synthesize(text, audio_dir / filename)
+            print(f"  Generated {filename}")
+            return True
+        except Exception as e:
+            print(f"    Error generating {filename}: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(run, sorted(jobs.items())))
+
+    # One pass over the JSONs: set fields whose audio is now on disk.
+    updated = 0
+    for json_path, lab in labs.items():
+        changed = False
+        for field, _ in CLIP_FIELDS:
+            filename = assignments.get((json_path, field))
+            if filename and lab.get(field) != filename and (audio_dir / filename).exists():
+                lab[field] = filename
+                changed = True
+        if changed:
+            with open(json_path, "w") as f:
+                json.dump(lab, f, indent=2)
+            updated += 1
+
+    synthesized = sum(results)
+    print(f"\nAudio generation complete: {synthesized} synthesized, "
+          f"{len(results) - synthesized} failed, {updated} JSON files updated. "
+          f"Files saved to: {audio_dir}")
+    return {
+        "clips": len(assignments),
+        "synthesized": synthesized,
+        "failed": len(results) - synthesized,
+        "updated": updated,
+    }
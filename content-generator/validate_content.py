@@ -6,6 +6,8 @@ import os
 import re
 import sys
 
+from svg_path_writer import path_points
+
 LABYRINTHS_DIR = os.path.join(os.path.dirname(__file__), "output", "labyrinths")
 
 REQUIRED_TOP_FIELDS = [
@@ -41,35 +43,41 @@ def check_fields(data, required, context):
     return errors
 
 
+def solution_points(solution_path):
+    """(x, y) of every M/L point in a solution_path SVG string."""
+    return [(x, y) for command, x, y in path_points(solution_path) if command in ("M", "L")]
+
+
 def parse_solution_steps(solution_path):
-    """Count the number of L (lineTo) commands in solution_path SVG string."""
-    if not solution_path:
-        return 0
-    # Each "L x y" is a step; the initial "M x y" is the start
-    parts = re.findall(r"[ML]\s+[\d.]+\s+[\d.]+", solution_path)
-    return len(parts)
+    """Count the M/L points in solution_path (the initial M is the start)."""
+    return len(solution_points(solution_path))
 
 
 def extract_svg_endpoint(solution_path, which="start"):
     """Extract start or end point from solution_path SVG string."""
-    if not solution_path:
+    points = solution_points(solution_path)
+    if not points:
         return None
-    parts = re.findall(r"[ML]\s+([\d.]+)\s+([\d.]+)", solution_path)
-    if not parts:
-        return None
-    idx = 0 if which == "start" else -1
-    return (float(parts[idx][0]), float(parts[idx][1]))
+    return points[0] if which == "start" else points[-1]
 
 
 def validate_labyrinth(filepath):
-    errors = []
-    warnings = []
     filename = os.path.basename(filepath)
-
     try:
         data = load_json(filepath)
     except json.JSONDecodeError as e:
         return [f"{filename}: invalid JSON - {e}"], []
+    return check_labyrinth(data, filename)
+
+
+def check_labyrinth(data, filename, points=None):
+    """Content checks for one parsed level: (errors, warnings).
+
+    *points* are the solution_path's M/L points if the caller already
+    parsed them (validation_engine does).
+    """
+    errors = []
+    warnings = []
 
     # 1. Schema validation - top-level fields
     errors.extend(check_fields(data, REQUIRED_TOP_FIELDS, filename))
@@ -99,6 +107,9 @@ def validate_labyrinth(filepath):
     solution_path = pd.get("solution_path", "")
     difficulty = data.get("difficulty", "")
 
+    if points is None:
+        points = solution_points(solution_path)
+
     if maze_type != "organic":
         if not solution_path or not solution_path.strip():
             errors.append(f"{filename}: non-organic maze (type={maze_type}) has empty solution_path")
@@ -106,8 +117,8 @@ def validate_labyrinth(filepath):
             # Check solution starts at start_point and ends at end_point
             sp = pd.get("start_point", {})
             ep = pd.get("end_point", {})
-            sol_start = extract_svg_endpoint(solution_path, "start")
-            sol_end = extract_svg_endpoint(solution_path, "end")
+            sol_start = points[0] if points else None
+            sol_end = points[-1] if points else None
             if sol_start and sp:
                 if abs(sol_start[0] - sp.get("x", 0)) > 5 or abs(sol_start[1] - sp.get("y", 0)) > 5:
                     errors.append(f"{filename}: solution_path start {sol_start} doesn't match start_point ({sp.get('x')},{sp.get('y')})")
@@ -116,7 +127,7 @@ def validate_labyrinth(filepath):
                     errors.append(f"{filename}: solution_path end {sol_end} doesn't match end_point ({ep.get('x')},{ep.get('y')})")
 
     # 3. Path complexity
-    step_count = parse_solution_steps(solution_path)
+    step_count = len(points)
     if difficulty == "medium" and maze_type != "organic" and step_count < 15:
         errors.append(f"{filename}: medium maze has only {step_count} solution steps (need >= 15)")
     if difficulty == "hard" and maze_type != "organic" and step_count < 25:
@@ -209,11 +220,15 @@ def main():
             all_errors.append(f"{filename}: file not found")
             continue
 
-        data = load_json(filepath)
+        try:
+            data = load_json(filepath)
+        except json.JSONDecodeError as e:
+            all_errors.append(f"{filename}: invalid JSON - {e}")
+            continue
         all_data.append(data)
         titles.append((filename, data.get("title", "")))
 
-        errors, warnings = validate_labyrinth(filepath)
+        errors, warnings = check_labyrinth(data, filename)
         all_errors.extend(errors)
         all_warnings.extend(warnings)
 
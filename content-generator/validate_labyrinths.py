@@ -1,10 +1,13 @@
 """Validate all labyrinth JSON files for quality issues."""
-import json
 import math
-import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+from path_graph import geometry_issues
+from svg_path_writer import path_points
+
 LAB_DIR = Path(__file__).parent.parent / "LowDopamineLabyrinth" / "LowDopamineLabyrinth" / "Resources" / "Labyrinths"
 
 # Target item counts per difficulty (all collect)
@@ -22,19 +25,22 @@ AVOID_TARGETS = {"easy": 1, "medium": 3, "hard": 4}
 MIN_AVOID_START_DIST = 140
 
 
-def count_svg_segments(svg_path: str) -> int:
-    """Count M (move-to) commands in SVG path = number of line segments."""
-    return svg_path.count("M ")
+def count_corridor_segments(path_data: dict) -> int:
+    """Number of open corridors (cell-to-cell passages) in a corridor maze.
+
+    Read from path_data.segments: the corridor svg_path chains straight runs
+    into single L commands, so its M count no longer tracks corridors.
+    """
+    return len(path_data.get("segments", []))
 
 
 def parse_svg_bounds(svg_path: str):
     """Parse SVG path to find coordinate bounds."""
-    nums = re.findall(r'[\d.]+', svg_path)
-    if len(nums) < 2:
+    points = path_points(svg_path)
+    if not points:
         return None
-    pairs = [(float(nums[i]), float(nums[i+1])) for i in range(0, len(nums)-1, 2)]
-    xs = [p[0] for p in pairs]
-    ys = [p[1] for p in pairs]
+    xs = [p[1] for p in points]
+    ys = [p[2] for p in points]
     return min(xs), max(xs), min(ys), max(ys)
 
 
@@ -84,13 +90,12 @@ def validate_labyrinth(lab: dict) -> list:
 
     # 7. SVG path complexity (corridor mazes should have enough corridors)
     if is_corridor:
-        svg_segs = count_svg_segments(pd["svg_path"])
-        # A corridor maze should have significantly more SVG segments than solution segments
+        corridors = count_corridor_segments(pd)
+        # A corridor maze should have more corridors than the solution uses
         # (dead-end branches, etc.)
-        min_svg = min_segs * 2  # at least 2x the solution
-        if svg_segs < min_svg:
+        if corridors < min_segs:
             issues.append(("SIMPLE_MAZE",
-                f"Corridor maze has {svg_segs} SVG segments (min {min_svg} for {difficulty})"))
+                f"Corridor maze has {corridors} corridors (min {min_segs} for {difficulty})"))
 
     # 8. Items within maze bounds (not clipped)
     canvas_w = pd["canvas_width"]
@@ -115,10 +120,16 @@ def validate_labyrinth(lab: dict) -> list:
                 issues.append(("AVOID_TOO_CLOSE_TO_START",
                     f"Avoid item {i} is {item_dist:.0f}px from start (min {MIN_AVOID_START_DIST})"))
 
+    # 9. Playable: corridors join start to end, items sit on reachable corridors
+    issues.extend(geometry_issues(pd))
+
     return issues
 
 
 def main():
+    # validation_engine imports this module for its rules
+    from validation_engine import ValidationCache, validate_files
+
     json_files = sorted(LAB_DIR.glob("denny_*.json"))
     print(f"Validating {len(json_files)} labyrinth files...\n")
 
@@ -126,15 +137,18 @@ def main():
     issue_counts = defaultdict(int)
     difficulty_issues = defaultdict(lambda: defaultdict(int))
 
+    cache = ValidationCache()
+    results = validate_files(json_files, ["quality"], cache=cache)
+    cache.save()
     for path in json_files:
-        with open(path) as f:
-            lab = json.load(f)
-        issues = validate_labyrinth(lab)
+        issues = results[path.name]["quality"]
         if issues:
-            all_issues[lab["id"]] = issues
+            # denny_041_hard.json holds level "denny_041_hard"
+            difficulty = path.stem.rpartition("_")[2]
+            all_issues[path.stem] = issues
             for issue_type, desc in issues:
                 issue_counts[issue_type] += 1
-                difficulty_issues[lab["difficulty"]][issue_type] += 1
+                difficulty_issues[difficulty][issue_type] += 1
 
     # Print summary by issue type
     total_files = len(json_files)
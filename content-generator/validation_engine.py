@@ -0,0 +1,234 @@
+"""
+One validation pass over a labyrinth bundle: parse once, run every rule set.
+
+validate_labyrinths.py (quality: solution length, start/end placement, item
+counts, path_graph's playability checks) and validate_content.py (schema, colors, solution endpoints) used to
+load and regex-parse every file separately. Here each file is read and
+parsed once into a ParsedLevel, whose solution_path points come from
+svg_path_writer.path_points, and each rule set in RULE_SETS runs over that.
+
+Results are cached in cache/validation.json by file name + SHA-256 of the
+file bytes + a hash of the validator sources, so a re-run only re-checks
+levels (or rules) that changed. When enough files miss the cache they are
+fanned out across a process pool; small batches stay in-process, where a
+pool's start-up would cost more than the checks.
+
+Usage:
+    python validation_engine.py                  # the app bundle, all rule sets
+    python validation_engine.py path/to/labyrinths --rules quality
+    python validation_engine.py --no-cache --workers 1
+
+Exits 1 if any level has an issue, so it can run as a pre-commit hook.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+import validate_content
+import validate_labyrinths
+from manifest_store import write_if_changed
+from svg_path_writer import path_points
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / "cache" / "validation.json"
+CACHE_MAX_ENTRIES = 5000
+
+# Below this many uncached files the pool's start-up outweighs the checks.
+PARALLEL_MIN_FILES = 64
+
+# Bundle files that are not levels.
+NON_LEVEL_FILES = {"manifest.json", "difficulty_samples.json"}
+
+# Sources whose edits invalidate every cached result.
+RULE_SOURCES = ["validation_engine.py", "validate_labyrinths.py", "validate_content.py", "svg_path_writer.py",
+                "path_graph.py", "segment_index.py"]
+
+
+class ParsedLevel:
+    """One level file, loaded and parsed once for every rule set."""
+
+    __slots__ = ("name", "data", "path_data", "solution_points")
+
+    def __init__(self, name: str, data: dict):
+        self.name = name
+        self.data = data
+        self.path_data = data.get("path_data") or {}
+        self.solution_points = [
+            (x, y) for command, x, y in path_points(self.path_data.get("solution_path") or "")
+            if command in ("M", "L")
+        ]
+
+
+def quality_rules(level: ParsedLevel) -> List[Tuple[str, str]]:
+    if not {"id", "difficulty", "path_data"} <= level.data.keys():
+        return [("SCHEMA", "missing id, difficulty or path_data")]
+    try:
+        return validate_labyrinths.validate_labyrinth(level.data)
+    except (KeyError, TypeError) as e:
+        return [("SCHEMA", f"missing or malformed field {e}")]
+
+
+def content_rules(level: ParsedLevel) -> List[Tuple[str, str]]:
+    errors, warnings = validate_content.check_labyrinth(level.data, level.name, level.solution_points)
+    prefix = f"{level.name}: "
+    return ([("CONTENT_ERROR", e.removeprefix(prefix)) for e in errors]
+            + [("CONTENT_WARNING", w.removeprefix(prefix)) for w in warnings])
+
+
+# name -> function(ParsedLevel) -> [(issue_type, description)]
+RULE_SETS = {
+    "quality": quality_rules,
+    "content": content_rules,
+}
+
+
+def rules_version() -> str:
+    digest = hashlib.sha256()
+    for name in RULE_SOURCES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def level_files(labyrinths_dir: Path) -> List[Path]:
+    return sorted(p for p in Path(labyrinths_dir).glob("*.json") if p.name not in NON_LEVEL_FILES)
+
+
+def check_file(name: str, raw: bytes, rule_names: Tuple[str, ...]) -> Dict[str, list]:
+    """Parse one file's bytes and run *rule_names* over it: {rule set: [[type, desc], ...]}."""
+    try:
+        level = ParsedLevel(name, json.loads(raw))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        return {rule: [["INVALID_JSON", str(e)]] for rule in rule_names}
+    return {rule: [list(issue) for issue in RULE_SETS[rule](level)] for rule in rule_names}
+
+
+def _check_job(job: Tuple[str, bytes, Tuple[str, ...]]) -> Dict[str, list]:
+    return check_file(*job)
+
+
+class ValidationCache:
+    """file key -> cached issues, dropped wholesale when the rules change."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.version = rules_version()
+        self.entries: Dict[str, Dict[str, list]] = {}
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("rules") == self.version:
+                self.entries = stored.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def key(name: str, raw: bytes) -> str:
+        return f"{name}:{hashlib.sha256(raw).hexdigest()}"
+
+    def get(self, key: str, rule_names: Iterable[str]) -> Optional[Dict[str, list]]:
+        cached = self.entries.get(key)
+        if cached is None or not all(rule in cached for rule in rule_names):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {rule: cached[rule] for rule in rule_names}
+
+    def put(self, key: str, issues: Dict[str, list]):
+        # Re-inserting moves the key to the end, so trimming drops the oldest.
+        merged = {**self.entries.pop(key, {}), **issues}
+        self.entries[key] = merged
+
+    def save(self) -> bool:
+        overflow = len(self.entries) - CACHE_MAX_ENTRIES
+        if overflow > 0:
+            for key in list(self.entries)[:overflow]:
+                del self.entries[key]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return write_if_changed(self.path, json.dumps({"rules": self.version, "entries": self.entries}))
+
+
+def validate_files(paths: Iterable[Path], rule_names: Iterable[str] = tuple(RULE_SETS),
+                   workers: Optional[int] = None, cache: Optional[ValidationCache] = None
+                   ) -> Dict[str, Dict[str, list]]:
+    """{file name: {rule set: [[issue_type, description], ...]}} for every path.
+
+    Each file is read once; its bytes key the cache and, on a miss, are
+    parsed once for all rule sets. Misses run in a process pool when there
+    are at least PARALLEL_MIN_FILES of them and *workers* is not 1.
+    """
+    rule_names = tuple(rule_names)
+    results: Dict[str, Dict[str, list]] = {}
+    pending = []
+    for path in paths:
+        path = Path(path)
+        raw = path.read_bytes()
+        key = ValidationCache.key(path.name, raw)
+        cached = cache.get(key, rule_names) if cache else None
+        if cached is not None:
+            results[path.name] = cached
+        else:
+            pending.append((key, (path.name, raw, rule_names)))
+
+    if len(pending) >= PARALLEL_MIN_FILES and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            checked = list(pool.map(_check_job, [job for _, job in pending], chunksize=16))
+    else:
+        checked = [_check_job(job) for _, job in pending]
+
+    for (key, (name, _, _)), issues in zip(pending, checked):
+        results[name] = issues
+        if cache:
+            cache.put(key, issues)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate every labyrinth in a bundle (cached, parallel)")
+    parser.add_argument("labyrinths_dir", nargs="?", default=str(validate_labyrinths.LAB_DIR))
+    parser.add_argument("--rules", default=",".join(RULE_SETS),
+                        help=f"Comma-separated rule sets ({', '.join(RULE_SETS)})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes for uncached files (1 checks in-process)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every file, ignoring the cache")
+    args = parser.parse_args()
+
+    rule_names = [rule.strip() for rule in args.rules.split(",") if rule.strip()]
+    unknown = [rule for rule in rule_names if rule not in RULE_SETS]
+    if unknown:
+        parser.error(f"unknown rule set(s): {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    paths = level_files(Path(args.labyrinths_dir))
+    cache = None if args.no_cache else ValidationCache()
+    results = validate_files(paths, rule_names, args.workers, cache)
+    if cache:
+        cache.save()
+    elapsed = time.perf_counter() - started
+
+    failing = 0
+    for name, by_rule in results.items():
+        issues = [(rule, issue) for rule in rule_names for issue in by_rule[rule]]
+        if not issues:
+            continue
+        failing += 1
+        print(f"{name}:")
+        for rule, (issue_type, description) in issues:
+            print(f"  [{rule}/{issue_type}] {description}")
+
+    cached = f", {cache.hits} cached" if cache else ""
+    print(f"\n{failing}/{len(paths)} levels have issues "
+          f"({', '.join(rule_names)}{cached}, {elapsed:.2f}s)")
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())